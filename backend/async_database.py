@@ -0,0 +1,393 @@
+"""
+Async database service - Supabase (PostgREST) over a pooled httpx client
+Same methods as DatabaseService, as coroutines, so database round trips
+don't block the event loop. Connections are kept alive and shared by
+every request
+"""
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from database import (
+    JOB_SEARCH_SUMMARY_COLUMNS,
+    KEYSET_ORDER,
+    MATCH_SUMMARY_COLUMNS,
+    MISSING_FUNCTION_CODES,
+    RESUME_SUMMARY_COLUMNS,
+    PageCursor,
+    bulk_insert,
+    dashboard_stats,
+    empty_dashboard_stats,
+    keyset_filter,
+    keyset_page,
+)
+
+
+class AsyncDatabaseService:
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Pool limits and timeouts come from the environment:
+        DB_MAX_CONNECTIONS (20), DB_MAX_KEEPALIVE (10), DB_TIMEOUT (10 seconds)
+
+        Args:
+            transport: httpx transport to use instead of the network, e.g.
+                       httpx.MockTransport or an ASGI app standing in for PostgREST
+        """
+        self.supabase_url = os.getenv("SUPABASE_URL")
+        self.supabase_key = os.getenv("SUPABASE_SERVICE_KEY")  # Use service key for backend
+
+        if not self.supabase_url or not self.supabase_key:
+            raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment")
+
+        self.limits = httpx.Limits(
+            max_connections=int(os.getenv("DB_MAX_CONNECTIONS", 20)),
+            max_keepalive_connections=int(os.getenv("DB_MAX_KEEPALIVE", 10)),
+        )
+        self.timeout = httpx.Timeout(float(os.getenv("DB_TIMEOUT", 10)))
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # Optional SkillIndexRegistry kept in sync with resume writes
+        self.skill_index = None
+        # Optional ReadCache in front of the list and statistics reads, invalidated by writes
+        self.read_cache = None
+        # Rows per insert for the bulk save_* methods
+        self.write_batch_size = int(os.getenv("DB_WRITE_BATCH_SIZE", 100))
+        # False once the get_dashboard_stats SQL function turns out to be missing
+        self.stats_rpc = True
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared PostgREST client, created on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.supabase_url.rstrip('/')}/rest/v1",
+                headers={
+                    'apikey': self.supabase_key,
+                    'Authorization': f"Bearer {self.supabase_key}",
+                },
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close pooled connections (on shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, table: str, params: Optional[Dict[str, Any]] = None,
+                       json: Any = None, prefer: Optional[str] = None) -> httpx.Response:
+        """One PostgREST call; raises httpx.HTTPStatusError on an error response"""
+        headers = {'Prefer': prefer} if prefer else None
+        response = await self.client.request(method, f"/{table}", params=params, json=json, headers=headers)
+        response.raise_for_status()
+        return response
+
+    async def _select(self, table: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return (await self._request('GET', table, params=params)).json()
+
+    async def _insert(self, table: str, rows: Any, returning: str = 'representation') -> List[Dict[str, Any]]:
+        # Bulk inserts name their columns, as postgrest-py does, so rows may leave some out
+        params = {'columns': ','.join(dict.fromkeys(key for row in rows for key in row))} if isinstance(rows, list) else None
+        response = await self._request('POST', table, params=params, json=rows, prefer=f"return={returning}")
+        return response.json() if returning == 'representation' else []
+
+    async def _count(self, table: str, user_id: str) -> int:
+        """Exact row count of a user's rows, from the Content-Range header"""
+        response = await self._request('GET', table, params={'select': 'id', 'user_id': f"eq.{user_id}", 'limit': 1},
+                                       prefer='count=exact')
+        total = response.headers.get('content-range', '').rpartition('/')[2]
+        return int(total) if total.isdigit() else 0
+
+    async def _keyset_select(self, table: str, params: Dict[str, Any], limit: int,
+                             after: Optional[PageCursor] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One keyset page (limit + 1 rows fetched) and the next page's cursor"""
+        params = {**params, 'order': KEYSET_ORDER, 'limit': limit + 1}
+        if after is not None:
+            params['or'] = f"({keyset_filter(after)})"
+        return keyset_page(await self._select(table, params), limit)
+
+    async def _run_bulk_insert(self, steps, table: str, returning: str = 'representation') -> List[Any]:
+        """Drive database.bulk_insert with this client's inserts"""
+        try:
+            payload = next(steps)
+            while True:
+                try:
+                    outcome = await self._insert(table, payload, returning=returning)
+                except Exception as e:
+                    outcome = e
+                payload = steps.send(outcome)
+        except StopIteration as done:
+            return done.value
+
+    async def _read_through(self, user_id: str, resource: str, params: Any, loader):
+        """loader(), served from the read cache when there is one"""
+        if self.read_cache is None:
+            return await loader()
+        return await self.read_cache.read_through(user_id, resource, params, loader)
+
+    async def _invalidate(self, rows: List[Optional[Dict[str, Any]]], event: str):
+        """Invalidate the cached reads of every user with a row written"""
+        if self.read_cache is None:
+            return
+        for user_id in dict.fromkeys(row.get('user_id') for row in rows if row):
+            if user_id:
+                await self.read_cache.ainvalidate(user_id, event)
+
+    # ==================== RESUMES ====================
+
+    async def save_resume(self, resume_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a resume to database"""
+        try:
+            rows = await self._insert('resumes', resume_data)
+            saved = rows[0] if rows else None
+        except Exception as e:
+            print(f"Error saving resume: {e}")
+            raise
+
+        if saved and self.skill_index is not None:
+            self.skill_index.resume_saved(saved.get('user_id', resume_data.get('user_id')), saved)
+        await self._invalidate([resume_data], 'resume_saved')
+        return saved
+
+    async def save_resumes(self, resume_rows: List[Dict[str, Any]],
+                           chunk_size: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Save many resumes, one insert per chunk
+        A chunk that fails is retried row by row, so one bad row doesn't
+        lose the others
+
+        Returns:
+            The saved rows (with their ids) in input order; None where saving failed
+        """
+        saved = await self._run_bulk_insert(
+            bulk_insert(resume_rows, chunk_size or self.write_batch_size, 'resumes'), 'resumes')
+
+        if self.skill_index is not None:
+            for resume_data, row in zip(resume_rows, saved):
+                if row:
+                    self.skill_index.resume_saved(row.get('user_id', resume_data.get('user_id')), row)
+        await self._invalidate(resume_rows, 'resume_saved')
+        return saved
+
+    async def get_user_resumes(self, user_id: str, limit: int = 50,
+                               after: Optional[PageCursor] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get a page of a user's resumes, newest first (summary columns)
+
+        Returns:
+            The rows and the cursor of the next page (None on the last page)
+        """
+        try:
+            return await self._read_through(user_id, 'resumes', [limit, after], lambda: self._keyset_select('resumes', {
+                'select': RESUME_SUMMARY_COLUMNS,
+                'user_id': f"eq.{user_id}",
+            }, limit, after))
+        except Exception as e:
+            print(f"Error fetching resumes: {e}")
+            return [], None
+
+    async def get_resume_by_id(self, resume_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific resume by ID"""
+        try:
+            rows = await self._select('resumes', {
+                'select': '*',
+                'id': f"eq.{resume_id}",
+                'user_id': f"eq.{user_id}",
+                'limit': 1,
+            })
+            return rows[0] if rows else None
+        except Exception as e:
+            print(f"Error fetching resume: {e}")
+            return None
+
+    async def delete_resume(self, resume_id: str, user_id: str) -> bool:
+        """Delete a resume"""
+        try:
+            await self._request('DELETE', 'resumes', params={
+                'id': f"eq.{resume_id}",
+                'user_id': f"eq.{user_id}",
+            })
+        except Exception as e:
+            print(f"Error deleting resume: {e}")
+            return False
+
+        if self.skill_index is not None:
+            self.skill_index.resume_deleted(user_id, resume_id)
+        if self.read_cache is not None:
+            await self.read_cache.ainvalidate(user_id, 'resume_deleted')
+        return True
+
+    async def search_resumes(self, user_id: str, query: str) -> List[Dict[str, Any]]:
+        """Search resumes by name, email, or skills"""
+        try:
+            # Use ilike for case-insensitive search
+            return await self._select('resumes', {
+                'select': '*',
+                'user_id': f"eq.{user_id}",
+                'or': f"(name.ilike.%{query}%,email.ilike.%{query}%)",
+                'order': 'created_at.desc',
+            })
+        except Exception as e:
+            print(f"Error searching resumes: {e}")
+            return []
+
+    # ==================== JOB SEARCHES ====================
+
+    async def save_job_search(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a job search to database"""
+        try:
+            rows = await self._insert('job_searches', job_data)
+        except Exception as e:
+            print(f"Error saving job search: {e}")
+            raise
+
+        await self._invalidate([job_data], 'job_search_saved')
+        return rows[0] if rows else None
+
+    async def get_user_job_searches(self, user_id: str, limit: int = 50,
+                                    after: Optional[PageCursor] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a user's job searches, newest first (summary columns), and the next page's cursor"""
+        try:
+            return await self._read_through(user_id, 'job_searches', [limit, after], lambda: self._keyset_select('job_searches', {
+                'select': JOB_SEARCH_SUMMARY_COLUMNS,
+                'user_id': f"eq.{user_id}",
+            }, limit, after))
+        except Exception as e:
+            print(f"Error fetching job searches: {e}")
+            return [], None
+
+    async def get_job_search_by_id(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific job search by ID"""
+        try:
+            rows = await self._select('job_searches', {
+                'select': '*',
+                'id': f"eq.{job_id}",
+                'user_id': f"eq.{user_id}",
+                'limit': 1,
+            })
+            return rows[0] if rows else None
+        except Exception as e:
+            print(f"Error fetching job search: {e}")
+            return None
+
+    # ==================== MATCH RESULTS ====================
+
+    async def save_match_result(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Save a match result to database"""
+        try:
+            rows = await self._insert('match_results', match_data)
+        except Exception as e:
+            print(f"Error saving match result: {e}")
+            raise
+
+        await self._invalidate([match_data], 'match_saved')
+        return rows[0] if rows else None
+
+    async def save_match_results(self, match_rows: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """
+        Save many match results, one insert per chunk
+        The rows are not sent back (return=minimal). A chunk that fails
+        is retried row by row
+
+        Returns:
+            How many were saved
+        """
+        saved = await self._run_bulk_insert(
+            bulk_insert(match_rows, chunk_size or self.write_batch_size, 'match results', returning=False),
+            'match_results', returning='minimal')
+        await self._invalidate(match_rows, 'match_saved')
+        return sum(1 for row in saved if row)
+
+    async def get_job_matches(self, job_search_id: str, user_id: str) -> List[Dict[str, Any]]:
+        """Get all match results for a job search"""
+        try:
+            return await self._select('match_results', {
+                'select': f'*, resumes({RESUME_SUMMARY_COLUMNS})',
+                'job_search_id': f"eq.{job_search_id}",
+                'user_id': f"eq.{user_id}",
+                'order': 'match_score.desc',
+            })
+        except Exception as e:
+            print(f"Error fetching match results: {e}")
+            return []
+
+    async def get_user_matches(self, user_id: str, limit: int = 100,
+                               after: Optional[PageCursor] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a user's match results, newest first (summary columns), and the next page's cursor"""
+        try:
+            return await self._read_through(user_id, 'matches', [limit, after], lambda: self._keyset_select('match_results', {
+                'select': f'{MATCH_SUMMARY_COLUMNS}, resumes(filename, name), job_searches(job_title)',
+                'user_id': f"eq.{user_id}",
+            }, limit, after))
+        except Exception as e:
+            print(f"Error fetching user matches: {e}")
+            return [], None
+
+    # ==================== STATISTICS ====================
+
+    async def get_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
+        """
+        Get dashboard statistics for a user
+        One call to the get_dashboard_stats SQL function (database/schema.sql);
+        separate queries where it isn't installed
+        """
+        try:
+            return await self._read_through(user_id, 'dashboard', None, lambda: self._load_dashboard_stats(user_id))
+        except Exception as e:
+            print(f"Error fetching dashboard stats: {e}")
+            return empty_dashboard_stats()
+
+    async def _load_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
+        if self.stats_rpc:
+            try:
+                stats = (await self._request('POST', 'rpc/get_dashboard_stats', json={'p_user_id': user_id})).json()
+                if stats:
+                    return stats
+            except httpx.HTTPStatusError as e:
+                if _error_code(e.response) in MISSING_FUNCTION_CODES:
+                    print("get_dashboard_stats SQL function not found (run database/schema.sql) - using separate queries")
+                    self.stats_rpc = False
+                else:
+                    print(f"Error fetching dashboard stats via RPC: {e}")
+            except Exception as e:
+                print(f"Error fetching dashboard stats via RPC: {e}")
+        return await self._dashboard_stats_by_queries(user_id)
+
+    async def _dashboard_stats_by_queries(self, user_id: str) -> Dict[str, Any]:
+        """
+        Dashboard statistics without the SQL function: every score and skill
+        list downloaded (queries run concurrently)
+        """
+        resumes_count, jobs_count, resumes, matches, recent = await asyncio.gather(
+            self._count('resumes', user_id),
+            self._count('job_searches', user_id),
+            self._select('resumes', {'select': 'skills', 'user_id': f"eq.{user_id}"}),
+            self._select('match_results', {'select': 'match_score', 'user_id': f"eq.{user_id}"}),
+            self._select('match_results', {
+                'select': '*, resumes(filename, name), job_searches(job_title)',
+                'user_id': f"eq.{user_id}",
+                'order': 'created_at.desc',
+                'limit': 10,
+            }),
+        )
+
+        return dashboard_stats(
+            resumes_count,
+            jobs_count,
+            [m['match_score'] for m in matches],
+            [r.get('skills') for r in resumes],
+            recent
+        )
+
+
+def _error_code(response: httpx.Response) -> Optional[str]:
+    """PostgREST error code of an error response"""
+    try:
+        return response.json().get('code')
+    except ValueError:
+        return None
@@ -0,0 +1,158 @@
+"""
+Fuzzy skill matching microbenchmark
+Compares the row-by-row Levenshtein dynamic program against the
+bit-parallel engine with length-bucket pruning and threshold early exit,
+and checks that similarities and match results are identical
+
+Run from backend/: python benchmarks/bench_levenshtein.py
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matcher
+from matcher import ResumeMatcher, levenshtein_distance
+from resume_parser import KNOWN_SKILLS
+from vocabulary import Vocabulary
+
+
+def legacy_distance(s1: str, s2: str) -> int:
+    """Previous implementation: one new list per row of the DP table"""
+    if len(s1) < len(s2):
+        return legacy_distance(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            current_row.append(min(previous_row[j + 1] + 1, current_row[j] + 1, previous_row[j] + (c1 != c2)))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+class LegacyMatcher(ResumeMatcher):
+    """ResumeMatcher as it was: full DP against every term, lowercasing on every call"""
+
+    def levenshtein_similarity(self, str1: str, str2: str) -> float:
+        distance = legacy_distance(str1.lower(), str2.lower())
+        max_len = max(len(str1), len(str2))
+        if max_len == 0:
+            return 1.0
+        return 1 - (distance / max_len)
+
+    def fuzzy_match_skill(self, skill, skill_list):
+        best_match, best_score = None, 0
+        for candidate_skill in skill_list:
+            similarity = self.levenshtein_similarity(skill, candidate_skill)
+            if similarity > best_score:
+                best_score, best_match = similarity, candidate_skill
+        return best_score >= self.threshold, best_match, best_score
+
+    def match(self, resume_data, required_skills):
+        all_resume_terms = resume_data.get('skills', []) + resume_data.get('keywords', [])
+        matched_skills, missing_skills, match_details = [], [], []
+        for required_skill in required_skills:
+            matched, best_match, similarity = self.fuzzy_match_skill(required_skill, all_resume_terms)
+            if matched:
+                matched_skills.append(required_skill)
+                match_details.append({'required': required_skill, 'found': best_match,
+                                      'similarity': round(similarity, 2)})
+            else:
+                missing_skills.append(required_skill)
+        score = len(matched_skills) / len(required_skills) * 100 if required_skills else 0
+        return {'score': round(score, 2), 'matched_skills': matched_skills,
+                'missing_skills': missing_skills, 'match_details': match_details}
+
+
+def random_word(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_letters + ' .+#') for _ in range(rng.randint(0, 25)))
+
+
+def check_distances(rng: random.Random, cases: int = 20000):
+    """Bit-parallel distance equals the DP on random and skill-like strings"""
+    skills = sorted(KNOWN_SKILLS)
+    for _ in range(cases):
+        a = rng.choice(skills) if rng.random() < 0.5 else random_word(rng)
+        b = rng.choice(skills) if rng.random() < 0.5 else random_word(rng)
+        if levenshtein_distance(a, b) != legacy_distance(a, b):
+            print(f"MISMATCH: {a!r} vs {b!r}")
+            sys.exit(1)
+
+
+def build_workload(rng: random.Random, resumes: int = 200):
+    """Synthetic resumes: skills with typos plus keyword noise"""
+    skills = sorted(KNOWN_SKILLS)
+    workload = []
+    for _ in range(resumes):
+        resume_skills = rng.sample(skills, 15)
+        keywords = [random_word(rng).lower() or 'x' for _ in range(20)]
+        required = rng.sample(skills, 8) + [s[:-1] for s in rng.sample(skills, 2) if len(s) > 3]
+        workload.append(({'skills': resume_skills, 'keywords': keywords}, required))
+    return workload
+
+
+def cold_matcher() -> ResumeMatcher:
+    """Matcher with nothing remembered, so runs measure the distance engine itself"""
+    return ResumeMatcher(vocabulary=Vocabulary(), similarity_cache_size=0)
+
+
+def time_it(matcher: ResumeMatcher, workload) -> float:
+    """Milliseconds per resume"""
+    start = time.perf_counter()
+    for resume_data, required in workload:
+        matcher.match(resume_data, required)
+    return (time.perf_counter() - start) * 1000 / len(workload)
+
+
+def main():
+    rng = random.Random(42)
+    check_distances(rng)
+
+    workload = build_workload(rng)
+    legacy, fast = LegacyMatcher(), ResumeMatcher()
+    for resume_data, required in workload:
+        if legacy.match(resume_data, required) != fast.match(resume_data, required):
+            print(f"MISMATCH for required skills {required}")
+            sys.exit(1)
+        for skill in required:
+            terms = resume_data['skills'] + resume_data['keywords']
+            if legacy.fuzzy_match_skill(skill, terms) != fast.fuzzy_match_skill(skill, terms):
+                print(f"MISMATCH in fuzzy_match_skill for {skill!r}")
+                sys.exit(1)
+
+    # How many pairs still reach the distance computation after length pruning
+    computed = 0
+    within = matcher.levenshtein_within
+
+    def counting_within(*args, **kwargs):
+        nonlocal computed
+        computed += 1
+        return within(*args, **kwargs)
+
+    # The equivalence check above warmed fast's term cache - count on a cold matcher
+    matcher.levenshtein_within = counting_within
+    counted = cold_matcher()
+    for resume_data, required in workload:
+        counted.match(resume_data, required)
+    matcher.levenshtein_within = within
+    pairs = sum(len(required) * len(resume_data['skills'] + resume_data['keywords'])
+                for resume_data, required in workload)
+
+    legacy_ms = time_it(legacy, workload)
+    fast_ms = time_it(cold_matcher(), workload)
+
+    print(f"Resumes: {len(workload)}, required skills: {len(workload[0][1])}")
+    print(f"Row-by-row DP:            {legacy_ms:.3f} ms/resume")
+    print(f"Bit-parallel + pruning:   {fast_ms:.3f} ms/resume")
+    print(f"Speedup:                  {legacy_ms / fast_ms:.1f}x")
+    print(f"Distances computed:       {computed} of {pairs} pairs ({computed / pairs:.0%})")
+
+
+if __name__ == "__main__":
+    main()
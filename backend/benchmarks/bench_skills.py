@@ -0,0 +1,77 @@
+"""
+Skill extraction microbenchmark
+Compares the per-skill regex loop against the compiled SkillMatcher
+on the test-resumes/ corpus and checks that both find the same skills
+
+Run from backend/: python benchmarks/bench_skills.py
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_parser import KNOWN_SKILLS, ResumeParser
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'test-resumes')
+
+
+def legacy_find_skills(text_lower: str) -> set:
+    """Previous implementation: one full-text regex search per known skill"""
+    found = set()
+    for skill in KNOWN_SKILLS:
+        pattern = r'\b' + re.escape(skill) + r'(?:\.js)?\b'
+        if re.search(pattern, text_lower):
+            found.add(skill)
+    return found
+
+
+def load_corpus(parser: ResumeParser) -> list:
+    """Extract text from every resume in test-resumes/"""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*'))):
+        try:
+            text = parser.extract_text(path)
+        except Exception as e:
+            print(f"Skipping {os.path.basename(path)}: {e}")
+            continue
+        if text:
+            texts.append((os.path.basename(path), text.lower()))
+    return texts
+
+
+def time_it(func, texts, rounds: int) -> float:
+    """Average milliseconds per document"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for _, text in texts:
+            func(text)
+    return (time.perf_counter() - start) * 1000 / (rounds * len(texts))
+
+
+def main(rounds: int = 50):
+    parser = ResumeParser(nlp_processor=None)  # Skill matching does not use NLP
+    texts = load_corpus(parser)
+
+    # Same results as the old loop
+    for name, text in texts:
+        legacy = legacy_find_skills(text)
+        compiled = set(parser.skill_matcher.find_all(text))
+        if legacy != compiled:
+            print(f"MISMATCH in {name}: {sorted(legacy ^ compiled)}")
+            sys.exit(1)
+
+    legacy_ms = time_it(legacy_find_skills, texts, rounds)
+    compiled_ms = time_it(parser.skill_matcher.find_all, texts, rounds)
+
+    print(f"Documents: {len(texts)}, rounds: {rounds}")
+    print(f"Per-skill regex loop: {legacy_ms:.3f} ms/doc")
+    print(f"Compiled matcher:     {compiled_ms:.3f} ms/doc")
+    print(f"Speedup:              {legacy_ms / compiled_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
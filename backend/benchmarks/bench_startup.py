@@ -0,0 +1,50 @@
+"""
+Start-up benchmark
+Measures, in fresh interpreters, how long it takes to import the API
+(main.py) and how long until the NLP pipeline is ready to serve
+
+Run from backend/: python benchmarks/bench_startup.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+main.nlp_processor.load()
+t2 = time.perf_counter()
+print(json.dumps({'import_s': t1 - t0, 'ready_s': t2 - t0}))
+"""
+
+
+def measure_once() -> dict:
+    """Import main.py in a new interpreter and report its timings"""
+    env = dict(os.environ, NLTK_AUTO_DOWNLOAD="false", PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int = 5):
+    samples = [measure_once() for _ in range(runs)]
+    report = {
+        'runs': runs,
+        'import_median_s': round(statistics.median(s['import_s'] for s in samples), 3),
+        'ready_median_s': round(statistics.median(s['ready_s'] for s in samples), 3),
+    }
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
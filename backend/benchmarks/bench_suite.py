@@ -0,0 +1,284 @@
+"""
+Benchmark suite for the extraction, NLP and matching hot paths
+- extract.<format>: ResumeParser.extract_text_from_* on test-resumes/
+- <size>.analyze / .skills / .keywords: NLP pipeline, extract_skills and
+  extract_keywords on a synthetic corpus of <size> documents
+- <size>.job_analysis: JobAnalyzer.analyze on synthetic job descriptions
+- <size>.match: ResumeMatcher.match of every document against one job
+
+Each stage reports ms per document and the tracemalloc peak (KiB above
+the start of the stage, measured in a separate pass). Results are JSON;
+with --baseline, stages slower than the baseline by more than --tolerance
+are flagged and the exit status is 1. Runs offline, without a database.
+
+The synthetic corpus recombines lines of the real resumes, so term
+distributions stay realistic while the corpus grows.
+
+Run from backend/:
+    python benchmarks/bench_suite.py --output bench.json
+    python benchmarks/bench_suite.py --baseline bench.json
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_analyzer import JobAnalyzer
+from matcher import ResumeMatcher
+from nlp_processor import NLPProcessor
+from resume_parser import ResumeParser
+from vocabulary import Vocabulary
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'test-resumes')
+
+EXTRACTORS = {
+    'txt': 'extract_text_from_txt',
+    'docx': 'extract_text_from_docx',
+    'pdf': 'extract_text_from_pdf',
+}
+
+
+def quiet():
+    """Silence the extractors' progress prints"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def measure_peak(func, *args) -> float:
+    """Peak traced allocation while func runs, in KiB"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round((peak - start) / 1024, 1)
+
+
+def load_files():
+    """(format, bytes) of every supported file in test-resumes/"""
+    files = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*'))):
+        file_format = os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format in EXTRACTORS:
+            with open(path, 'rb') as file:
+                files.append((file_format, file.read()))
+    return files
+
+
+# ==================== SYNTHETIC CORPUS ====================
+
+def synthetic_documents(lines, count: int, seed: int, lines_per_doc=(40, 90)):
+    """count documents, each a random run of the corpus lines"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield '\n'.join(rng.choices(lines, k=rng.randint(*lines_per_doc)))
+
+
+def corpus_lines(parser: ResumeParser, files) -> list:
+    """Non-empty lines of every TXT resume"""
+    lines = []
+    with quiet():
+        for file_format, data in files:
+            if file_format == 'txt':
+                lines.extend(line for line in parser.extract_text_from_txt(data).splitlines() if line.strip())
+    return lines
+
+
+# ==================== STAGES ====================
+
+def bench_extraction(parser: ResumeParser, files, rounds: int) -> dict:
+    results = {}
+    for file_format, method_name in EXTRACTORS.items():
+        documents = [data for fmt, data in files if fmt == file_format]
+        if not documents:
+            continue
+        extract = getattr(parser, method_name)
+
+        def run():
+            for data in documents:
+                extract(data)
+
+        with quiet():
+            run()  # warm-up: library imports
+            start = time.perf_counter()
+            for _ in range(rounds):
+                run()
+            elapsed = time.perf_counter() - start
+            peak = measure_peak(run)
+        results[f'extract.{file_format}'] = {
+            'docs': len(documents),
+            'ms_per_doc': round(elapsed * 1000 / (rounds * len(documents)), 3),
+            'peak_kib': peak,
+        }
+    return results
+
+
+def bench_corpus(parser: ResumeParser, job_analyzer: JobAnalyzer, lines, size: int,
+                 memory_sample: int) -> dict:
+    nlp = parser.nlp
+    timings = {'analyze': 0.0, 'skills': 0.0, 'keywords': 0.0}
+    resumes = []
+
+    # One pass, timing each stage on the document the previous stage produced
+    clock = time.perf_counter
+    for text in synthetic_documents(lines, size, seed=size):
+        t0 = clock()
+        doc = nlp.analyze(text)
+        t1 = clock()
+        skills = parser.extract_skills(text, doc)
+        t2 = clock()
+        keywords = nlp.extract_keywords(doc, top_n=15)
+        t3 = clock()
+        timings['analyze'] += t1 - t0
+        timings['skills'] += t2 - t1
+        timings['keywords'] += t3 - t2
+        resumes.append({'skills': skills, 'keywords': keywords})
+
+    jobs = list(synthetic_documents(lines, max(1, size // 100), seed=-size, lines_per_doc=(10, 25)))
+    start = clock()
+    analyses = [job_analyzer.analyze(job) for job in jobs]
+    job_seconds = clock() - start
+
+    required = analyses[0]['skills'] + analyses[0]['keywords']
+    start = clock()
+    match_all(resumes, required)
+    match_seconds = clock() - start
+
+    # Memory pass: tracemalloc slows everything down, so it runs on a sample
+    sample = list(synthetic_documents(lines, min(size, memory_sample), seed=size))
+    sample_docs = [nlp.analyze(text) for text in sample]
+
+    def analyze_all():
+        for text in sample:
+            nlp.analyze(text)
+
+    def skills_all():
+        for text, doc in zip(sample, sample_docs):
+            parser.extract_skills(text, doc)
+
+    def keywords_all():
+        for doc in sample_docs:
+            nlp.extract_keywords(doc, top_n=15)
+            doc._ranked = None  # keywords() memoizes its ranking - don't count it as retained
+
+    peaks = {
+        'analyze': measure_peak(analyze_all),
+        'skills': measure_peak(skills_all),
+        'keywords': measure_peak(keywords_all),
+        'job_analysis': measure_peak(lambda: [job_analyzer.analyze(job) for job in jobs[:10]]),
+        'match': measure_peak(match_all, resumes, required),
+    }
+
+    results = {}
+    for stage, seconds in timings.items():
+        results[f'{size}.{stage}'] = {'docs': size, 'ms_per_doc': round(seconds * 1000 / size, 3),
+                                      'peak_kib': peaks[stage]}
+    results[f'{size}.job_analysis'] = {'docs': len(jobs), 'ms_per_doc': round(job_seconds * 1000 / len(jobs), 3),
+                                       'peak_kib': peaks['job_analysis']}
+    results[f'{size}.match'] = {'docs': size, 'ms_per_doc': round(match_seconds * 1000 / size, 3),
+                                'peak_kib': peaks['match']}
+    return results
+
+
+def match_all(resumes, required):
+    """Match every resume with a fresh matcher, so term caches start cold"""
+    matcher = ResumeMatcher(vocabulary=Vocabulary())
+    prepared = matcher.prepare(required)
+    for resume_data in resumes:
+        matcher.match(resume_data, prepared)
+
+
+# ==================== REPORT ====================
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Stages slower than the baseline by more than tolerance (0.25 = 25%)"""
+    regressions = []
+    for stage, current in results.items():
+        previous = baseline.get(stage)
+        if not previous or not previous.get('ms_per_doc'):
+            continue
+        ratio = current['ms_per_doc'] / previous['ms_per_doc']
+        if ratio > 1 + tolerance:
+            regressions.append({'stage': stage, 'baseline_ms': previous['ms_per_doc'],
+                                'ms': current['ms_per_doc'], 'ratio': round(ratio, 2)})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser_args = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser_args.add_argument('--sizes', default='1000,10000', help="synthetic corpus sizes (comma-separated)")
+    parser_args.add_argument('--rounds', type=int, default=5, help="rounds over test-resumes/ for extraction")
+    parser_args.add_argument('--memory-sample', type=int, default=300,
+                             help="documents per stage in the tracemalloc pass")
+    parser_args.add_argument('--output', help="write the JSON report here (default: stdout)")
+    parser_args.add_argument('--baseline', help="JSON report to compare against")
+    parser_args.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser_args.parse_args(argv)
+
+    nlp = NLPProcessor(corpus=None)
+    resume_parser = ResumeParser(nlp).load()
+    job_analyzer = JobAnalyzer(nlp)
+    files = load_files()
+    lines = corpus_lines(resume_parser, files)
+
+    results = bench_extraction(resume_parser, files, args.rounds)
+    for size in (int(s) for s in args.sizes.split(',') if s.strip()):
+        results.update(bench_corpus(resume_parser, job_analyzer, lines, size, args.memory_sample))
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'rounds': args.rounds,
+        },
+        'results': results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as file:
+            report['regressions'] = compare(results, json.load(file)['results'], args.tolerance)
+        status = 1 if report['regressions'] else 0
+
+    for stage, result in results.items():
+        print(f"{stage:<22} {result['ms_per_doc']:>10.3f} ms/doc {result['peak_kib']:>10.1f} KiB peak",
+              file=sys.stderr)
+    for regression in report.get('regressions', []):
+        print(f"REGRESSION {regression['stage']}: {regression['baseline_ms']} -> "
+              f"{regression['ms']} ms/doc ({regression['ratio']}x)", file=sys.stderr)
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(encoded + '\n')
+    else:
+        print(encoded)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
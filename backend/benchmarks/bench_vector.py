@@ -0,0 +1,112 @@
+"""
+Batch ranking benchmark
+Compares fuzzy matching of every resume (engine=fuzzy) against a sparse
+TF-IDF shortlist followed by fuzzy re-ranking of the shortlist
+(engine=vector) on synthetic batches of 1k and 10k resumes, and reports
+how many of the fuzzy top 10 the vector engine also returns
+
+Needs numpy and scipy. Run from backend/: python benchmarks/bench_vector.py
+"""
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matcher import ResumeMatcher
+from resume_parser import KNOWN_SKILLS
+from vector_ranker import VECTOR_AVAILABLE, TermVectors, VectorRanker
+from vocabulary import Vocabulary
+
+SKILLS = sorted(KNOWN_SKILLS)
+TOP = 10
+
+
+def make_words(rng: random.Random, count: int = 20000):
+    """Made-up lemmas with Zipf-like weights"""
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 11))) for _ in range(count)]
+    return words, [1 / (rank + 1) for rank in range(count)]
+
+
+def make_resume(rng: random.Random, words, weights):
+    """Lemma counts plus the parsed data the matcher reads"""
+    frequencies = {}
+    for word in rng.choices(words, weights=weights, k=300):
+        frequencies[word] = frequencies.get(word, 0) + 1
+    skills = rng.sample(SKILLS, rng.randint(3, 15))
+    for skill in skills:
+        for word in skill.split():
+            frequencies[word] = frequencies.get(word, 0) + rng.randint(1, 3)
+    # Keywords skip the most common words, as TF-IDF keyword extraction does
+    keywords = sorted((w for w in frequencies if w not in words[:50]), key=frequencies.get, reverse=True)[:15]
+    return frequencies, {'skills': skills, 'keywords': keywords}
+
+
+def fuzzy_engine(resumes, required):
+    """Match every resume, best TOP by score (batch order on ties)"""
+    matcher = ResumeMatcher(vocabulary=Vocabulary())
+    prepared = matcher.prepare(required)
+    scores = [matcher.match(resume_data, prepared)['score'] for resume_data in resumes]
+    order = sorted(range(len(resumes)), key=lambda i: -scores[i])
+    return order[:TOP]
+
+
+def vector_engine(ranker, keys, resumes, required):
+    """Shortlist by cosine score, then match only the shortlist"""
+    matcher = ResumeMatcher(vocabulary=Vocabulary())
+    prepared = matcher.prepare(required)
+    shortlist = ranker.shortlist(required, keys, resumes)
+    scores = {i: matcher.match(resumes[i], prepared)['score'] for i in shortlist}
+    order = sorted(shortlist, key=lambda i: (-scores[i], i))
+    return order[:TOP]
+
+
+def run(size: int, rounds: int):
+    rng = random.Random(size)
+    words, weights = make_words(rng)
+    batch = [make_resume(rng, words, weights) for _ in range(size)]
+    resumes = [resume_data for _, resume_data in batch]
+    keys = [f"resume-{i}" for i in range(size)]
+    required = rng.sample(SKILLS, 8) + ['machine learning', 'data analysis']
+
+    term_vectors = TermVectors(max_entries=size)
+    for key, (frequencies, resume_data) in zip(keys, batch):
+        term_vectors.put(key, frequencies, resume_data['skills'])
+    ranker = VectorRanker(term_vectors, shortlist_size=100)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fuzzy_top = fuzzy_engine(resumes, required)
+    fuzzy_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        vector_top = vector_engine(ranker, keys, resumes, required)
+    vector_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        ranker.shortlist(required, keys, resumes)
+    shortlist_ms = (time.perf_counter() - start) * 1000 / rounds
+
+    overlap = len(set(fuzzy_top) & set(vector_top))
+    print(f"{size} resumes")
+    print(f"  engine=fuzzy:              {fuzzy_ms:9.1f} ms")
+    print(f"  engine=vector:             {vector_ms:9.1f} ms  ({fuzzy_ms / vector_ms:.1f}x)")
+    print(f"    of which sparse scoring: {shortlist_ms:9.1f} ms")
+    print(f"  fuzzy top {TOP} also in vector top {TOP}: {overlap}/{TOP}")
+
+
+def main():
+    if not VECTOR_AVAILABLE:
+        print("numpy and scipy are needed for the vector engine")
+        return
+    run(1000, rounds=3)
+    run(10000, rounds=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Corpus Stats - Document frequencies over every parsed resume and job
+Gives keyword extraction an IDF so generic words ('experience', 'team')
+rank below distinctive ones. Frequencies live in a flat uint32 array and
+are persisted as one binary file that loads in milliseconds
+"""
+
+import math
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+FILE_MAGIC = b'CORPUS1\n'
+# documents, number of terms, bytes of the term list
+HEADER = struct.Struct('<QQQ')
+
+
+class CorpusStats:
+    """
+    Term -> document frequency, updated one document at a time
+    Only the distinct terms of a document count, once per document
+    """
+
+    def __init__(self, path: Optional[str] = None, save_every: Optional[int] = None,
+                 min_documents: Optional[int] = None, max_df: Optional[float] = None):
+        """
+        Args:
+            path: File the stats are saved to (None = in memory only)
+            save_every: Save after this many new documents (default: CORPUS_SAVE_EVERY or 50)
+            min_documents: Documents needed before IDF is used at all, so a tiny
+                           corpus doesn't skew keywords (default: CORPUS_MIN_DOCUMENTS or 20)
+            max_df: Terms in more than this share of documents are never keywords
+                    (default: KEYWORD_MAX_DF or 0.6)
+        """
+        self.path = path
+        self.save_every = int(os.getenv("CORPUS_SAVE_EVERY", 50)) if save_every is None else save_every
+        self.min_documents = (int(os.getenv("CORPUS_MIN_DOCUMENTS", 20))
+                              if min_documents is None else min_documents)
+        self.max_df = float(os.getenv("KEYWORD_MAX_DF", 0.6)) if max_df is None else max_df
+
+        self.documents = 0
+        self.term_ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.df = array('I')
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        # Held while the file is written; periodic saves skip instead of queueing
+        self._save_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Optional[str] = None, **kwargs) -> "CorpusStats":
+        """
+        Load the stats saved at path, or start empty
+        path defaults to CORPUS_STATS_PATH (or corpus_stats.bin); '' keeps them in memory only
+        """
+        if path is None:
+            path = os.getenv("CORPUS_STATS_PATH", "corpus_stats.bin")
+        stats = cls(path or None, **kwargs)
+        if path and os.path.exists(path):
+            try:
+                stats._load(path)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Ignoring unreadable corpus stats {path}: {e}")
+                stats.documents, stats.term_ids, stats.terms, stats.df = 0, {}, [], array('I')
+        return stats
+
+    # ==================== UPDATES ====================
+
+    def add_document(self, terms: Iterable[str]):
+        """
+        Count one document's distinct terms
+        Callers run on the event loop, so periodic saves happen on a background thread
+        """
+        with self._lock:
+            for term in set(terms):
+                term_id = self.term_ids.get(term)
+                if term_id is None:
+                    term_id = len(self.terms)
+                    self.term_ids[term] = term_id
+                    self.terms.append(term)
+                    self.df.append(1)
+                else:
+                    self.df[term_id] += 1
+            self.documents += 1
+            self._unsaved += 1
+            due = self.path is not None and self.save_every > 0 and self._unsaved >= self.save_every
+        if due:
+            self._save_in_background()
+
+    def _save_in_background(self):
+        if not self._save_lock.acquire(blocking=False):
+            # A save is running; _unsaved stays due, so a later document saves again
+            return
+
+        def run():
+            try:
+                self._write(self.path)
+            except OSError as e:
+                print(f"Could not save corpus stats to {self.path}: {e}")
+            finally:
+                self._save_lock.release()
+
+        threading.Thread(target=run, name="corpus-stats-save", daemon=True).start()
+
+    # ==================== QUERIES ====================
+
+    @property
+    def ready(self) -> bool:
+        """Whether there are enough documents for IDF to mean something"""
+        return self.documents >= max(1, self.min_documents)
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        return self.df[term_id] if term_id is not None else 0
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency: log((1 + N) / (1 + df)) + 1"""
+        return math.log((1 + self.documents) / (1 + self.document_frequency(term))) + 1
+
+    def tfidf(self, frequencies: Dict[str, int]) -> Dict[str, float]:
+        """
+        TF-IDF of a document's terms, leaving out terms too common to be keywords
+        frequencies: term -> count in the document
+        """
+        documents = self.documents
+        max_count = self.max_df * documents
+        scores = {}
+        for term, count in frequencies.items():
+            df = self.document_frequency(term)
+            if df > max_count:
+                continue
+            scores[term] = count * (math.log((1 + documents) / (1 + df)) + 1)
+        return scores
+
+    # ==================== PERSISTENCE ====================
+
+    def save(self, path: Optional[str] = None):
+        """Write the stats atomically (temp file + rename), after any save in progress"""
+        path = path or self.path
+        if not path:
+            return
+        with self._save_lock:
+            self._write(path)
+
+    def _write(self, path: str):
+        with self._lock:
+            df = array('I', self.df)
+            terms = '\n'.join(self.terms).encode('utf-8')
+            documents = self.documents
+            self._unsaved = 0
+        if sys.byteorder != 'little':
+            df.byteswap()
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(FILE_MAGIC)
+            file.write(HEADER.pack(documents, len(df), len(terms)))
+            file.write(df.tobytes())
+            file.write(terms)
+        os.replace(tmp_path, path)
+
+    def _load(self, path: str):
+        with open(path, 'rb') as file:
+            data = file.read()
+        if not data.startswith(FILE_MAGIC):
+            raise ValueError("not a corpus stats file")
+        offset = len(FILE_MAGIC)
+        documents, term_count, terms_size = HEADER.unpack_from(data, offset)
+        offset += HEADER.size
+
+        df = array('I')
+        df.frombytes(data[offset:offset + term_count * df.itemsize])
+        if sys.byteorder != 'little':
+            df.byteswap()
+        offset += term_count * df.itemsize
+        terms = data[offset:offset + terms_size].decode('utf-8').split('\n') if term_count else []
+        if len(df) != term_count or len(terms) != term_count:
+            raise ValueError("truncated corpus stats file")
+
+        self.documents = documents
+        self.df = df
+        self.terms = terms
+        self.term_ids = dict(zip(terms, range(term_count)))
+
+    def stats(self) -> Dict:
+        return {
+            'documents': self.documents,
+            'terms': len(self.terms),
+            'ready': self.ready,
+            'path': self.path,
+        }
@@ -1,20 +1,206 @@
 """
 Database service for Supabase operations
 """
+import base64
+import json
 import os
-from typing import List, Optional, Dict, Any
-from supabase import create_client, Client
-from models import ResumeDB, JobSearchDB, MatchResultDB
+import uuid
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+
+# PostgREST / Postgres error codes for a function that doesn't exist
+MISSING_FUNCTION_CODES = ('PGRST202', '42883')
+
+# Columns returned by the list endpoints; full rows (raw_text, parsed_data,
+# job_description...) are only fetched by ID
+RESUME_SUMMARY_COLUMNS = 'id, filename, file_type, file_size, name, email, phone, skills, created_at, updated_at'
+JOB_SEARCH_SUMMARY_COLUMNS = 'id, job_title, keywords, use_keywords, required_skills, required_roles, created_at'
+MATCH_SUMMARY_COLUMNS = ('id, job_search_id, resume_id, match_score, matched_skills, missing_skills, '
+                         'experience_match, created_at')
+
+# Keyset pagination: pages are ordered newest first on (created_at, id), which the
+# (user_id, created_at DESC, id DESC) indexes in database/schema.sql serve directly
+KEYSET_ORDER = 'created_at.desc,id.desc'
+
+# (created_at, id) of the last row of a page
+PageCursor = Tuple[str, str]
+
+
+def encode_page_cursor(row: Dict[str, Any]) -> str:
+    """Opaque cursor pointing just after a row"""
+    raw = json.dumps([row['created_at'], row['id']], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_page_cursor(cursor: Optional[str]) -> Optional[PageCursor]:
+    """
+    Parse a cursor from encode_page_cursor (None passes through)
+    Both values are validated, as they end up in a PostgREST filter
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        datetime.fromisoformat(created_at)
+        return created_at, str(uuid.UUID(row_id))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(after: PageCursor) -> str:
+    """PostgREST or= condition (without parentheses) for the rows after a cursor"""
+    created_at, row_id = after
+    return f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+
+
+def keyset_page(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Split the limit + 1 rows of a keyset query into the page and the next page's cursor"""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_page_cursor(page[-1])
+
+
+def empty_dashboard_stats() -> Dict[str, Any]:
+    """Dashboard statistics of a user with no history"""
+    return {
+        'total_resumes': 0,
+        'total_job_searches': 0,
+        'total_matches': 0,
+        'avg_match_score': 0,
+        'score_histogram': score_histogram([]),
+        'top_skills': [],
+        'recent_activity': []
+    }
+
+
+def dashboard_stats(total_resumes: int, total_job_searches: int, scores: List[float],
+                    skill_lists: List[Optional[List[str]]], recent: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Dashboard statistics from raw rows, when the get_dashboard_stats SQL
+    function is missing - same fields and rules as the function
+    """
+    total_matches = len(scores)
+    avg_score = sum(float(score) for score in scores) / total_matches if total_matches > 0 else 0
+    return {
+        'total_resumes': total_resumes,
+        'total_job_searches': total_job_searches,
+        'total_matches': total_matches,
+        'avg_match_score': round(avg_score, 2) if avg_score else 0,
+        'score_histogram': score_histogram(scores),
+        'top_skills': top_skills(skill_lists),
+        'recent_activity': recent
+    }
+
+
+def top_skills(skill_lists: List[Optional[List[str]]], top_n: int = 10) -> List[Dict[str, Any]]:
+    """Most frequent skills across resumes, lowercased (count desc, then name), like get_dashboard_stats in SQL"""
+    counts: Dict[str, int] = {}
+    for skills in skill_lists:
+        for skill in skills or []:
+            skill = skill.lower()
+            counts[skill] = counts.get(skill, 0) + 1
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+    return [{'skill': skill, 'count': count} for skill, count in ranked]
+
+
+def score_histogram(scores: List[float]) -> List[Dict[str, int]]:
+    """Match counts in 10 buckets of 10 points (100 falls in the last), like get_dashboard_stats in SQL"""
+    counts = [0] * 10
+    for score in scores:
+        counts[min(int(float(score) // 10), 9)] += 1
+    return [{'min': bucket * 10, 'max': bucket * 10 + 10, 'count': count} for bucket, count in enumerate(counts)]
+
+
+def chunks(rows: List[Dict[str, Any]], size: int):
+    """Consecutive slices of rows, size each"""
+    size = max(1, size)
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def bulk_insert(rows: List[Dict[str, Any]], chunk_size: int, what: str, returning: bool = True):
+    """
+    Chunked insert with a row-by-row retry of failed chunks, shared by both services
+    A generator that does no I/O: it yields each payload to insert (a chunk
+    or a single row) and is sent back the inserted rows or the exception
+    raised. Run it with run_bulk_insert (or AsyncDatabaseService's driver)
+    
+    Args:
+        what: Plural table noun for log messages ("resumes")
+        returning: Whether inserts send back the rows (return=representation);
+                   with return=minimal a chunk succeeds if it doesn't raise
+    
+    Returns (StopIteration value):
+        One entry per input row, in order: the saved row (True with
+        returning=False), or None where saving failed
+    """
+    saved: List[Any] = []
+    for chunk in chunks(rows, chunk_size):
+        outcome = yield chunk
+        if not isinstance(outcome, Exception):
+            if not returning:
+                saved.extend([True] * len(chunk))
+                continue
+            if len(outcome) == len(chunk):
+                saved.extend(outcome)
+                continue
+            outcome = ValueError(f"{len(outcome)} of {len(chunk)} {what} returned")
+        
+        print(f"Error saving {len(chunk)} {what}, retrying one by one: {outcome}")
+        for row in chunk:
+            outcome = yield row
+            if isinstance(outcome, Exception):
+                print(f"Error saving {what[:-1]}: {outcome}")
+                saved.append(None)
+            elif returning:
+                saved.append(outcome[0] if outcome else None)
+            else:
+                saved.append(True)
+    return saved
+
+
+def run_bulk_insert(steps, insert) -> List[Any]:
+    """Drive bulk_insert with a blocking insert(payload) -> inserted rows"""
+    try:
+        payload = next(steps)
+        while True:
+            try:
+                outcome = insert(payload)
+            except Exception as e:
+                outcome = e
+            payload = steps.send(outcome)
+    except StopIteration as done:
+        return done.value
+
 
 class DatabaseService:
     def __init__(self):
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_SERVICE_KEY")  # Use service key for backend
+        self.supabase_url = os.getenv("SUPABASE_URL")
+        self.supabase_key = os.getenv("SUPABASE_SERVICE_KEY")  # Use service key for backend
         
-        if not supabase_url or not supabase_key:
+        if not self.supabase_url or not self.supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in environment")
         
-        self.client: Client = create_client(supabase_url, supabase_key)
+        self._client = None
+        # Optional SkillIndexRegistry kept in sync with resume writes
+        self.skill_index = None
+        # Optional ReadCache (shared with AsyncDatabaseService), invalidated by writes
+        self.read_cache = None
+        # Rows per insert for the bulk save_* methods
+        self.write_batch_size = int(os.getenv("DB_WRITE_BATCH_SIZE", 100))
+        # False once the get_dashboard_stats SQL function turns out to be missing
+        self.stats_rpc = True
+    
+    @property
+    def client(self):
+        """Supabase client, created on first use to keep start-up fast"""
+        if self._client is None:
+            from supabase import create_client
+            
+            self._client = create_client(self.supabase_url, self.supabase_key)
+        return self._client
     
     # ==================== RESUMES ====================
     
@@ -22,24 +208,68 @@ class DatabaseService:
         """Save a resume to database"""
         try:
             response = self.client.table('resumes').insert(resume_data).execute()
-            return response.data[0] if response.data else None
+            saved = response.data[0] if response.data else None
         except Exception as e:
             print(f"Error saving resume: {e}")
             raise
+        
+        if saved and self.skill_index is not None:
+            self.skill_index.resume_saved(saved.get('user_id', resume_data.get('user_id')), saved)
+        self._invalidate([resume_data], 'resume_saved')
+        return saved
     
-    def get_user_resumes(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get all resumes for a user"""
+    def save_resumes(self, resume_rows: List[Dict[str, Any]],
+                     chunk_size: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Save many resumes, one insert per chunk
+        A chunk that fails is retried row by row, so one bad row doesn't
+        lose the others
+        
+        Returns:
+            The saved rows (with their ids) in input order; None where saving failed
+        """
+        saved = run_bulk_insert(
+            bulk_insert(resume_rows, chunk_size or self.write_batch_size, 'resumes'),
+            lambda payload: self.client.table('resumes').insert(payload).execute().data or []
+        )
+        
+        if self.skill_index is not None:
+            for resume_data, row in zip(resume_rows, saved):
+                if row:
+                    self.skill_index.resume_saved(row.get('user_id', resume_data.get('user_id')), row)
+        self._invalidate(resume_rows, 'resume_saved')
+        return saved
+    
+    def _invalidate(self, rows: List[Optional[Dict[str, Any]]], event: str):
+        """Invalidate the cached reads of every user with a row written"""
+        if self.read_cache is None:
+            return
+        for user_id in dict.fromkeys(row.get('user_id') for row in rows if row):
+            if user_id:
+                self.read_cache.invalidate(user_id, event)
+    
+    def _keyset(self, query, limit: int, after: Optional[PageCursor] = None):
+        """Order a query for keyset pagination and fetch one row more than limit"""
+        if after is not None:
+            query = query.or_(keyset_filter(after))
+        return query.order('created_at', desc=True).order('id', desc=True).limit(limit + 1)
+    
+    def get_user_resumes(self, user_id: str, limit: int = 50,
+                         after: Optional[PageCursor] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get a page of a user's resumes, newest first (summary columns)
+        
+        Returns:
+            The rows and the cursor of the next page (None on the last page)
+        """
         try:
-            response = self.client.table('resumes')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .order('created_at', desc=True)\
-                .range(offset, offset + limit - 1)\
-                .execute()
-            return response.data
+            query = self.client.table('resumes')\
+                .select(RESUME_SUMMARY_COLUMNS)\
+                .eq('user_id', user_id)
+            return keyset_page(self._keyset(query, limit, after).execute().data or [], limit)
         except Exception as e:
             print(f"Error fetching resumes: {e}")
-            return []
+            return [], None
     
     def get_resume_by_id(self, resume_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific resume by ID"""
@@ -63,10 +293,15 @@ class DatabaseService:
                 .eq('id', resume_id)\
                 .eq('user_id', user_id)\
                 .execute()
-            return True
         except Exception as e:
             print(f"Error deleting resume: {e}")
             return False
+        
+        if self.skill_index is not None:
+            self.skill_index.resume_deleted(user_id, resume_id)
+        if self.read_cache is not None:
+            self.read_cache.invalidate(user_id, 'resume_deleted')
+        return True
     
     def search_resumes(self, user_id: str, query: str) -> List[Dict[str, Any]]:
         """Search resumes by name, email, or skills"""
@@ -83,30 +318,53 @@ class DatabaseService:
             print(f"Error searching resumes: {e}")
             return []
     
+    def iter_resume_index_rows(self, user_id: str, page_size: int = 1000):
+        """
+        Yield the fields the skill index and library matching need for
+        every resume of a user
+        Pages through the table by keyset and selects only the keywords
+        out of parsed_data, so raw text is never transferred
+        """
+        after = None
+        while True:
+            query = self.client.table('resumes')\
+                .select('id, filename, name, email, created_at, skills, keywords:parsed_data->keywords')\
+                .eq('user_id', user_id)
+            if after is not None:
+                query = query.or_(keyset_filter(after))
+            rows = query.order('created_at', desc=True)\
+                .order('id', desc=True)\
+                .limit(page_size)\
+                .execute().data or []
+            yield from rows
+            if len(rows) < page_size:
+                return
+            after = (rows[-1]['created_at'], rows[-1]['id'])
+    
     # ==================== JOB SEARCHES ====================
     
     def save_job_search(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Save a job search to database"""
         try:
             response = self.client.table('job_searches').insert(job_data).execute()
-            return response.data[0] if response.data else None
         except Exception as e:
             print(f"Error saving job search: {e}")
             raise
+        
+        self._invalidate([job_data], 'job_search_saved')
+        return response.data[0] if response.data else None
     
-    def get_user_job_searches(self, user_id: str, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get all job searches for a user"""
+    def get_user_job_searches(self, user_id: str, limit: int = 50,
+                              after: Optional[PageCursor] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a user's job searches, newest first (summary columns), and the next page's cursor"""
         try:
-            response = self.client.table('job_searches')\
-                .select('*')\
-                .eq('user_id', user_id)\
-                .order('created_at', desc=True)\
-                .range(offset, offset + limit - 1)\
-                .execute()
-            return response.data
+            query = self.client.table('job_searches')\
+                .select(JOB_SEARCH_SUMMARY_COLUMNS)\
+                .eq('user_id', user_id)
+            return keyset_page(self._keyset(query, limit, after).execute().data or [], limit)
         except Exception as e:
             print(f"Error fetching job searches: {e}")
-            return []
+            return [], None
     
     def get_job_search_by_id(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific job search by ID"""
@@ -128,16 +386,34 @@ class DatabaseService:
         """Save a match result to database"""
         try:
             response = self.client.table('match_results').insert(match_data).execute()
-            return response.data[0] if response.data else None
         except Exception as e:
             print(f"Error saving match result: {e}")
             raise
+        
+        self._invalidate([match_data], 'match_saved')
+        return response.data[0] if response.data else None
+    
+    def save_match_results(self, match_rows: List[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """
+        Save many match results, one insert per chunk
+        The rows are not sent back (returning=minimal). A chunk that fails
+        is retried row by row
+        
+        Returns:
+            How many were saved
+        """
+        saved = run_bulk_insert(
+            bulk_insert(match_rows, chunk_size or self.write_batch_size, 'match results', returning=False),
+            lambda payload: self.client.table('match_results').insert(payload, returning='minimal').execute().data
+        )
+        self._invalidate(match_rows, 'match_saved')
+        return sum(1 for row in saved if row)
     
     def get_job_matches(self, job_search_id: str, user_id: str) -> List[Dict[str, Any]]:
         """Get all match results for a job search"""
         try:
             response = self.client.table('match_results')\
-                .select('*, resumes(*)')\
+                .select(f'*, resumes({RESUME_SUMMARY_COLUMNS})')\
                 .eq('job_search_id', job_search_id)\
                 .eq('user_id', user_id)\
                 .order('match_score', desc=True)\
@@ -147,28 +423,45 @@ class DatabaseService:
             print(f"Error fetching match results: {e}")
             return []
     
-    def get_user_matches(self, user_id: str, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get all match results for a user"""
+    def get_user_matches(self, user_id: str, limit: int = 100,
+                         after: Optional[PageCursor] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get a page of a user's match results, newest first (summary columns), and the next page's cursor"""
         try:
-            response = self.client.table('match_results')\
-                .select('*, resumes(filename, name), job_searches(job_title)')\
-                .eq('user_id', user_id)\
-                .order('created_at', desc=True)\
-                .range(offset, offset + limit - 1)\
-                .execute()
-            return response.data
+            query = self.client.table('match_results')\
+                .select(f'{MATCH_SUMMARY_COLUMNS}, resumes(filename, name), job_searches(job_title)')\
+                .eq('user_id', user_id)
+            return keyset_page(self._keyset(query, limit, after).execute().data or [], limit)
         except Exception as e:
             print(f"Error fetching user matches: {e}")
-            return []
+            return [], None
     
     # ==================== STATISTICS ====================
     
     def get_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
-        """Get dashboard statistics for a user"""
+        """
+        Get dashboard statistics for a user
+        One call to the get_dashboard_stats SQL function (database/schema.sql);
+        separate queries where it isn't installed
+        """
+        if self.stats_rpc:
+            try:
+                response = self.client.rpc('get_dashboard_stats', {'p_user_id': user_id}).execute()
+                if response.data:
+                    return response.data
+            except Exception as e:
+                if getattr(e, 'code', None) in MISSING_FUNCTION_CODES:
+                    print("get_dashboard_stats SQL function not found (run database/schema.sql) - using separate queries")
+                    self.stats_rpc = False
+                else:
+                    print(f"Error fetching dashboard stats via RPC: {e}")
+        return self._dashboard_stats_by_queries(user_id)
+    
+    def _dashboard_stats_by_queries(self, user_id: str) -> Dict[str, Any]:
+        """Dashboard statistics without the SQL function: four round trips, every score and skill list downloaded"""
         try:
-            # Count total resumes
-            resumes_count = self.client.table('resumes')\
-                .select('id', count='exact')\
+            # Count total resumes, with their skills for the top skills
+            resumes = self.client.table('resumes')\
+                .select('skills', count='exact')\
                 .eq('user_id', user_id)\
                 .execute()
             
@@ -184,9 +477,6 @@ class DatabaseService:
                 .eq('user_id', user_id)\
                 .execute()
             
-            total_matches = len(matches.data) if matches.data else 0
-            avg_score = sum(m['match_score'] for m in matches.data) / total_matches if total_matches > 0 else 0
-            
             # Get recent activity
             recent = self.client.table('match_results')\
                 .select('*, resumes(filename, name), job_searches(job_title)')\
@@ -195,19 +485,13 @@ class DatabaseService:
                 .limit(10)\
                 .execute()
             
-            return {
-                'total_resumes': resumes_count.count or 0,
-                'total_job_searches': jobs_count.count or 0,
-                'total_matches': total_matches,
-                'avg_match_score': round(avg_score, 2) if avg_score else 0,
-                'recent_activity': recent.data or []
-            }
+            return dashboard_stats(
+                resumes.count or 0,
+                jobs_count.count or 0,
+                [m['match_score'] for m in matches.data or []],
+                [r.get('skills') for r in resumes.data or []],
+                recent.data or []
+            )
         except Exception as e:
             print(f"Error fetching dashboard stats: {e}")
-            return {
-                'total_resumes': 0,
-                'total_job_searches': 0,
-                'total_matches': 0,
-                'avg_match_score': 0,
-                'recent_activity': []
-            }
+            return empty_dashboard_stats()
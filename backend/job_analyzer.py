@@ -4,8 +4,8 @@ Extracts skills, roles, and requirements from job descriptions using PURE NLP
 """
 
 import re
-from typing import Dict, List
-from nlp_processor import NLPProcessor
+from typing import Dict, List, Optional
+from nlp_processor import AnalyzedDocument, NLPProcessor
 
 
 class JobAnalyzer:
@@ -18,20 +18,21 @@ class JobAnalyzer:
         """Initialize with NLP processor"""
         self.nlp = nlp_processor
     
-    def extract_roles(self, text: str) -> List[str]:
+    def extract_roles(self, text: str, doc: Optional[AnalyzedDocument] = None) -> List[str]:
         """
         Extract job roles using NLP keyword extraction
         Looks for important nouns that might be roles
         """
+        doc = doc or self.nlp.analyze(text)
+        
         # Use keyword extraction
-        keywords = self.nlp.extract_keywords(text, top_n=15)
+        keywords = self.nlp.extract_keywords(doc, top_n=15)
         
         # Filter for likely role terms (ending with common role suffixes)
         role_keywords = ['developer', 'engineer', 'manager', 'architect', 'analyst',
                         'designer', 'specialist', 'lead', 'director', 'coordinator']
         
         found_roles = []
-        text_lower = text.lower()
         
         for keyword in keywords:
             # Check if keyword contains any role term
@@ -40,17 +41,16 @@ class JobAnalyzer:
         
         return list(set(found_roles))[:5]
     
-    def extract_skills(self, text: str) -> List[str]:
+    def extract_skills(self, text: str, doc: Optional[AnalyzedDocument] = None) -> List[str]:
         """
         Extract required skills using PURE NLP - NO HARDCODING!
         Uses Tokenization + Lemmatization + Keyword Extraction
         """
-        # Step 1: Extract keywords using TF-based importance
-        keywords = self.nlp.extract_keywords(text, top_n=30)
+        doc = doc or self.nlp.analyze(text)
         
-        # Step 2: Tokenize and lemmatize
-        tokens = self.nlp.tokenize(text.lower())
-        lemmatized = self.nlp.lemmatize(text.lower())
+        # Step 1: Extract keywords using TF-based importance
+        # (tokens and lemmas come from the analyzed document)
+        keywords = self.nlp.extract_keywords(doc, top_n=30)
         
         found_skills = []
         
@@ -89,23 +89,24 @@ class JobAnalyzer:
         ]
         
         for pattern in multi_word_patterns:
-            matches = re.findall(pattern, text.lower())
+            matches = re.findall(pattern, doc.lower)
             found_skills.extend(matches)
         
         return list(set(found_skills))[:40]  # Return top 40 unique skills
     
-    def extract_experience(self, text: str) -> str:
+    def extract_experience(self, text: str, doc: Optional[AnalyzedDocument] = None) -> str:
         """
         Extract required years of experience
         Looks for patterns like "5 years experience", "3+ years"
         """
+        text_lower = doc.lower if doc else text.lower()
         patterns = [
             r'(\d+)\+?\s*(?:years?|yrs?)(?:\s+of)?\s+experience',
             r'(\d+)-(\d+)\s*(?:years?|yrs?)',
         ]
         
         for pattern in patterns:
-            match = re.search(pattern, text.lower())
+            match = re.search(pattern, text_lower)
             if match:
                 if len(match.groups()) > 1:
                     return f"{match.group(1)}-{match.group(2)} years"
@@ -113,7 +114,7 @@ class JobAnalyzer:
         
         return "Not specified"
     
-    def analyze(self, description: str) -> Dict:
+    def analyze(self, description: str, doc: Optional[AnalyzedDocument] = None) -> Dict:
         """
         Analyze job description and extract all requirements
         
@@ -127,13 +128,16 @@ class JobAnalyzer:
             - experience: Required experience
             - keywords: Important keywords extracted
         """
+        # Run the NLP pipeline once; every extractor reads from it
+        doc = doc or self.nlp.analyze(description)
+        
         # Extract components
-        roles = self.extract_roles(description)
-        skills = self.extract_skills(description)
-        experience = self.extract_experience(description)
+        roles = self.extract_roles(description, doc)
+        skills = self.extract_skills(description, doc)
+        experience = self.extract_experience(description, doc)
         
         # Extract keywords using NLP and filter out common non-skill words
-        all_keywords = self.nlp.extract_keywords(description, top_n=20)
+        all_keywords = self.nlp.extract_keywords(doc, top_n=20)
         
         # Common words to exclude from keywords (but NOT testing/tester/developer)
         exclude_words = {
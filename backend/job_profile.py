@@ -0,0 +1,127 @@
+"""
+Job Profile - Compiled, cached matching requirements for a job
+Built once per distinct job input: job analysis or keyword expansion,
+then interning for the matcher. Resubmitting the same job with new
+resumes skips all of it
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from lru import LRUCache
+from matcher import RequiredSkills, ResumeMatcher
+
+
+def profile_key(job_data: Dict[str, Any]) -> str:
+    """Hash of the parts of a job input that affect matching"""
+    if job_data.get('description'):
+        material = {'description': job_data['description']}
+    else:
+        material = {'keywords': list(job_data.get('keywords') or [])}
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def skills_key(required_skills: List[str]) -> str:
+    """Hash of the compiled requirement terms - what a match result depends on"""
+    encoded = json.dumps(list(required_skills), ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class JobProfile:
+    """
+    Everything matching needs from one job input
+    - required_skills: expanded requirement terms, interned for the matcher
+    - analysis: JobAnalyzer output (description input only)
+    - keywords: the keywords as submitted (keyword input only)
+    - skills_key: hash of required_skills; job analysis depends on the
+      corpus statistics, so a rebuilt profile of the same input can differ
+    Shared between requests - treat as read-only
+    """
+
+    def __init__(self, key: str, required_skills: RequiredSkills,
+                 analysis: Optional[Dict[str, Any]] = None, keywords: Optional[List[str]] = None):
+        self.key = key
+        self.required_skills = required_skills
+        self.skills_key = skills_key(required_skills)
+        self.analysis = analysis
+        self.keywords = keywords
+
+    @property
+    def use_keywords(self) -> bool:
+        return self.analysis is None
+
+
+class JobProfileCache:
+    """
+    Builds JobProfiles and keeps the most recently used ones
+    Profiles are tied to the matcher's vocabulary and threshold
+    """
+
+    def __init__(self, job_analyzer, nlp_processor, matcher: ResumeMatcher, max_entries: Optional[int] = None):
+        """
+        Args:
+            job_analyzer: JobAnalyzer for description input
+            nlp_processor: NLPProcessor for keyword expansion
+            matcher: ResumeMatcher the profiles are prepared for
+            max_entries: Profiles to keep (default: JOB_PROFILE_CACHE_SIZE or 256)
+        """
+        self.job_analyzer = job_analyzer
+        self.nlp = nlp_processor
+        self.matcher = matcher
+        if max_entries is None:
+            max_entries = int(os.getenv("JOB_PROFILE_CACHE_SIZE", 256))
+        self.profiles = LRUCache(max_entries)
+
+    def get(self, job_data: Dict[str, Any]) -> JobProfile:
+        """Cached profile for a job input, built on first use"""
+        key = profile_key(job_data)
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = self.build(job_data, key)
+            self.profiles.put(key, profile)
+        return profile
+
+    def build(self, job_data: Dict[str, Any], key: Optional[str] = None) -> JobProfile:
+        """Analyze a job input and prepare its requirements"""
+        key = key or profile_key(job_data)
+        if job_data.get('description'):
+            doc = self.nlp.analyze(job_data['description'])
+            analysis = self.job_analyzer.analyze(job_data['description'], doc)
+            # Job descriptions count towards the corpus stats like resumes
+            if self.nlp.corpus is not None:
+                self.nlp.corpus.add_document(doc.frequencies)
+            required_skills = analysis['skills'] + analysis['keywords']
+            return JobProfile(key, self.matcher.prepare(required_skills), analysis=analysis)
+
+        keywords = list(job_data.get('keywords') or [])
+        return JobProfile(key, self.matcher.prepare(self.expand_keywords(keywords)), keywords=keywords)
+
+    def expand_keywords(self, raw_keywords: List[str]) -> List[str]:
+        """
+        Keywords plus their lemmatized and stemmed forms, deduplicated in order
+        This helps match: tester → test, testing → test
+        """
+        required_skills = []
+        for keyword in raw_keywords:
+            clean_keyword = keyword.strip().lower()
+            # Add original keyword
+            required_skills.append(clean_keyword)
+            # Tokenize first (required for lemmatization and stemming)
+            tokens = self.nlp.tokenize(clean_keyword)
+            # Add lemmatized version (converts to dictionary form)
+            required_skills.extend(self.nlp.lemmatize(tokens))
+            # Add stemmed version (more aggressive, finds word roots)
+            required_skills.extend(self.nlp.stem(tokens))
+
+            # Manually add "test" for "tester" since Porter Stemmer doesn't stem it
+            if clean_keyword == 'tester':
+                required_skills.append('test')
+
+        # Remove duplicates while preserving order
+        return list(dict.fromkeys(required_skills))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.profiles.stats()
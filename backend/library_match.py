@@ -0,0 +1,86 @@
+"""
+Library Match - Score a job against every resume a user has stored
+Stored resumes already hold their skills and keywords, so a new job is
+matched in one pass over the table: no uploads, no text extraction.
+Match results are written back in batches
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+from job_profile import JobProfile
+from matcher import ResumeMatcher
+from ranking import TopK
+
+# Resume fields returned with each match
+SUMMARY_FIELDS = ('id', 'filename', 'name', 'email')
+
+
+class LibraryMatcher:
+    """
+    Pages through a user's resumes (DatabaseService.iter_resume_index_rows),
+    matches each page and saves the results with save_match_results
+    """
+
+    def __init__(self, db, matcher: ResumeMatcher, batch_size: Optional[int] = None):
+        """
+        Args:
+            db: DatabaseService
+            matcher: ResumeMatcher the job profiles were prepared for
+            batch_size: Match results per insert (default: MATCH_SAVE_BATCH_SIZE or 500)
+        """
+        self.db = db
+        self.matcher = matcher
+        self.batch_size = int(os.getenv("MATCH_SAVE_BATCH_SIZE", 500)) if batch_size is None else batch_size
+
+    def run(self, user_id: str, profile: JobProfile, job_search_id: Optional[str] = None,
+            top_k: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Match every stored resume of a user against a job
+        Blocking (database round trips) - run it in an executor
+
+        Args:
+            user_id: Owner of the resumes
+            profile: Compiled job requirements
+            job_search_id: Job search the results are saved under (None = don't save)
+            top_k: Matches to return, best first (None = all)
+
+        Returns:
+            total (resumes matched), saved (results written) and matches
+        """
+        ranking = TopK(top_k)
+        pending: List[Dict[str, Any]] = []
+        total = saved = 0
+
+        for row in self.db.iter_resume_index_rows(user_id):
+            resume_data = {'skills': row.get('skills') or [], 'keywords': row.get('keywords') or []}
+            match_result = self.matcher.match(resume_data, profile.required_skills)
+
+            summary = {field: row.get(field) for field in SUMMARY_FIELDS}
+            summary['score'] = match_result['score']
+            summary['matched_skills'] = match_result['matched_skills']
+            ranking.push(match_result['score'], total, summary)
+            total += 1
+
+            if job_search_id is not None:
+                pending.append({
+                    'user_id': user_id,
+                    'job_search_id': job_search_id,
+                    'resume_id': row['id'],
+                    'match_score': match_result['score'],
+                    'matched_skills': match_result['matched_skills'],
+                    'missing_skills': match_result['missing_skills']
+                })
+                if len(pending) >= self.batch_size:
+                    saved += self._flush(pending)
+
+        if pending:
+            saved += self._flush(pending)
+
+        return {'total': total, 'saved': saved, 'matches': ranking.results()}
+
+    def _flush(self, pending: List[Dict[str, Any]]) -> int:
+        """Save and clear the buffered match results"""
+        count = self.db.save_match_results(pending)
+        pending.clear()
+        return count
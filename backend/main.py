@@ -3,34 +3,50 @@ Resume Parser Backend - FastAPI Application
 Simple and clean implementation for NLP-based resume screening
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Form, Header
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Form, Header, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Union
+import asyncio
 import os
 import json
 from dotenv import load_dotenv
 from datetime import datetime
 import uuid
 
+from corpus_stats import CorpusStats
 from nlp_processor import NLPProcessor
 from resume_parser import ResumeParser
 from job_analyzer import JobAnalyzer
 from matcher import ResumeMatcher
-from database import DatabaseService
+from async_database import AsyncDatabaseService
+from database import DatabaseService, decode_page_cursor
+from job_profile import JobProfileCache
+from library_match import LibraryMatcher
+from match_cache import MatchCache
+from parse_executor import ParseExecutor
+from parse_cache import ParseCache, content_hash
+from ranking import TopK, decode_cursor
+from read_cache import ReadCache, etag
+from skill_index import SkillIndexRegistry
+from vector_ranker import VECTOR_AVAILABLE, TermVectors, VectorRanker
 
 # Load environment variables
 load_dotenv()
 
 # Initialize database service (optional for basic matching)
+# db_service (sync) serves executor threads; async_db serves request handlers
 try:
     db_service = DatabaseService()
+    async_db = AsyncDatabaseService()
     DB_ENABLED = True
     print("✅ Database service initialized")
 except Exception as e:
     print(f"⚠️  Database disabled: {e}")
     print("📝 Basic matching will work, but history/library features disabled")
     db_service = None
+    async_db = None
     DB_ENABLED = False
 
 # Initialize FastAPI app
@@ -43,17 +59,72 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Initialize NLP components
-nlp_processor = NLPProcessor()
+# Initialize NLP components (NLTK data is loaded on first use, never downloaded here)
+# Document frequencies over parsed resumes and jobs, for TF-IDF keywords
+corpus_stats = CorpusStats.open()
+nlp_processor = NLPProcessor(corpus=corpus_stats)
 resume_parser = ResumeParser(nlp_processor)
 job_analyzer = JobAnalyzer(nlp_processor)
 matcher = ResumeMatcher()
+# Job inputs are analyzed once; resubmitting a job reuses its compiled profile
+job_profiles = JobProfileCache(job_analyzer, nlp_processor, matcher)
+# Match results per (resume, job) pair; re-screening the same resumes skips matching
+match_cache = MatchCache(matcher)
+
+# Resume parsing runs in a process pool so the event loop stays free;
+# repeat uploads of the same file are served from the parse cache
+parse_cache = ParseCache()
+# Term counts of parsed resumes, for engine=vector on /api/match (own vocabulary, not the matcher's)
+term_vectors = TermVectors()
+vector_ranker = VectorRanker(term_vectors)
+parse_executor = ParseExecutor(cache=parse_cache, corpus=corpus_stats, term_vectors=term_vectors)
+
+# Inverted skill index over each user's stored resumes, kept in sync by both database services
+skill_index = None
+# Re-matching stored resumes against new jobs
+library_matcher = None
+# Per-user cache of the list and statistics reads, invalidated by both database services
+read_cache = None
+if db_service:
+    skill_index = SkillIndexRegistry(db_service.iter_resume_index_rows)
+    db_service.skill_index = skill_index
+    async_db.skill_index = skill_index
+    library_matcher = LibraryMatcher(db_service, matcher)
+    read_cache = ReadCache.from_env()
+    db_service.read_cache = read_cache
+    async_db.read_cache = read_cache
+
+
+@app.on_event("startup")
+async def warm_up_in_background():
+    """
+    Load NLP data and start parse workers in the background
+    The app accepts requests immediately; early requests wait on the same loaders
+    """
+    if os.getenv("WARM_UP_ON_STARTUP", "true").lower() in ("1", "true", "yes"):
+        loop = asyncio.get_running_loop()
+        app.state.warm_up = asyncio.gather(
+            loop.run_in_executor(None, nlp_processor.load),
+            parse_executor.warm_up(),
+            return_exceptions=True,
+        )
+
+
+@app.on_event("shutdown")
+async def stop_parse_executor():
+    """Stop parse workers, save the corpus stats and close database connections"""
+    parse_executor.shutdown()
+    corpus_stats.save()
+    if async_db:
+        await async_db.aclose()
 
 
 # Pydantic models
 class JobInput(BaseModel):
+    title: Optional[str] = None
     description: Optional[str] = None
     keywords: Optional[List[str]] = None
 
@@ -65,6 +136,23 @@ class MatchResponse(BaseModel):
     extracted_data: dict
 
 
+class LeanMatchResponse(BaseModel):
+    filename: str
+    score: float
+    matched_skills: List[str]
+    content_hash: str
+    error: Optional[str] = None
+
+
+async def read_uploads(files: List[UploadFile]) -> List[tuple]:
+    """Read uploaded files into memory as (filename, content) pairs"""
+    uploads = []
+    for file in files:
+        await file.seek(0)  # Files may already have been read by a previous attempt
+        uploads.append((file.filename, await file.read()))
+    return uploads
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -78,6 +166,54 @@ async def root():
     }
 
 
+@app.get("/api/parse-cache/stats")
+async def get_parse_cache_stats():
+    """Hit/miss/eviction counters for the resume parse cache"""
+    return parse_cache.stats()
+
+
+@app.get("/api/read-cache/stats")
+async def get_read_cache_stats():
+    """Hit/miss counters and invalidations of the per-user read cache"""
+    return read_cache.stats() if read_cache else {"enabled": False}
+
+
+@app.get("/api/parsed/{content_hash}")
+async def get_parsed_resume(content_hash: str):
+    """
+    Parse result of an uploaded file by content hash (from a lean /api/match)
+    Returns 404 once it has left the parse cache; upload the file again then
+    """
+    parsed_data = parse_cache.get_by_hash(content_hash)
+    if parsed_data is None:
+        raise HTTPException(404, "Parsed resume not found in cache")
+    return parsed_data
+
+
+@app.get("/api/job-profiles/stats")
+async def get_job_profile_stats():
+    """Hit/miss counters for compiled job profiles"""
+    return job_profiles.stats()
+
+
+@app.get("/api/match-cache/stats")
+async def get_match_cache_stats():
+    """Hit ratios of the pair-level and term-level match caches"""
+    return match_cache.stats()
+
+
+@app.get("/api/corpus/stats")
+async def get_corpus_stats():
+    """Documents and terms counted for TF-IDF keyword extraction"""
+    return corpus_stats.stats()
+
+
+@app.get("/api/nlp/cache-stats")
+async def get_nlp_cache_stats():
+    """Lemma/stem cache hit rates of the API process (parse workers keep their own)"""
+    return nlp_processor.cache_stats()
+
+
 @app.post("/api/analyze-job")
 async def analyze_job(job_input: JobInput):
     """
@@ -86,7 +222,7 @@ async def analyze_job(job_input: JobInput):
     """
     try:
         if job_input.description:
-            analysis = job_analyzer.analyze(job_input.description)
+            analysis = job_profiles.get({'description': job_input.description}).analysis
             return {
                 "success": True,
                 "extracted_skills": analysis['skills'],
@@ -115,97 +251,75 @@ async def parse_resumes(files: List[UploadFile] = File(...)):
     Parse uploaded resumes and extract information
     Supports PDF and TXT formats
     """
-    results = []
+    uploads = await read_uploads(files)
+    parsed = await parse_executor.parse_many(uploads)
     
-    for file in files:
-        try:
-            # Save temporarily
-            temp_path = f"temp_{file.filename}"
-            content = await file.read()
-            with open(temp_path, "wb") as f:
-                f.write(content)
-            
-            # Parse resume
-            parsed_data = resume_parser.parse(temp_path)
-            results.append({
-                "filename": file.filename,
-                "success": True,
-                "data": parsed_data
-            })
-            
-            # Cleanup
-            os.remove(temp_path)
-            
-        except Exception as e:
-            results.append({
-                "filename": file.filename,
-                "success": False,
-                "error": str(e)
-            })
+    results = []
+    for (filename, _), parsed_data in zip(uploads, parsed):
+        results.append({
+            "filename": filename,
+            "success": True,
+            "data": parsed_data
+        })
     
     return {"results": results}
 
 
-@app.post("/api/match", response_model=List[MatchResponse])
+@app.post("/api/match", response_model=List[Union[MatchResponse, LeanMatchResponse]])
 async def match_resumes(
     job_input: str = Form(...),
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    response: Response = None,
+    top_k: Optional[int] = None,
+    cursor: Optional[str] = None,
+    lean: bool = False,
+    engine: str = "fuzzy"
 ):
     """
     Match resumes against job requirements
     Returns ranked candidates with match scores
     Uses Levenshtein distance for skill matching
+    
+    For large batches:
+    - top_k: return only the k best candidates; when more remain, the
+      X-Next-Cursor header holds the cursor for the next page
+    - cursor: resubmit the same files with this cursor to get the next page
+      (their parses are served from the parse cache)
+    - lean: omit extracted_data; fetch it with GET /api/parsed/{content_hash}
+    - engine: "fuzzy" matches every resume; "vector" shortlists the batch by
+      TF-IDF cosine similarity and matches only the shortlist
+      (VECTOR_SHORTLIST_SIZE, or top_k if larger)
     """
     try:
         # Parse job_input JSON
         job_data = json.loads(job_input)
         
-        # Analyze job
-        if job_data.get('description'):
-            job_analysis = job_analyzer.analyze(job_data['description'])
-            required_skills = job_analysis['skills'] + job_analysis['keywords']
-        else:
-            # Use NLP techniques for better keyword matching
-            raw_keywords = job_data.get('keywords', [])
-            required_skills = []
-            for keyword in raw_keywords:
-                clean_keyword = keyword.strip().lower()
-                # Add original keyword
-                required_skills.append(clean_keyword)
-                # Tokenize first (required for lemmatization and stemming)
-                tokens = nlp_processor.tokenize(clean_keyword)
-                # Add lemmatized version (converts to dictionary form)
-                lemmatized_tokens = nlp_processor.lemmatize(tokens)
-                required_skills.extend(lemmatized_tokens)
-                # Add stemmed version (more aggressive, finds word roots)
-                # This helps match: tester → test, testing → test
-                stemmed_tokens = nlp_processor.stem(tokens)
-                required_skills.extend(stemmed_tokens)
-                
-                # Manually add "test" for "tester" since Porter Stemmer doesn't stem it
-                if clean_keyword == 'tester':
-                    required_skills.append('test')
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            required_skills = [x for x in required_skills if not (x in seen or seen.add(x))]
+        # Analyzed/expanded and interned requirements, cached per job input
+        profile = job_profiles.get(job_data)
         
-        # Parse all resumes
-        candidates = []
-        for file in files:
-            temp_path = f"temp_{file.filename}"
-            content = await file.read()
-            with open(temp_path, "wb") as f:
-                f.write(content)
-            
-            # Parse and match
+        if top_k is not None and top_k < 1:
+            raise HTTPException(400, "top_k must be at least 1")
+        if engine not in ("fuzzy", "vector"):
+            raise HTTPException(400, "engine must be 'fuzzy' or 'vector'")
+        if engine == "vector" and not VECTOR_AVAILABLE:
+            raise HTTPException(400, "engine=vector needs numpy and scipy installed")
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+        
+        # Only the best top_k candidates (and their parse results) are kept
+        ranking = TopK(top_k, after=after)
+        uploads = await read_uploads(files)
+        
+        def rank_candidate(index: int, resume_data: dict):
+            filename = uploads[index][0]
+            # Match parsed resume
             try:
-                resume_data = resume_parser.parse(temp_path)
-                
                 # Check if parsing was successful
                 if 'error' in resume_data:
-                    candidates.append({
-                        "filename": file.filename,
+                    ranking.push(0.0, index, (index, {
+                        "filename": filename,
                         "score": 0.0,
                         "matched_skills": [],
                         "extracted_data": {
@@ -213,22 +327,22 @@ async def match_resumes(
                             "skills": [],
                             "keywords": []
                         }
-                    })
-                    continue
+                    }))
+                    return
                 
-                match_result = matcher.match(resume_data, required_skills)
+                match_result = match_cache.match(parse_cache.key(uploads[index][1]), resume_data, profile)
                 
-                candidates.append({
-                    "filename": file.filename,
+                ranking.push(match_result['score'], index, (index, {
+                    "filename": filename,
                     "score": match_result['score'],
                     "matched_skills": match_result['matched_skills'],
-                    "extracted_data": resume_data
-                })
+                    "extracted_data": {} if lean else resume_data
+                }))
             except Exception as e:
                 error_msg = str(e)
-                print(f"ERROR processing {file.filename}: {error_msg}")
-                candidates.append({
-                    "filename": file.filename,
+                print(f"ERROR processing {filename}: {error_msg}")
+                ranking.push(0.0, index, (index, {
+                    "filename": filename,
                     "score": 0.0,
                     "matched_skills": [],
                     "extracted_data": {
@@ -236,15 +350,52 @@ async def match_resumes(
                         "skills": [],
                         "keywords": []
                     }
-                })
-            
-            os.remove(temp_path)
+                }))
         
-        # Sort by score (highest first)
-        candidates.sort(key=lambda x: x['score'], reverse=True)
+        # Parse all resumes in parallel, ranking each one as it finishes
+        # (with engine=vector, parsed resumes wait for the shortlist)
+        parsed = []
+        async for index, resume_data in parse_executor.parse_iter(uploads):
+            if engine == "vector" and 'error' not in resume_data:
+                parsed.append((index, resume_data))
+            else:
+                rank_candidate(index, resume_data)
         
-        return candidates
+        if parsed:
+            # Parses finish in any order; shortlist in upload order so ties
+            # and cursor pages don't depend on worker timing
+            parsed.sort(key=lambda item: item[0])
+            shortlist = vector_ranker.shortlist(
+                profile.required_skills,
+                [parse_cache.key(uploads[index][1]) for index, _ in parsed],
+                [resume_data for _, resume_data in parsed],
+                max(vector_ranker.shortlist_size, top_k or 0)
+            )
+            for position in shortlist:
+                rank_candidate(*parsed[position])
+        
+        next_cursor = ranking.next_cursor()
+        if next_cursor and response is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+        
+        # Ranked by score (highest first), upload order on ties
+        if not lean:
+            return [candidate for _, candidate in ranking.results()]
+        
+        # Details stay in the parse cache, addressed by content hash
+        return [
+            {
+                "filename": candidate["filename"],
+                "score": candidate["score"],
+                "matched_skills": candidate["matched_skills"],
+                "content_hash": content_hash(uploads[index][1]),
+                "error": candidate["extracted_data"].get("error")
+            }
+            for index, candidate in ranking.results()
+        ]
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Matching failed: {str(e)}")
 
@@ -292,6 +443,60 @@ def get_user_id(authorization: str = Header(None)) -> str:
         raise HTTPException(401, f"Invalid token: {str(e)}")
 
 
+def page_cursor(cursor: Optional[str], limit: int, offset: int = 0):
+    """
+    Validate the paging parameters of a list endpoint; returns the decoded cursor
+    offset paging was replaced by cursors: a non-zero offset is rejected rather
+    than quietly answered with the first page
+    """
+    if limit < 1:
+        raise HTTPException(400, "limit must be at least 1")
+    if offset:
+        raise HTTPException(400, "offset is no longer supported - pass the X-Next-Cursor header "
+                                 "of the previous page as ?cursor=")
+    try:
+        return decode_page_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+def cached_json(request: Request, content, next_cursor: Optional[str] = None) -> Response:
+    """
+    JSON response with an ETag (and the X-Next-Cursor header, if any)
+    304 Not Modified when the client already holds this exact content
+    """
+    response = JSONResponse(content)
+    tag = etag(response.body, (next_cursor or '').encode('ascii'))
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if tag in (t.strip() for t in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
+def job_search_record(user_id: str, job_data: dict, profile) -> dict:
+    """job_searches row for a job input and its compiled profile"""
+    if not profile.use_keywords:
+        job_analysis = profile.analysis
+        return {
+            'user_id': user_id,
+            'job_title': job_data.get('title'),
+            'job_description': job_data['description'],
+            'use_keywords': False,
+            'required_skills': job_analysis['skills'],
+            'required_roles': job_analysis['roles'],
+            'required_experience': job_analysis.get('experience')
+        }
+    return {
+        'user_id': user_id,
+        'keywords': profile.keywords,
+        'use_keywords': True,
+        'required_skills': list(profile.required_skills)
+    }
+
+
 @app.post("/api/match-and-save", response_model=List[MatchResponse])
 async def match_and_save_resumes(
     job_input: str = Form(...),
@@ -307,114 +512,80 @@ async def match_and_save_resumes(
         user_id = get_user_id(authorization)
         
         # Check if database is available
-        if not DB_ENABLED or not db_service:
+        if not DB_ENABLED or not async_db:
             # Fallback to simple matching without saving
             return await match_resumes(job_input, files)
         
         # Parse job_input JSON
         job_data = json.loads(job_input)
         
-        # Analyze job
-        if job_data.get('description'):
-            job_analysis = job_analyzer.analyze(job_data['description'])
-            required_skills = job_analysis['skills'] + job_analysis['keywords']
-            
-            # Save job search to database
-            job_search_data = {
-                'user_id': user_id,
-                'job_title': job_data.get('title'),
-                'job_description': job_data['description'],
-                'use_keywords': False,
-                'required_skills': job_analysis['skills'],
-                'required_roles': job_analysis['roles'],
-                'required_experience': job_analysis.get('experience')
-            }
-        else:
-            # Process keywords
-            raw_keywords = job_data.get('keywords', [])
-            required_skills = []
-            for keyword in raw_keywords:
-                clean_keyword = keyword.strip().lower()
-                required_skills.append(clean_keyword)
-                tokens = nlp_processor.tokenize(clean_keyword)
-                lemmatized_tokens = nlp_processor.lemmatize(tokens)
-                required_skills.extend(lemmatized_tokens)
-                stemmed_tokens = nlp_processor.stem(tokens)
-                required_skills.extend(stemmed_tokens)
-                if clean_keyword == 'tester':
-                    required_skills.append('test')
-            
-            required_skills = list(dict.fromkeys(required_skills))  # Remove duplicates
-            
-            # Save job search to database
-            job_search_data = {
-                'user_id': user_id,
-                'keywords': raw_keywords,
-                'use_keywords': True,
-                'required_skills': required_skills
-            }
+        # Analyzed/expanded and interned requirements, cached per job input
+        profile = job_profiles.get(job_data)
+        required_skills = profile.required_skills
         
         # Save job search
-        saved_job = db_service.save_job_search(job_search_data)
+        saved_job = await async_db.save_job_search(job_search_record(user_id, job_data, profile))
         job_search_id = saved_job['id']
         
-        # Parse all resumes and save to database
+        # Parse all resumes in parallel and save to database
+        uploads = await read_uploads(files)
+        parsed = await parse_executor.parse_many(uploads)
+        
+        # Save every parsed resume in bulk (one insert per DB_WRITE_BATCH_SIZE rows)
+        ok = [i for i, resume_data in enumerate(parsed) if 'error' not in resume_data]
+        saved_resumes = await async_db.save_resumes([
+            {
+                'user_id': user_id,
+                'filename': files[i].filename,
+                'file_type': files[i].content_type,
+                'file_size': len(uploads[i][1]),
+                'name': parsed[i].get('name'),
+                'email': parsed[i].get('email'),
+                'phone': parsed[i].get('phone'),
+                'skills': parsed[i].get('skills', []),
+                'experience': parsed[i].get('experience'),
+                'education': parsed[i].get('education'),
+                'raw_text': parsed[i].get('raw_text'),
+                'parsed_data': parsed[i]
+            }
+            for i in ok
+        ])
+        resume_ids = {i: saved['id'] for i, saved in zip(ok, saved_resumes) if saved}
+        
         candidates = []
-        for file in files:
-            temp_path = f"temp_{file.filename}"
-            content = await file.read()
-            with open(temp_path, "wb") as f:
-                f.write(content)
-            
+        match_rows = []
+        for i, (file, (_, content), resume_data) in enumerate(zip(files, uploads, parsed)):
             try:
-                resume_data = resume_parser.parse(temp_path)
-                
-                if 'error' not in resume_data:
-                    # Save resume to database
-                    resume_db_data = {
-                        'user_id': user_id,
-                        'filename': file.filename,
-                        'file_type': file.content_type,
-                        'file_size': len(content),
-                        'name': resume_data.get('name'),
-                        'email': resume_data.get('email'),
-                        'phone': resume_data.get('phone'),
-                        'skills': resume_data.get('skills', []),
-                        'experience': resume_data.get('experience'),
-                        'education': resume_data.get('education'),
-                        'raw_text': resume_data.get('raw_text'),
-                        'parsed_data': resume_data
-                    }
-                    saved_resume = db_service.save_resume(resume_db_data)
-                    resume_id = saved_resume['id']
-                    
-                    # Match resume
-                    match_result = matcher.match(resume_data, required_skills)
-                    
-                    # Save match result to database
-                    match_db_data = {
-                        'user_id': user_id,
-                        'job_search_id': job_search_id,
-                        'resume_id': resume_id,
-                        'match_score': match_result['score'],
-                        'matched_skills': match_result['matched_skills'],
-                        'missing_skills': [s for s in required_skills if s not in match_result['matched_skills']]
-                    }
-                    db_service.save_match_result(match_db_data)
-                    
-                    candidates.append({
-                        "filename": file.filename,
-                        "score": match_result['score'],
-                        "matched_skills": match_result['matched_skills'],
-                        "extracted_data": resume_data
-                    })
-                else:
+                if 'error' in resume_data:
                     candidates.append({
                         "filename": file.filename,
                         "score": 0.0,
                         "matched_skills": [],
                         "extracted_data": resume_data
                     })
+                    continue
+                if i not in resume_ids:
+                    raise RuntimeError("Could not save resume")
+                
+                # Match resume
+                match_result = match_cache.match(parse_cache.key(content), resume_data, profile)
+                
+                # Match results are saved together below
+                match_rows.append({
+                    'user_id': user_id,
+                    'job_search_id': job_search_id,
+                    'resume_id': resume_ids[i],
+                    'match_score': match_result['score'],
+                    'matched_skills': match_result['matched_skills'],
+                    'missing_skills': [s for s in required_skills if s not in match_result['matched_skills']]
+                })
+                
+                candidates.append({
+                    "filename": file.filename,
+                    "score": match_result['score'],
+                    "matched_skills": match_result['matched_skills'],
+                    "extracted_data": resume_data
+                })
             except Exception as e:
                 print(f"ERROR processing {file.filename}: {str(e)}")
                 candidates.append({
@@ -423,8 +594,8 @@ async def match_and_save_resumes(
                     "matched_skills": [],
                     "extracted_data": {"error": str(e)}
                 })
-            
-            os.remove(temp_path)
+        
+        await async_db.save_match_results(match_rows)
         
         # Sort by score
         candidates.sort(key=lambda x: x['score'], reverse=True)
@@ -440,27 +611,101 @@ async def match_and_save_resumes(
             raise HTTPException(500, f"Matching failed: {str(fallback_error)}")
 
 
+@app.post("/api/library/match")
+async def match_library(
+    job_input: JobInput,
+    authorization: str = Header(None),
+    top_k: Optional[int] = None,
+    save: bool = True
+):
+    """
+    Match a job against every resume stored for the user - no uploads
+    Uses the skills and keywords saved with each resume, and saves the
+    job search and its match results in batches
+    
+    - top_k: return only the k best matches (all are still saved)
+    - save: set to false to only rank, without writing anything
+    """
+    try:
+        user_id = get_user_id(authorization)
+        if not job_input.description and not job_input.keywords:
+            raise HTTPException(400, "Provide either description or keywords")
+        if top_k is not None and top_k < 1:
+            raise HTTPException(400, "top_k must be at least 1")
+        
+        job_data = job_input.model_dump(exclude_none=True)
+        profile = job_profiles.get(job_data)
+        
+        job_search_id = None
+        if save:
+            saved_job = await async_db.save_job_search(job_search_record(user_id, job_data, profile))
+            job_search_id = saved_job['id']
+        
+        # Paging through the database and matching are blocking - keep them off the event loop
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, library_matcher.run, user_id, profile, job_search_id, top_k)
+        return {"job_search_id": job_search_id, **result}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Library matching failed: {str(e)}")
+
+
 @app.get("/api/resumes")
 async def get_resumes(
+    request: Request,
     authorization: str = Header(None),
     limit: int = 50,
+    cursor: Optional[str] = None,
     offset: int = 0
 ):
-    """Get all resumes for the authenticated user"""
+    """
+    Get the authenticated user's resumes, newest first
+    Summary columns only - GET /api/resumes/{resume_id} returns the full row.
+    When more remain, the X-Next-Cursor header holds the cursor for the next page.
+    Served from the read cache; the ETag lets an unchanged page come back as 304
+    """
     try:
         user_id = get_user_id(authorization)
-        resumes = db_service.get_user_resumes(user_id, limit, offset)
-        return resumes  # Return array directly, not wrapped in object
+        after = page_cursor(cursor, limit, offset)
+        resumes, next_cursor = await async_db.get_user_resumes(user_id, limit, after)
+        return cached_json(request, resumes, next_cursor)  # Array directly, not wrapped in object
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Failed to fetch resumes: {str(e)}")
 
 
+@app.get("/api/resumes/search")
+async def search_resumes_by_skills(
+    skills: str,
+    authorization: str = Header(None),
+    top_k: int = 20
+):
+    """
+    Top-k stored resumes for a comma-separated list of skills
+    Served from the in-memory skill index; the first search of a user builds it
+    """
+    try:
+        user_id = get_user_id(authorization)
+        wanted = [s for s in skills.split(',') if s.strip()]
+        if not wanted:
+            raise HTTPException(400, "No skills provided")
+        loop = asyncio.get_running_loop()
+        # Building the index pages through the database - keep it off the event loop
+        return await loop.run_in_executor(None, skill_index.search, user_id, wanted, max(1, min(top_k, 500)))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, f"Failed to search resumes: {str(e)}")
+
+
 @app.get("/api/resumes/{resume_id}")
 async def get_resume(resume_id: str, authorization: str = Header(None)):
     """Get a specific resume by ID"""
     try:
         user_id = get_user_id(authorization)
-        resume = db_service.get_resume_by_id(resume_id, user_id)
+        resume = await async_db.get_resume_by_id(resume_id, user_id)
         if not resume:
             raise HTTPException(404, "Resume not found")
         return resume
@@ -475,7 +720,7 @@ async def delete_resume(resume_id: str, authorization: str = Header(None)):
     """Delete a resume"""
     try:
         user_id = get_user_id(authorization)
-        success = db_service.delete_resume(resume_id, user_id)
+        success = await async_db.delete_resume(resume_id, user_id)
         if not success:
             raise HTTPException(404, "Resume not found")
         return {"message": "Resume deleted successfully"}
@@ -487,30 +732,40 @@ async def delete_resume(resume_id: str, authorization: str = Header(None)):
 
 @app.get("/api/job-searches")
 async def get_job_searches(
+    request: Request,
     authorization: str = Header(None),
     limit: int = 50,
+    cursor: Optional[str] = None,
     offset: int = 0
 ):
-    """Get all job searches for the authenticated user"""
+    """Get the authenticated user's job searches, newest first (summary columns; paging and caching as for /api/resumes)"""
     try:
         user_id = get_user_id(authorization)
-        searches = db_service.get_user_job_searches(user_id, limit, offset)
-        return searches  # Return array directly, not wrapped in object
+        after = page_cursor(cursor, limit, offset)
+        searches, next_cursor = await async_db.get_user_job_searches(user_id, limit, after)
+        return cached_json(request, searches, next_cursor)  # Array directly, not wrapped in object
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Failed to fetch job searches: {str(e)}")
 
 
 @app.get("/api/matches")
 async def get_matches(
+    request: Request,
     authorization: str = Header(None),
     limit: int = 100,
+    cursor: Optional[str] = None,
     offset: int = 0
 ):
-    """Get all match results for the authenticated user"""
+    """Get the authenticated user's match results, newest first (summary columns; paging and caching as for /api/resumes)"""
     try:
         user_id = get_user_id(authorization)
-        matches = db_service.get_user_matches(user_id, limit, offset)
-        return matches  # Return array directly, not wrapped in object
+        after = page_cursor(cursor, limit, offset)
+        matches, next_cursor = await async_db.get_user_matches(user_id, limit, after)
+        return cached_json(request, matches, next_cursor)  # Array directly, not wrapped in object
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Failed to fetch matches: {str(e)}")
 
@@ -520,19 +775,21 @@ async def get_job_matches(job_id: str, authorization: str = Header(None)):
     """Get all matches for a specific job search"""
     try:
         user_id = get_user_id(authorization)
-        matches = db_service.get_job_matches(job_id, user_id)
+        matches = await async_db.get_job_matches(job_id, user_id)
         return {"matches": matches}
     except Exception as e:
         raise HTTPException(500, f"Failed to fetch job matches: {str(e)}")
 
 
 @app.get("/api/dashboard/stats")
-async def get_dashboard_stats(authorization: str = Header(None)):
-    """Get dashboard statistics for the authenticated user"""
+async def get_dashboard_stats(request: Request, authorization: str = Header(None)):
+    """Get dashboard statistics for the authenticated user (read cache and ETag as for /api/resumes)"""
     try:
         user_id = get_user_id(authorization)
-        stats = db_service.get_dashboard_stats(user_id)
-        return stats
+        stats = await async_db.get_dashboard_stats(user_id)
+        return cached_json(request, stats)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Failed to fetch dashboard stats: {str(e)}")
 
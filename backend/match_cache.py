@@ -0,0 +1,58 @@
+"""
+Match Cache - Memoized match results for (resume, job) pairs
+Re-running a screening on the same resumes returns stored results instead
+of matching again; fuzzy term comparisons are shared by all jobs through
+the matcher's term-level cache
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from job_profile import JobProfile
+from lru import LRUCache
+from matcher import ResumeMatcher
+
+
+class MatchCache:
+    """
+    Two memo levels for ResumeMatcher.match
+    - pairs: (resume key, required skills key, threshold) -> match result
+    - terms: (required term, resume term) similarity, kept by the matcher
+    """
+
+    def __init__(self, matcher: ResumeMatcher, max_entries: Optional[int] = None):
+        """
+        Args:
+            matcher: ResumeMatcher used on a miss
+            max_entries: Pair results to keep (default: MATCH_CACHE_SIZE or 10000)
+        """
+        self.matcher = matcher
+        if max_entries is None:
+            max_entries = int(os.getenv("MATCH_CACHE_SIZE", 10000))
+        self.pairs = LRUCache(max_entries)
+
+    def match(self, resume_key: str, resume_data: Dict[str, Any], profile: JobProfile) -> Dict[str, Any]:
+        """
+        Match result for a resume and job, from the cache when the pair was seen
+
+        Args:
+            resume_key: Identifies the parse result, e.g. ParseCache.key(content)
+            resume_data: Parsed resume data (used on a miss)
+            profile: Compiled job requirements
+        """
+        # Keyed by the compiled skills, not the job input: the same description
+        # can compile to other skills once the corpus statistics move
+        key = (resume_key, profile.skills_key, self.matcher.threshold)
+        result = self.pairs.get(key)
+        if result is None:
+            result = self.matcher.match(resume_data, profile.required_skills)
+            if 'error' not in resume_data:
+                self.pairs.put(key, result)
+        return dict(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratios of both levels"""
+        return {
+            'pairs': self.pairs.stats(),
+            'terms': self.matcher.similarity_cache.stats(),
+        }
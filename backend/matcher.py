@@ -3,7 +3,72 @@ Resume Matcher - Match resumes to job requirements
 Uses Levenshtein distance for fuzzy skill matching
 """
 
-from typing import Dict, List
+import os
+from typing import Dict, List, Optional
+
+from lru import LRUCache
+from vocabulary import Vocabulary, default_vocabulary
+
+
+def pattern_masks(pattern: str) -> Dict[str, int]:
+    """
+    Bit mask of positions for each character of a pattern (Myers' Peq table)
+    Build once per pattern and reuse it against many texts
+    """
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def levenshtein_within(pattern: str, text: str, max_dist: Optional[int] = None,
+                       masks: Optional[Dict[str, int]] = None) -> Optional[int]:
+    """
+    Levenshtein distance with Myers' bit-parallel algorithm
+    One column of the edit-distance table is held in the bits of an int,
+    so each character of text costs a handful of integer operations
+    instead of a full row of the dynamic program
+
+    Args:
+        pattern: First string (its masks can be passed in precomputed)
+        text: Second string
+        max_dist: Stop early and return None once the distance must exceed this
+        masks: pattern_masks(pattern), to reuse across calls
+
+    Returns:
+        Edit distance, or None if it is greater than max_dist
+    """
+    m, n = len(pattern), len(text)
+    if max_dist is not None and abs(m - n) > max_dist:
+        return None
+    if m == 0:
+        return n
+    if masks is None:
+        masks = pattern_masks(pattern)
+
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+
+    for j, char in enumerate(text, 1):
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # Each remaining character can lower the distance by at most one
+        if max_dist is not None and score - (n - j) > max_dist:
+            return None
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+
+    return score
 
 
 def levenshtein_distance(s1: str, s2: str) -> int:
@@ -11,24 +76,290 @@ def levenshtein_distance(s1: str, s2: str) -> int:
     Calculate Levenshtein distance between two strings
     Simple implementation without external dependencies
     """
-    if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
+    return levenshtein_within(s1, s2)
+
+
+# Bit of each character in a signature: letters, digits, then everything else folded
+_CHAR_BITS: Dict[str, int] = {}
+
+
+def char_signature(text: str) -> int:
+    """
+    Set of characters in text as a 64-bit mask
+    Every character of one string missing from the other costs at least
+    one edit, so the popcount of sig_a & ~sig_b is a lower bound on the distance
+    """
+    signature = 0
+    for char in set(text):
+        bit = _CHAR_BITS.get(char)
+        if bit is None:
+            if 'a' <= char <= 'z':
+                bit = ord(char) - ord('a')
+            elif '0' <= char <= '9':
+                bit = 26 + ord(char) - ord('0')
+            else:
+                bit = 36 + ord(char) % 28
+            _CHAR_BITS[char] = bit
+        signature |= 1 << bit
+    return signature
+
+
+def max_distance(max_len: int, min_similarity: float) -> int:
+    """
+    Largest distance that can still give a similarity above min_similarity
+    Rounded up by one so float rounding can never prune a real match
+    """
+    return int(max_len * (1 - min_similarity)) + 1
+
+
+class CandidateIndex:
+    """
+    Resume terms prepared for fuzzy matching against many skills
+    - exact: lowercased term -> first term with that form (similarity 1.0)
+    - buckets: terms by lowercased length. Edit distance is at least the
+      difference in length, so buckets too far from a skill's length are
+      skipped without computing any distance
+    - signatures: characters present in each term, a second lower bound
+      that discards most remaining terms before the distance is computed
+    """
     
-    if len(s2) == 0:
-        return len(s1)
+    def __init__(self, terms: List[str]):
+        """
+        Args:
+            terms: Candidate terms; on equal similarity the earliest one wins
+        """
+        self.terms = terms
+        self.exact: Dict[str, str] = {}
+        # lowercased length -> [(position, term, lowercased term, signature)]
+        self.buckets: Dict[int, List[tuple]] = {}
+        # lowercased length -> longest original term in the bucket
+        self.longest: Dict[int, int] = {}
+        # Lowercasing can change the length of some non-ASCII strings
+        self.same_lengths = True
+        seen = set()
+        for position, term in enumerate(terms):
+            lowered = term.lower()
+            if (lowered, len(term)) in seen:
+                continue  # Same similarity to everything as an earlier term
+            seen.add((lowered, len(term)))
+            self.exact.setdefault(lowered, term)
+            self.buckets.setdefault(len(lowered), []).append(
+                (position, term, lowered, char_signature(lowered))
+            )
+            self.longest[len(lowered)] = max(self.longest.get(len(lowered), 0), len(term))
+            self.same_lengths = self.same_lengths and len(lowered) == len(term)
+        self._orders: Dict[int, List[int]] = {}
     
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            # Cost of insertions, deletions, or substitutions
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
+    def _lengths_by_gap(self, skill_len: int) -> List[int]:
+        """Bucket lengths, closest to skill_len first"""
+        order = self._orders.get(skill_len)
+        if order is None:
+            order = sorted(self.buckets, key=lambda length: abs(length - skill_len))
+            self._orders[skill_len] = order
+        return order
     
-    return previous_row[-1]
+    def best_match(self, skill: str, min_score: float = 0.0) -> tuple:
+        """
+        Most similar term (first one on ties) and its similarity
+        
+        Terms that cannot beat both the current best and min_score are
+        skipped. With min_score > 0 the result is exact whenever the best
+        score reaches min_score; below that, only the fact that it is lower
+        is meaningful.
+        
+        Returns:
+            (best_match, similarity_score) - (None, 0) if nothing is similar
+        """
+        skill_lower = skill.lower()
+        # Identical after lowercasing: nothing can score higher or come first
+        exact = self.exact.get(skill_lower)
+        if exact is not None:
+            return exact, 1.0
+        
+        skill_len = len(skill_lower)
+        skill_signature = char_signature(skill_lower)
+        masks = None
+        best_match = None
+        best_score = 0
+        best_position = -1
+        # Once a bucket on one side is out of reach, so is every bucket
+        # further out on that side (needs length-preserving lowercasing)
+        monotone = self.same_lengths and skill_len == len(skill)
+        closed_shorter = closed_longer = False
+        
+        # Closest lengths first: good matches early make the bound tighter
+        for length in self._lengths_by_gap(skill_len):
+            longer = length > skill_len
+            if closed_longer if longer else closed_shorter:
+                continue
+            # Similarity is relative to the original (not lowercased) lengths
+            max_len = max(len(skill), self.longest[length])
+            if max_len and abs(length - skill_len) > max_distance(max_len, max(best_score, min_score)):
+                if monotone:
+                    if longer:
+                        closed_longer = True
+                    else:
+                        closed_shorter = True
+                continue
+            
+            for position, term, lowered, signature in self.buckets[length]:
+                max_len = max(len(skill), len(term))
+                if max_len == 0:
+                    similarity = 1.0
+                else:
+                    bound = max_distance(max_len, max(best_score, min_score))
+                    # Characters only one side has: a cheap lower bound on the distance
+                    if ((skill_signature & ~signature).bit_count() > bound
+                            or (signature & ~skill_signature).bit_count() > bound):
+                        continue
+                    if masks is None:
+                        masks = pattern_masks(skill_lower)
+                    distance = levenshtein_within(skill_lower, lowered, bound, masks)
+                    if distance is None:
+                        continue
+                    similarity = 1 - (distance / max_len)
+                
+                if similarity > best_score or (
+                    similarity == best_score and best_match is not None and position < best_position
+                ):
+                    best_score = similarity
+                    best_match = term
+                    best_position = position
+        
+        return best_match, best_score
+
+
+# RequiredSkills remembers this many comparisons per skill; past that the
+# shared term-level cache still answers
+KNOWN_TERMS_PER_SKILL = 4096
+
+# Remembered similarity of a term below the threshold
+_BELOW = -1.0
+
+
+class ResumeTerms:
+    """
+    A resume's skills + keywords, interned
+    first: vocabulary id -> first term with that id, in term order
+    """
+    
+    __slots__ = ('terms', 'first', 'complete', '_candidates')
+    
+    def __init__(self, resume_data: Dict, vocabulary: Vocabulary):
+        self.terms = resume_data.get('skills', []) + resume_data.get('keywords', [])
+        self.first: Dict[int, str] = {}
+        # Every term has an id and keeps its length when lowercased, so one
+        # id stands for terms that all score the same
+        self.complete = True
+        for term in self.terms:
+            lowered = term.lower()
+            term_id = vocabulary.intern_lowered(lowered)
+            if term_id is None or len(lowered) != len(term):
+                self.complete = False
+            if term_id is not None and term_id not in self.first:
+                self.first[term_id] = term
+        self._candidates = None
+    
+    @property
+    def candidates(self) -> CandidateIndex:
+        """Fuzzy-match index over the raw terms, for resumes that are not complete"""
+        if self._candidates is None:
+            self._candidates = CandidateIndex(self.terms)
+        return self._candidates
+
+
+class RequiredSkills(list):
+    """
+    Required skills of a job, with their vocabulary ids
+    A plain list of skills everywhere else; build once per job with
+    ResumeMatcher.prepare and reuse it for every resume.
+    
+    Fuzzy comparisons are remembered per (skill, term id): resumes in a
+    batch share most of their vocabulary, so after the first few resumes
+    most comparisons are table lookups.
+    """
+    
+    def __init__(self, skills: List[str], vocabulary: Vocabulary, threshold: float,
+                 similarity_cache: Optional[LRUCache] = None):
+        super().__init__(skills)
+        self.vocabulary = vocabulary
+        self.threshold = threshold
+        # Shared across jobs: (skill id, term id, threshold) -> similarity, -1.0 if below
+        self.similarity_cache = similarity_cache
+        self.term_ids = [vocabulary.intern(skill) for skill in skills]
+        self._lowered = [skill.lower() for skill in skills]
+        self._signatures = [char_signature(lowered) for lowered in self._lowered]
+        self._masks: List[Optional[Dict[str, int]]] = [None] * len(skills)
+        # Per skill: term id -> similarity, _BELOW if under the threshold.
+        # Sparse, since a job only ever meets a sliver of the vocabulary; one
+        # dict write per result, so threads sharing a cached profile never
+        # see half of an entry
+        self._known: List[Dict[int, float]] = [{} for _ in skills]
+    
+    def _similarity(self, index: int, term: str) -> Optional[float]:
+        """Similarity of skill index and a term, None if it is below the threshold"""
+        skill, skill_lower = self[index], self._lowered[index]
+        max_len = max(len(skill), len(term))
+        if max_len == 0:
+            return 1.0
+        
+        lowered = term.lower()
+        bound = max_distance(max_len, self.threshold)
+        signature = char_signature(lowered)
+        if ((self._signatures[index] & ~signature).bit_count() > bound
+                or (signature & ~self._signatures[index]).bit_count() > bound):
+            return None
+        if self._masks[index] is None:
+            self._masks[index] = pattern_masks(skill_lower)
+        distance = levenshtein_within(skill_lower, lowered, bound, self._masks[index])
+        if distance is None:
+            return None
+        similarity = 1 - (distance / max_len)
+        return similarity if similarity >= self.threshold else None
+    
+    def _compare(self, index: int, term_id: int, term: str) -> Optional[float]:
+        """_similarity, through the shared term-level cache"""
+        skill_id = self.term_ids[index]
+        if self.similarity_cache is None or skill_id is None:
+            return self._similarity(index, term)
+        
+        key = (skill_id, term_id, self.threshold)
+        cached = self.similarity_cache.get(key)
+        if cached is not None:
+            return None if cached < 0 else cached
+        similarity = self._similarity(index, term)
+        self.similarity_cache.put(key, -1.0 if similarity is None else similarity)
+        return similarity
+    
+    def best_fuzzy_match(self, index: int, resume_terms: ResumeTerms) -> tuple:
+        """
+        Best term of a resume for skill index, as ResumeMatcher.match needs it
+        Exact when the best score reaches the threshold; otherwise (None, 0)
+        """
+        if not resume_terms.complete or len(self._lowered[index]) != len(self[index]):
+            return resume_terms.candidates.best_match(self[index], self.threshold)
+        
+        known = self._known[index]
+        
+        best_match = None
+        best_score = 0
+        # first is in term order, so the first term wins on equal scores
+        for term_id, term in resume_terms.first.items():
+            similarity = known.get(term_id)
+            if similarity is None:
+                similarity = self._compare(index, term_id, term)
+                if similarity is None:
+                    similarity = _BELOW
+                if len(known) < KNOWN_TERMS_PER_SKILL:
+                    known[term_id] = similarity
+            if similarity == _BELOW:
+                continue
+            
+            if similarity > best_score:
+                best_score = similarity
+                best_match = term
+        
+        return best_match, best_score
 
 
 class ResumeMatcher:
@@ -37,7 +368,8 @@ class ResumeMatcher:
     Uses Levenshtein distance for similarity matching
     """
     
-    def __init__(self, similarity_threshold: float = 0.60):
+    def __init__(self, similarity_threshold: float = 0.60, vocabulary: Optional[Vocabulary] = None,
+                 similarity_cache_size: Optional[int] = None):
         """
         Initialize matcher
         
@@ -45,8 +377,26 @@ class ResumeMatcher:
             similarity_threshold: Minimum similarity score (0-1) to consider a match
                                  Lowered to 0.60 for fuzzy matching (tester~testing=57%)
                                  Lowered to 0.75 for better fuzzy matching
+            vocabulary: Term ids for exact matching (default: shared vocabulary)
+            similarity_cache_size: Fuzzy (required term, resume term) results shared
+                                   by all jobs (default: MATCH_TERM_CACHE_SIZE or 100000)
         """
         self.threshold = similarity_threshold
+        self.vocabulary = vocabulary if vocabulary is not None else default_vocabulary
+        if similarity_cache_size is None:
+            similarity_cache_size = int(os.getenv("MATCH_TERM_CACHE_SIZE", 100000))
+        self.similarity_cache = LRUCache(similarity_cache_size)
+    
+    def prepare(self, required_skills: List[str]) -> RequiredSkills:
+        """Intern a job's required skills once, for matching many resumes"""
+        if (isinstance(required_skills, RequiredSkills) and required_skills.vocabulary is self.vocabulary
+                and required_skills.threshold == self.threshold):
+            return required_skills
+        return RequiredSkills(required_skills, self.vocabulary, self.threshold, self.similarity_cache)
+    
+    def encode_resume(self, resume_data: Dict) -> ResumeTerms:
+        """Intern a resume's skills and keywords"""
+        return ResumeTerms(resume_data, self.vocabulary)
     
     def levenshtein_similarity(self, str1: str, str2: str) -> float:
         """
@@ -80,15 +430,7 @@ class ResumeMatcher:
         Returns:
             (matched, best_match, similarity_score)
         """
-        best_match = None
-        best_score = 0
-        
-        for candidate_skill in skill_list:
-            similarity = self.levenshtein_similarity(skill, candidate_skill)
-            
-            if similarity > best_score:
-                best_score = similarity
-                best_match = candidate_skill
+        best_match, best_score = CandidateIndex(skill_list).best_match(skill)
         
         # Check if similarity meets threshold
         matched = best_score >= self.threshold
@@ -114,27 +456,27 @@ class ResumeMatcher:
             return {
                 'score': 0,
                 'matched_skills': [],
-                'missing_skills': required_skills,
+                'missing_skills': list(required_skills),
                 'match_details': []
             }
         
-        # Get resume skills and keywords
-        resume_skills = resume_data.get('skills', [])
-        resume_keywords = resume_data.get('keywords', [])
-        all_resume_terms = resume_skills + resume_keywords
+        required = self.prepare(required_skills)
+        resume_terms = self.encode_resume(resume_data)
         
         # Match each required skill
         matched_skills = []
         missing_skills = []
         match_details = []
         
-        for required_skill in required_skills:
-            matched, best_match, similarity = self.fuzzy_match_skill(
-                required_skill,
-                all_resume_terms
-            )
+        for index, (required_skill, term_id) in enumerate(zip(required, required.term_ids)):
+            if term_id in resume_terms.first:
+                # Exact (case-insensitive) hit: similarity 1.0, first such term
+                best_match, similarity = resume_terms.first[term_id], 1.0
+            else:
+                # Fuzzy matching only for the leftovers
+                best_match, similarity = required.best_fuzzy_match(index, resume_terms)
             
-            if matched:
+            if similarity >= self.threshold:
                 matched_skills.append(required_skill)
                 match_details.append({
                     'required': required_skill,
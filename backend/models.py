@@ -101,5 +101,6 @@ class DashboardStats(BaseModel):
     total_job_searches: int
     total_matches: int
     avg_match_score: Optional[float] = None
+    score_histogram: List[Dict[str, int]] = []
     top_skills: List[Dict[str, Any]] = []
     recent_activity: List[Dict[str, Any]] = []
@@ -8,12 +8,71 @@ Implements all NLP concepts:
 - Text preprocessing
 """
 
+import heapq
+import os
 import re
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer, PorterStemmer
-from typing import List
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+from corpus_stats import CorpusStats
+
+# NLTK data packages the pipeline needs, by nltk.data path
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+}
+
+
+def download_nltk_data(download_dir: Optional[str] = None):
+    """
+    Download the NLTK data packages (build step, not request path)
+    Point NLTK_DATA at download_dir to use the snapshot at runtime
+    """
+    import nltk
+    for package in NLTK_RESOURCES:
+        nltk.download(package, download_dir=download_dir)
+
+
+class AnalyzedDocument:
+    """
+    A text run through the NLP pipeline once
+    Extractors read cleaned text, tokens, lemmas and term frequencies from
+    here instead of re-processing the same text
+    """
+    
+    def __init__(self, text: str, cleaned: str, tokens: List[str], filtered: List[str], lemmas: List[str]):
+        self.text = text
+        self.lower = text.lower()
+        self.cleaned = cleaned
+        self.tokens = tokens
+        self.filtered = filtered
+        self.lemmas = lemmas
+        
+        # Term frequencies of lemmas (ignoring very short words), in first-seen order
+        self.frequencies: Dict[str, int] = {}
+        for token in lemmas:
+            if len(token) > 2:
+                self.frequencies[token] = self.frequencies.get(token, 0) + 1
+        
+        self._ranked: Optional[List[str]] = None
+        self._scores: Optional[Dict[str, float]] = None
+    
+    def keywords(self, top_n: int = 10, corpus: Optional[CorpusStats] = None) -> List[str]:
+        """
+        Top lemmas by TF-IDF against the corpus, or by frequency while the
+        corpus is too small; ties keep first-seen order
+        """
+        if corpus is not None and corpus.ready:
+            if self._scores is None:
+                self._scores = corpus.tfidf(self.frequencies)
+            return heapq.nlargest(top_n, self._scores, key=self._scores.__getitem__)
+        
+        if self._ranked is None:
+            ranked = sorted(self.frequencies.items(), key=lambda x: x[1], reverse=True)
+            self._ranked = [word for word, count in ranked]
+        return self._ranked[:top_n]
 
 
 class NLPProcessor:
@@ -22,28 +81,75 @@ class NLPProcessor:
     Simple, clean implementation of fundamental NLP concepts
     """
     
-    def __init__(self):
-        """Initialize NLP components and download required data"""
-        # Download required NLTK data (run once)
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
+    def __init__(self, token_cache_size: Optional[int] = None, corpus: Optional[CorpusStats] = None):
+        """
+        Configure the pipeline - NLTK itself is loaded on first use
         
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
+        Args:
+            token_cache_size: Tokens remembered per lemma/stem cache, least recently
+                              used evicted first (default: NLP_TOKEN_CACHE_SIZE or 50000)
+            corpus: Document frequencies for TF-IDF keywords (None = frequency only)
+        """
+        self.corpus = corpus
+        if token_cache_size is None:
+            token_cache_size = int(os.getenv("NLP_TOKEN_CACHE_SIZE", 50000))
+        self.token_cache_size = token_cache_size
+        
+        # Downloading at runtime hangs when egress is blocked, so it is opt-in
+        self.auto_download = os.getenv("NLTK_AUTO_DOWNLOAD", "false").lower() in ("1", "true", "yes")
         
-        try:
-            nltk.data.find('corpora/wordnet')
-        except LookupError:
-            nltk.download('wordnet')
+        self.lemmatizer = None
+        self.stemmer = None
+        self.stop_words = None
+        self._word_tokenize = None
+        self._lemmatize_token = None
+        self._stem_token = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+    
+    def load(self) -> "NLPProcessor":
+        """
+        Import NLTK and load its data (runs once, thread-safe)
+        Called automatically by the first tokenize/lemmatize/stem
+        """
+        if self._loaded:
+            return self
         
-        # Initialize tools
-        self.lemmatizer = WordNetLemmatizer()
-        self.stemmer = PorterStemmer()
-        self.stop_words = set(stopwords.words('english'))
+        with self._load_lock:
+            if self._loaded:
+                return self
+            
+            import nltk
+            from nltk.tokenize import word_tokenize
+            from nltk.corpus import stopwords
+            from nltk.stem import WordNetLemmatizer, PorterStemmer
+            
+            # Make sure the NLTK data is available locally
+            for package, path in NLTK_RESOURCES.items():
+                try:
+                    nltk.data.find(path)
+                except LookupError:
+                    if not self.auto_download:
+                        raise LookupError(
+                            f"NLTK data '{package}' not found. Run 'python nlp_processor.py' "
+                            f"at build time or set NLTK_AUTO_DOWNLOAD=true"
+                        )
+                    nltk.download(package)
+            
+            # Initialize tools
+            self.lemmatizer = WordNetLemmatizer()
+            self.lemmatizer.lemmatize('warmup')  # Load WordNet now, not lazily in a request thread
+            self.stemmer = PorterStemmer()
+            self.stop_words = set(stopwords.words('english'))
+            self._word_tokenize = word_tokenize
+            
+            # Resume vocabularies are heavily skewed ('python', 'experience', 'team'),
+            # so per-token results are memoized. lru_cache is thread-safe.
+            self._lemmatize_token = lru_cache(maxsize=self.token_cache_size)(self.lemmatizer.lemmatize)
+            self._stem_token = lru_cache(maxsize=self.token_cache_size)(self.stemmer.stem)
+            
+            self._loaded = True
+        return self
     
     def clean_text(self, text: str) -> str:
         """
@@ -68,14 +174,17 @@ class NLPProcessor:
         Tokenize text into words
         Concept: Breaking text into individual tokens
         """
-        return word_tokenize(text)
+        self.load()
+        return self._word_tokenize(text)
     
     def remove_stopwords(self, tokens: List[str]) -> List[str]:
         """
         Remove common stopwords
         Concept: Filtering out words that don't carry much meaning
         """
-        return [token for token in tokens if token.lower() not in self.stop_words]
+        self.load()
+        stop_words = self.stop_words
+        return [token for token in tokens if token.lower() not in stop_words]
     
     def lemmatize(self, tokens: List[str]) -> List[str]:
         """
@@ -83,7 +192,9 @@ class NLPProcessor:
         Concept: Reducing words to their dictionary form
         Example: 'running' -> 'run', 'better' -> 'good'
         """
-        return [self.lemmatizer.lemmatize(token) for token in tokens]
+        self.load()
+        lemmatize_token = self._lemmatize_token
+        return [lemmatize_token(token) for token in tokens]
     
     def stem(self, tokens: List[str]) -> List[str]:
         """
@@ -91,7 +202,34 @@ class NLPProcessor:
         Concept: Reducing words to their stem
         Example: 'running' -> 'run', 'developer' -> 'develop'
         """
-        return [self.stemmer.stem(token) for token in tokens]
+        self.load()
+        stem_token = self._stem_token
+        return [stem_token(token) for token in tokens]
+    
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Hit/miss counts and sizes of the per-token lemma and stem caches"""
+        stats = {}
+        for name, cached in (('lemma', self._lemmatize_token), ('stem', self._stem_token)):
+            if cached is None:  # Not loaded yet
+                stats[name] = {'hits': 0, 'misses': 0, 'size': 0,
+                               'max_size': self.token_cache_size, 'hit_rate': 0.0}
+                continue
+            info = cached.cache_info()
+            lookups = info.hits + info.misses
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'size': info.currsize,
+                'max_size': info.maxsize,
+                'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0,
+            }
+        return stats
+    
+    def clear_caches(self):
+        """Drop memoized lemma and stem results"""
+        if self._loaded:
+            self._lemmatize_token.cache_clear()
+            self._stem_token.cache_clear()
     
     def process(self, text: str, use_lemmatization: bool = True) -> List[str]:
         """
@@ -108,39 +246,42 @@ class NLPProcessor:
         Returns:
             Processed tokens
         """
-        # Step 1: Clean
-        cleaned = self.clean_text(text)
+        if use_lemmatization:
+            return self.analyze(text).lemmas
         
-        # Step 2: Tokenize
-        tokens = self.tokenize(cleaned)
+        # Steps 1-3: Clean, tokenize, remove stopwords
+        filtered = self.remove_stopwords(self.tokenize(self.clean_text(text)))
         
-        # Step 3: Remove stopwords
+        # Step 4: Stem
+        return self.stem(filtered)
+    
+    def analyze(self, text: str) -> AnalyzedDocument:
+        """
+        Run the full pipeline once and keep every intermediate result
+        1. Clean
+        2. Tokenize
+        3. Remove stopwords
+        4. Lemmatize
+        """
+        cleaned = self.clean_text(text)
+        tokens = self.tokenize(cleaned)
         filtered = self.remove_stopwords(tokens)
-        
-        # Step 4: Lemmatize or stem
-        if use_lemmatization:
-            processed = self.lemmatize(filtered)
-        else:
-            processed = self.stem(filtered)
-        
-        return processed
+        lemmas = self.lemmatize(filtered)
+        return AnalyzedDocument(text, cleaned, tokens, filtered, lemmas)
     
-    def extract_keywords(self, text: str, top_n: int = 10) -> List[str]:
+    def extract_keywords(self, text: Union[str, AnalyzedDocument], top_n: int = 10) -> List[str]:
         """
         Extract important keywords from text
-        Uses frequency-based approach
-        """
-        # Process text
-        tokens = self.process(text)
-        
-        # Count frequency
-        freq = {}
-        for token in tokens:
-            if len(token) > 2:  # Ignore very short words
-                freq[token] = freq.get(token, 0) + 1
+        Uses TF-IDF against the corpus stats, term frequency without them
         
-        # Sort by frequency
-        sorted_keywords = sorted(freq.items(), key=lambda x: x[1], reverse=True)
-        
-        # Return top N keywords
-        return [word for word, count in sorted_keywords[:top_n]]
+        Args:
+            text: Raw text, or an already analyzed document
+            top_n: Number of keywords to return
+        """
+        doc = text if isinstance(text, AnalyzedDocument) else self.analyze(text)
+        return doc.keywords(top_n, self.corpus)
+
+
+if __name__ == "__main__":
+    # Build step: fetch the NLTK data once, e.g. into the directory NLTK_DATA points at
+    download_nltk_data(os.getenv("NLTK_DATA"))
@@ -0,0 +1,185 @@
+"""
+OCR - Preprocessed, bounded Tesseract OCR
+Images are converted to grayscale, scaled to a target DPI and deskewed
+before recognition; each page is timed so OCR cost is visible
+"""
+
+import io
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from importlib.util import find_spec
+
+OCR_AVAILABLE = find_spec('pytesseract') is not None and find_spec('PIL') is not None
+
+# Page height assumed when an image carries no DPI metadata (US Letter / A4)
+PAGE_HEIGHT_INCHES = 11.0
+
+
+def page_has_images(page) -> bool:
+    """Whether a PDF page embeds image XObjects (checked without decoding them)"""
+    try:
+        x_objects = page['/Resources']['/XObject'].get_object()
+        return any(x_objects[name].get('/Subtype') == '/Image' for name in x_objects)
+    except (KeyError, TypeError, AttributeError):
+        return False
+
+
+class OcrPageResult:
+    """Recognized text of one page plus where the time went"""
+
+    def __init__(self, text: str, preprocess_ms: float, ocr_ms: float, error: Optional[str] = None):
+        self.text = text
+        self.preprocess_ms = preprocess_ms
+        self.ocr_ms = ocr_ms
+        self.error = error
+
+    def to_dict(self) -> Dict:
+        result = {
+            'preprocess_ms': round(self.preprocess_ms, 1),
+            'ocr_ms': round(self.ocr_ms, 1),
+            'chars': len(self.text),
+        }
+        if self.error:
+            result['error'] = self.error
+        return result
+
+
+class OcrEngine:
+    """
+    Tesseract OCR with preprocessing and a concurrency limit
+    At most max_workers tesseract subprocesses run at once per process;
+    callers beyond that wait for a free slot
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, target_dpi: Optional[int] = None,
+                 timeout: Optional[float] = None, deskew: bool = True):
+        """
+        Args:
+            max_workers: Concurrent tesseract runs (default: OCR_MAX_WORKERS or 2)
+            target_dpi: Resolution images are scaled down to (default: OCR_TARGET_DPI or 300)
+            timeout: Seconds per page before tesseract is killed (default: OCR_TIMEOUT or 30)
+            deskew: Straighten slightly rotated scans before recognition
+        """
+        self.max_workers = int(os.getenv("OCR_MAX_WORKERS", 2)) if max_workers is None else max_workers
+        self.target_dpi = int(os.getenv("OCR_TARGET_DPI", 300)) if target_dpi is None else target_dpi
+        self.timeout = float(os.getenv("OCR_TIMEOUT", 30)) if timeout is None else timeout
+        self.deskew_enabled = deskew
+        self._slots = threading.BoundedSemaphore(max(1, self.max_workers))
+
+    # ==================== PREPROCESSING ====================
+
+    def downscale(self, image):
+        """Scale down to target_dpi; images at or below it are left alone"""
+        from PIL import Image
+
+        dpi = image.info.get('dpi', (0, 0))[0]
+        if dpi and dpi > self.target_dpi:
+            scale = self.target_dpi / float(dpi)
+        else:
+            # No DPI metadata: assume the image is one page tall
+            max_height = int(self.target_dpi * PAGE_HEIGHT_INCHES)
+            scale = max_height / float(image.height) if image.height > max_height else 1.0
+
+        if scale >= 1.0:
+            return image
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        return image.resize(size, Image.LANCZOS)
+
+    def estimate_skew(self, image, max_angle: float = 5.0, step: float = 0.5) -> float:
+        """
+        Estimate scan rotation with a projection profile
+        Text lines are horizontal when the row darkness varies the most
+        """
+        from PIL import Image, ImageOps
+
+        # Work on a small inverted thumbnail: text becomes bright on black
+        thumb = ImageOps.invert(image.copy())
+        thumb.thumbnail((400, 400))
+
+        best_angle, best_score = 0.0, -1.0
+        steps = int(max_angle / step)
+        for i in range(-steps, steps + 1):
+            angle = i * step
+            rotated = thumb.rotate(angle, resample=Image.BILINEAR, expand=False, fillcolor=0)
+            # Squash each row to one pixel = row mean
+            rows = list(rotated.resize((1, rotated.height), Image.BOX).getdata())
+            mean = sum(rows) / len(rows)
+            score = sum((r - mean) ** 2 for r in rows)
+            if score > best_score:
+                best_angle, best_score = angle, score
+        return best_angle
+
+    def preprocess(self, image):
+        """Grayscale, downscale to target DPI, deskew"""
+        from PIL import Image
+
+        image = self.downscale(image.convert('L'))
+        if self.deskew_enabled:
+            angle = self.estimate_skew(image)
+            if angle:
+                image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+        return image
+
+    # ==================== RECOGNITION ====================
+
+    def ocr_image(self, image) -> OcrPageResult:
+        """Preprocess and recognize one image (PIL image, bytes or file-like object)"""
+        import pytesseract
+        from PIL import Image
+
+        started = time.perf_counter()
+        try:
+            if isinstance(image, (bytes, bytearray)):
+                image = Image.open(io.BytesIO(image))
+            elif not isinstance(image, Image.Image):
+                image = Image.open(image)
+            image = self.preprocess(image)
+        except Exception as e:
+            return OcrPageResult("", (time.perf_counter() - started) * 1000, 0.0, f"Preprocessing failed: {e}")
+        preprocessed = time.perf_counter()
+
+        with self._slots:
+            try:
+                text = pytesseract.image_to_string(image, timeout=self.timeout)
+                error = None
+            except Exception as e:
+                text, error = "", str(e)
+        finished = time.perf_counter()
+
+        result = OcrPageResult(text, (preprocessed - started) * 1000, (finished - preprocessed) * 1000, error)
+        if error:
+            print(f"OCR extraction error: {error}")
+        return result
+
+    def ocr_pdf_page(self, page) -> OcrPageResult:
+        """
+        OCR a PDF page without a text layer via its embedded images
+        Scans normally carry one full-page image; the largest one is used
+        """
+        started = time.perf_counter()
+        try:
+            images = page.images
+        except Exception as e:
+            return OcrPageResult("", (time.perf_counter() - started) * 1000, 0.0, f"Image extraction failed: {e}")
+        if not images:
+            return OcrPageResult("", (time.perf_counter() - started) * 1000, 0.0, "No images on page")
+
+        largest = max(images, key=lambda image: len(image.data))
+        extract_ms = (time.perf_counter() - started) * 1000
+
+        result = self.ocr_image(largest.data)
+        result.preprocess_ms += extract_ms
+        return result
+
+    @staticmethod
+    def summarize(results: List[OcrPageResult], page_numbers: Optional[List[int]] = None) -> Dict:
+        """Per-page timings and totals for an OCR'd document (page numbers are 1-based)"""
+        page_numbers = page_numbers or list(range(1, len(results) + 1))
+        return {
+            'pages': len(results),
+            'total_ms': round(sum(r.preprocess_ms + r.ocr_ms for r in results), 1),
+            'page_timings': [dict(r.to_dict(), page=page) for r, page in zip(results, page_numbers)],
+        }
@@ -0,0 +1,158 @@
+"""
+Parse Cache - Content-addressed cache for parsed resumes
+Keyed by a hash of the uploaded bytes plus the parser/taxonomy version,
+so re-uploading a known file skips text extraction and NLP entirely
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from lru import LRUCache
+from resume_parser import KNOWN_SKILLS, PARSER_VERSION, SKILL_STOPWORDS
+
+
+def parser_version() -> str:
+    """Parser version plus a fingerprint of the skill taxonomy"""
+    taxonomy = '\n'.join(sorted(KNOWN_SKILLS)) + '\0' + '\n'.join(sorted(SKILL_STOPWORDS))
+    return f"{PARSER_VERSION}-{hashlib.sha256(taxonomy.encode('utf-8')).hexdigest()[:12]}"
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 of the uploaded bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class DiskParseStore:
+    """
+    SQLite-backed tier that survives restarts
+    Keeps at most max_entries rows, dropping the least recently used
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            " key TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE parse_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, data: Dict) -> int:
+        """Store an entry and return the number of rows evicted"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, data, accessed_at) VALUES (?, ?, ?)",
+                (key, json.dumps(data), time.time()),
+            )
+            self._writes += 1
+
+            evicted = 0
+            if self._writes % 100 == 0:
+                cursor = self._conn.execute(
+                    "DELETE FROM parse_cache WHERE key IN ("
+                    " SELECT key FROM parse_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                evicted = cursor.rowcount
+            self._conn.commit()
+        return evicted
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ParseCache:
+    """
+    Two-tier cache of ResumeParser.parse results
+    - Memory: bounded LRU
+    - Disk (optional): SQLite store, enabled by PARSE_CACHE_PATH
+    Only successful parses are cached
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, disk_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: In-memory entries (default: PARSE_CACHE_SIZE or 1000)
+            disk_path: SQLite file for the persistent tier (default: PARSE_CACHE_PATH, unset = off)
+        """
+        if max_entries is None:
+            max_entries = int(os.getenv("PARSE_CACHE_SIZE", 1000))
+        if disk_path is None:
+            disk_path = os.getenv("PARSE_CACHE_PATH") or None
+
+        self.version = parser_version()
+        self.memory = LRUCache(max_entries)
+        self.disk = DiskParseStore(disk_path) if disk_path else None
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+    def key(self, content: bytes) -> str:
+        """Cache key for uploaded bytes"""
+        return f"{content_hash(content)}:{self.version}"
+
+    def get_by_hash(self, sha: str) -> Optional[Dict]:
+        """Cached parse result for a content hash under the current parser version"""
+        return self.get(f"{sha}:{self.version}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached parse result, if any"""
+        data = self.memory.get(key)
+        if data is None and self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                self.disk_hits += 1
+                self.memory.put(key, data)
+        return dict(data) if data is not None else None
+
+    def put(self, key: str, data: Dict):
+        """Cache a successful parse result"""
+        if 'error' in data:
+            return
+        self.memory.put(key, data)
+        if self.disk is not None:
+            self.disk_evictions += self.disk.put(key, data)
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters for both tiers"""
+        memory = self.memory.stats()
+        return {
+            'version': self.version,
+            'memory': memory,
+            'disk': {
+                'enabled': self.disk is not None,
+                'size': len(self.disk) if self.disk is not None else 0,
+                'hits': self.disk_hits,
+                'evictions': self.disk_evictions,
+            },
+            # A memory miss that was served from disk is still a cache hit
+            'hits': memory['hits'] + self.disk_hits,
+            'misses': memory['misses'] - self.disk_hits,
+        }
@@ -0,0 +1,223 @@
+"""
+Parse Executor - Run resume parsing off the event loop
+Uses a warm process pool: each worker builds its own NLPProcessor and
+ResumeParser once, then parses uploads in parallel. Images and scanned
+PDFs go to a separate, smaller OCR pool so OCR cannot starve text parsing
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# Per-worker parser, built once by the pool initializer
+_worker_parser = None
+
+
+def _mp_context():
+    """
+    Start workers from a clean process, never by forking the API process
+    Forking while another thread holds a lock (e.g. the import lock during
+    background NLP loading) can deadlock the child
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _init_worker():
+    """Build the NLP pipeline once per worker process"""
+    global _worker_parser
+    from corpus_stats import CorpusStats
+    from nlp_processor import NLPProcessor
+    from resume_parser import ResumeParser
+
+    # Snapshot of the saved corpus stats; refreshed when the pool is recycled
+    _worker_parser = ResumeParser(NLPProcessor(corpus=CorpusStats.open())).load()
+
+
+def _warm_up() -> int:
+    """No-op task used to force worker start-up"""
+    return os.getpid()
+
+
+def _parse_upload(filename: str, content: bytes, ocr: bool = True) -> Dict:
+    """Parse one uploaded file inside a worker process, entirely in memory"""
+    if _worker_parser is None:
+        _init_worker()
+    return _worker_parser.parse(content, filename=filename, ocr=ocr, include_terms=True)
+
+
+class ParseExecutor:
+    """
+    Process pools for CPU-bound resume parsing
+    - text pool: every upload starts here, with OCR disabled
+    - OCR pool: images, and PDFs the text pool reported as scanned
+    Workers are recycled after max_tasks_per_child tasks to cap memory
+    growth from PyPDF2/python-docx
+
+    Recycling replaces a whole pool once it has handled
+    workers * max_tasks_per_child tasks. ProcessPoolExecutor's own
+    max_tasks_per_child can deadlock on Python 3.11 (CPython gh-115634).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_tasks_per_child: Optional[int] = None,
+                 cache=None, ocr_workers: Optional[int] = None, corpus=None, term_vectors=None):
+        """
+        Args:
+            max_workers: Number of worker processes (default: PARSE_WORKERS or CPU count)
+                         0 parses in a thread of the current process instead
+            max_tasks_per_child: Tasks per worker before the workers are replaced
+                                 (default: PARSE_MAX_TASKS_PER_CHILD or 50, 0 disables)
+            cache: Optional ParseCache consulted before dispatching to a worker
+            ocr_workers: OCR worker processes (default: OCR_MAX_WORKERS or 2)
+            corpus: Optional CorpusStats updated with every newly parsed resume
+            term_vectors: Optional TermVectors that keeps each parsed resume's
+                          term counts, for vector ranking
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("PARSE_WORKERS", os.cpu_count() or 1))
+        if max_tasks_per_child is None:
+            max_tasks_per_child = int(os.getenv("PARSE_MAX_TASKS_PER_CHILD", 50))
+        if ocr_workers is None:
+            ocr_workers = int(os.getenv("OCR_MAX_WORKERS", 2))
+
+        self.max_workers = max(0, max_workers)
+        self.max_tasks_per_child = max(0, max_tasks_per_child)
+        self.cache = cache
+        self.corpus = corpus
+        self.term_vectors = term_vectors
+        self._workers = {'text': self.max_workers, 'ocr': max(1, ocr_workers)}
+        self._pools: Dict[str, Optional[ProcessPoolExecutor]] = {'text': None, 'ocr': None}
+        self._pool_tasks = {'text': 0, 'ocr': 0}
+
+    def _get_pool(self, kind: str = 'text') -> ProcessPoolExecutor:
+        """Create a process pool on first use, replacing it once it is used up"""
+        pool = self._pools[kind]
+        pool_limit = self._workers[kind] * self.max_tasks_per_child
+        if pool is not None and pool_limit and self._pool_tasks[kind] >= pool_limit:
+            # Retire the old workers; queued tasks still finish on them
+            pool.shutdown(wait=False)
+            pool = None
+
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=self._workers[kind],
+                mp_context=_mp_context(),
+                initializer=_init_worker,
+            )
+            self._pools[kind] = pool
+            self._pool_tasks[kind] = 0
+
+        self._pool_tasks[kind] += 1
+        return pool
+
+    async def warm_up(self):
+        """Start every text worker so the first request doesn't pay NLP start-up"""
+        if self.max_workers == 0:
+            return
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(*[
+            loop.run_in_executor(pool, _warm_up) for _ in range(self.max_workers)
+        ])
+
+    async def parse(self, filename: str, content: bytes) -> Dict:
+        """Parse a single upload, from the cache when the same bytes were seen before"""
+        if self.cache is None:
+            return self._record(None, await self._parse(filename, content))
+
+        key = self.cache.key(content)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        parsed_data = self._record(key, await self._parse(filename, content))
+        self.cache.put(key, parsed_data)
+        return parsed_data
+
+    def _record(self, key: Optional[str], parsed_data: Dict) -> Dict:
+        """
+        Hand a new document's term counts to the corpus stats and term vectors
+        The terms are not part of the result
+        """
+        terms = parsed_data.pop('terms', None)
+        if terms is None:
+            return parsed_data
+        if self.corpus is not None:
+            self.corpus.add_document(terms)
+        if self.term_vectors is not None and key is not None:
+            self.term_vectors.put(key, terms, parsed_data.get('skills') or [])
+        return parsed_data
+
+    async def _parse(self, filename: str, content: bytes) -> Dict:
+        """Parse a single upload without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+
+        if self.max_workers == 0:
+            # In-process: OcrEngine's own semaphore bounds concurrent OCR
+            return await loop.run_in_executor(None, _parse_upload, filename, content)
+
+        from resume_parser import detect_format
+
+        # Images always need OCR; PDFs only if the text pool finds scanned pages
+        if detect_format(content, filename) != 'image':
+            parsed_data = await self._run('text', filename, content, False)
+            if not parsed_data.get('needs_ocr'):
+                return parsed_data
+        return await self._run('ocr', filename, content, True)
+
+    async def _run(self, kind: str, filename: str, content: bytes, ocr: bool) -> Dict:
+        """Run _parse_upload on one of the pools"""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool(kind)
+        try:
+            return await loop.run_in_executor(pool, _parse_upload, filename, content, ocr)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. crashed on a malformed file). Retire the pool this task ran on;
+            # another failed task may already have replaced it, and the new pool must be left alone
+            print(f"Parse worker crashed on {filename}: {e}")
+            if self._pools[kind] is pool:
+                self._pools[kind] = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            return {"error": f"Parser crashed while processing {filename}"}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def parse_many(self, uploads: List[Tuple[str, bytes]]) -> List[Dict]:
+        """
+        Parse a batch of uploads in parallel
+
+        Args:
+            uploads: List of (filename, content) pairs
+
+        Returns:
+            Parsed data for each upload, in the same order
+        """
+        return await asyncio.gather(*[
+            self.parse(filename, content) for filename, content in uploads
+        ])
+
+    async def parse_iter(self, uploads: List[Tuple[str, bytes]]) -> AsyncIterator[Tuple[int, Dict]]:
+        """
+        Parse a batch of uploads in parallel, yielding results as they finish
+        Lets callers keep only what they need instead of every parse result
+
+        Yields:
+            (index of the upload, parsed data)
+        """
+        async def parse_indexed(index: int, filename: str, content: bytes):
+            return index, await self.parse(filename, content)
+
+        for finished in asyncio.as_completed([
+            parse_indexed(index, filename, content) for index, (filename, content) in enumerate(uploads)
+        ]):
+            yield await finished
+
+    def shutdown(self, wait: bool = True):
+        """Stop all worker processes"""
+        for kind, pool in self._pools.items():
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+                self._pools[kind] = None
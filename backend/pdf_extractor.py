@@ -0,0 +1,184 @@
+"""
+PDF Extractor - Budgeted, page-parallel PDF text extraction
+Pages are read lazily and stop at a page limit or time budget,
+returning the partial text with a truncation flag
+"""
+
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Most pages handed to one pool task in parallel mode
+PAGE_RANGE_SIZE = 10
+
+
+def open_pdf(source):
+    """Open a PDF from a path, bytes or binary file-like object"""
+    import PyPDF2
+    
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return PyPDF2.PdfReader(source)
+
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """Extract pages [start, stop) - runs in a pool worker for large documents"""
+    reader = open_pdf(data)
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+class PdfExtractionResult:
+    """Text extracted from a PDF plus how much of the document it covers"""
+
+    def __init__(self, pages: List[str], pages_total: int, truncated: bool, elapsed: float):
+        self.pages = pages
+        self.pages_total = pages_total
+        self.truncated = truncated
+        self.elapsed = elapsed
+        self.ocr: Optional[Dict] = None
+
+    @property
+    def text(self) -> str:
+        # Pages are collected in a list and joined once - no quadratic string growth
+        return ''.join(self.pages)
+
+    @property
+    def pages_read(self) -> int:
+        return len(self.pages)
+
+    @property
+    def empty_pages(self) -> List[int]:
+        """Indexes of read pages without a text layer"""
+        return [i for i, text in enumerate(self.pages) if not text.strip()]
+
+    def to_dict(self) -> Dict:
+        info = {
+            'pages_total': self.pages_total,
+            'pages_read': self.pages_read,
+            'truncated': self.truncated,
+            'elapsed_ms': round(self.elapsed * 1000, 1),
+        }
+        if self.ocr:
+            info['ocr'] = self.ocr
+        return info
+
+
+class PdfExtractor:
+    """
+    Extract PDF text within a page and time budget
+    Small documents are read page by page; documents with at least
+    parallel_threshold pages are split into page ranges that run concurrently
+    """
+
+    def __init__(self, max_pages: Optional[int] = None, time_budget: Optional[float] = None,
+                 parallel_threshold: Optional[int] = None, workers: Optional[int] = None,
+                 mode: Optional[str] = None):
+        """
+        Args:
+            max_pages: Pages to read at most (default: PDF_MAX_PAGES or 50, 0 = no limit)
+            time_budget: Seconds per document (default: PDF_TIME_BUDGET or 10, 0 = no limit)
+            parallel_threshold: Page count from which pages are fanned out
+                                (default: PDF_PARALLEL_THRESHOLD or 40)
+            workers: Concurrent page ranges (default: PDF_WORKERS or 2)
+            mode: 'process', 'thread' or 'off' (default: PDF_PARALLEL or 'process')
+                  PyPDF2 is pure Python, so only processes give real CPU parallelism.
+                  Inside a parse worker process, 'process' falls back to threads:
+                  the worker pool already spreads documents over the CPUs
+        """
+        self.max_pages = int(os.getenv("PDF_MAX_PAGES", 50)) if max_pages is None else max_pages
+        self.time_budget = float(os.getenv("PDF_TIME_BUDGET", 10)) if time_budget is None else time_budget
+        self.parallel_threshold = (int(os.getenv("PDF_PARALLEL_THRESHOLD", 40))
+                                   if parallel_threshold is None else parallel_threshold)
+        self.workers = int(os.getenv("PDF_WORKERS", 2)) if workers is None else workers
+        self.mode = (mode or os.getenv("PDF_PARALLEL", "process")).lower()
+        self._pool: Optional[Union[ProcessPoolExecutor, ThreadPoolExecutor]] = None
+
+    def _deadline(self, started: float) -> Optional[float]:
+        return started + self.time_budget if self.time_budget > 0 else None
+
+    def _page_limit(self, pages_total: int) -> int:
+        return min(pages_total, self.max_pages) if self.max_pages > 0 else pages_total
+
+    def iter_pages(self, source) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (page_number, text) lazily, stopping at the page limit or time budget
+        A single slow page can still overrun the budget
+        """
+        deadline = self._deadline(time.perf_counter())
+        reader = open_pdf(source)
+        for i in range(self._page_limit(len(reader.pages))):
+            if deadline is not None and time.perf_counter() > deadline:
+                return
+            yield i, reader.pages[i].extract_text()
+
+    def extract(self, source) -> PdfExtractionResult:
+        """Extract text within the budget, fanning out pages for large documents"""
+        started = time.perf_counter()
+        data = source.read() if hasattr(source, 'read') else source
+        if isinstance(data, str):
+            with open(data, 'rb') as file:
+                data = file.read()
+
+        reader = open_pdf(data)
+        pages_total = len(reader.pages)
+        page_limit = self._page_limit(pages_total)
+
+        if self.mode in ('process', 'thread') and self.workers > 1 and page_limit >= self.parallel_threshold:
+            pages = self._extract_parallel(data, page_limit, self._deadline(started))
+        else:
+            pages = []
+            try:
+                for _, text in self.iter_pages(data):
+                    pages.append(text)
+            except Exception as e:
+                # Keep the pages read before the failure
+                print(f"PDF extraction error: {e}")
+
+        return PdfExtractionResult(
+            pages=pages,
+            pages_total=pages_total,
+            truncated=len(pages) < pages_total,
+            elapsed=time.perf_counter() - started,
+        )
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Never nest a process pool inside a worker process
+            if self.mode == 'process' and multiprocessing.parent_process() is None:
+                from parse_executor import _mp_context
+
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _extract_parallel(self, data: bytes, page_limit: int, deadline: Optional[float]) -> List[str]:
+        """Extract page ranges concurrently; ranges not done by the deadline are dropped"""
+        pool = self._get_pool()
+        # Small ranges keep the partial result useful when the budget runs out
+        chunk = max(1, min(PAGE_RANGE_SIZE, -(-page_limit // self.workers)))
+        futures = [
+            pool.submit(_extract_page_range, data, start, min(start + chunk, page_limit))
+            for start in range(0, page_limit, chunk)
+        ]
+
+        timeout = max(0.0, deadline - time.perf_counter()) if deadline is not None else None
+        wait(futures, timeout=timeout)
+
+        # Keep the leading ranges that finished in time, so the text stays in page order
+        pages = []
+        for future in futures:
+            if not future.done() or future.exception() is not None:
+                break
+            pages.extend(future.result())
+        for future in futures:
+            future.cancel()
+        return pages
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,80 @@
+"""
+Ranking - Bounded top-k selection with cursor pagination
+Candidates are ordered by score (highest first), then by upload order,
+the same order a stable sort of the whole batch gives
+"""
+
+import base64
+import heapq
+import json
+from typing import Any, List, Optional, Tuple
+
+# (score, seq) of the last entry of a page
+Cursor = Tuple[float, int]
+
+
+def encode_cursor(score: float, seq: int) -> str:
+    """Opaque cursor pointing just after an entry"""
+    raw = json.dumps([score, seq], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """Parse a cursor from encode_cursor (None passes through)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        score, seq = json.loads(raw)
+        return float(score), int(seq)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+class TopK:
+    """
+    Keep the k best entries seen, in O(k) memory
+    Entries are pushed in any order; with a cursor, only entries ranked
+    after it are kept, so successive pages never overlap
+    """
+
+    def __init__(self, k: Optional[int] = None, after: Optional[Cursor] = None):
+        """
+        Args:
+            k: Entries to keep (None = all)
+            after: Cursor of the previous page's last entry
+        """
+        self.k = k
+        self.after = after
+        # Min-heap on (score, -seq): the root is the worst entry kept
+        self._heap: List[Tuple[float, int, Any]] = []
+        # Entries ranked after the cursor, including the ones dropped
+        self.total = 0
+
+    def _is_after_cursor(self, score: float, seq: int) -> bool:
+        if self.after is None:
+            return True
+        after_score, after_seq = self.after
+        return (-score, seq) > (-after_score, after_seq)
+
+    def push(self, score: float, seq: int, item: Any):
+        """Offer an entry; seq must be unique (e.g. the upload index)"""
+        if not self._is_after_cursor(score, seq):
+            return
+        self.total += 1
+        entry = (score, -seq, item)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def results(self) -> List[Any]:
+        """Kept items, best first"""
+        return [item for _, _, item in sorted(self._heap, key=lambda e: (-e[0], -e[1]))]
+
+    def next_cursor(self) -> Optional[str]:
+        """Cursor for the following page, or None if this is the last one"""
+        if self.k is None or self.total <= len(self._heap) or not self._heap:
+            return None
+        score, neg_seq, _ = min(self._heap, key=lambda e: (e[0], e[1]))
+        return encode_cursor(score, -neg_seq)
@@ -0,0 +1,240 @@
+"""
+Read Cache - Per-user read-through cache for the dashboard read endpoints
+Lists and statistics are cached per (user, resource, parameters) with a TTL.
+Every write made through the database services replaces the version token
+of the resources it affects, so stale entries are never read again
+
+Backends:
+- memory: bounded LRU in this process (default)
+- redis: any Redis-compatible server (READ_CACHE_URL), shared by every
+  process; needs `pip install redis`
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from importlib.util import find_spec
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from lru import LRUCache
+
+REDIS_AVAILABLE = find_spec('redis') is not None
+
+# Cached resources each write makes stale
+INVALIDATES = {
+    'resume_saved': ('resumes', 'dashboard'),
+    # Match results of a deleted resume are deleted with it (ON DELETE CASCADE)
+    'resume_deleted': ('resumes', 'matches', 'dashboard'),
+    'job_search_saved': ('job_searches', 'dashboard'),
+    'match_saved': ('matches', 'dashboard'),
+}
+
+# Version tokens outlive every entry, so an entry never outlives its token
+VERSION_TTL = 24 * 3600
+
+
+def etag(*parts: bytes) -> str:
+    """Strong ETag of a response body (and any headers that go with it)"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part)
+        digest.update(b'\0')
+    return f'"{digest.hexdigest()}"'
+
+
+class MemoryCacheBackend:
+    """Entries in a bounded LRU, each with its own expiry time"""
+
+    # Calls return immediately - no need to leave the event loop
+    blocking = False
+
+    def __init__(self, max_entries: int = 2000):
+        self.entries = LRUCache(max_entries)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self.entries.pop(key)
+            return None
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.entries.put(key, (time.monotonic() + ttl, value))
+
+    def add(self, key: str, value: Any, ttl: float) -> Any:
+        """Store value unless key is already set; returns the value now stored"""
+        with self._lock:
+            current = self.get(key)
+            if current is not None:
+                return current
+            self.set(key, value, ttl)
+            return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': 'memory', **self.entries.stats()}
+
+
+class RedisCacheBackend:
+    """
+    Entries in a Redis-compatible store (SET with EX, GET), JSON-encoded
+    Any client with redis-py's get/set(ex=, nx=) can stand in for the server
+    """
+
+    # Network round trips - run them in the thread pool
+    blocking = True
+
+    def __init__(self, client=None, url: Optional[str] = None):
+        """
+        Args:
+            client: redis.Redis or a compatible stand-in (e.g. fakeredis.FakeRedis)
+            url: Server to connect to when no client is given
+                 (default: READ_CACHE_URL or redis://localhost:6379/0)
+        """
+        if client is None:
+            import redis
+
+            url = url or os.getenv("READ_CACHE_URL", "redis://localhost:6379/0")
+            timeout = float(os.getenv("READ_CACHE_TIMEOUT", 0.5))
+            client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.client = client
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.client.set(key, json.dumps(value, separators=(',', ':')), ex=max(1, int(ttl)))
+
+    def add(self, key: str, value: Any, ttl: float) -> Any:
+        """Store value unless key is already set; returns the value now stored"""
+        if self.client.set(key, json.dumps(value), ex=max(1, int(ttl)), nx=True):
+            return value
+        current = self.get(key)
+        return current if current is not None else value
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': 'redis'}
+
+
+class ReadCache:
+    """
+    Read-through cache keyed by user, resource and request parameters
+    Each (user, resource) has a random version token that is part of every
+    entry key; invalidating replaces the token. A read that started before
+    a write stores its result under the old token, where nobody looks.
+    Backend errors are logged and treated as misses
+    """
+
+    def __init__(self, backend=None, ttl: Optional[float] = None, stats_ttl: Optional[float] = None):
+        """
+        Args:
+            backend: MemoryCacheBackend (default) or RedisCacheBackend
+            ttl: Seconds a cached list page is served (default: READ_CACHE_TTL or 300)
+            stats_ttl: Seconds cached dashboard statistics are served (default: READ_CACHE_STATS_TTL or 60)
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        ttl = float(os.getenv("READ_CACHE_TTL", 300)) if ttl is None else ttl
+        stats_ttl = float(os.getenv("READ_CACHE_STATS_TTL", 60)) if stats_ttl is None else stats_ttl
+        self.ttls = {'resumes': ttl, 'job_searches': ttl, 'matches': ttl, 'dashboard': stats_ttl}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ReadCache"]:
+        """
+        Cache configured by READ_CACHE_BACKEND: memory (default), redis or off
+        Falls back to memory when redis isn't installed
+        """
+        kind = os.getenv("READ_CACHE_BACKEND", "memory").lower()
+        if kind in ("off", "none", ""):
+            return None
+        if kind == "redis":
+            if REDIS_AVAILABLE:
+                return cls(RedisCacheBackend())
+            print("READ_CACHE_BACKEND=redis needs the redis package - using the in-process cache")
+        return cls(MemoryCacheBackend(int(os.getenv("READ_CACHE_SIZE", 2000))))
+
+    # ==================== READS ====================
+
+    async def read_through(self, user_id: str, resource: str, params: Any,
+                           loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached value for a read, or loader's result (then cached)
+        loader must raise on failure, so errors are never cached.
+        Values must be JSON-serializable and are shared: don't modify them
+        """
+        try:
+            key = await self._run(self._key, user_id, resource, params)
+            value = await self._run(self.backend.get, key)
+        except Exception as e:
+            self._error(e)
+            return await loader()
+
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        value = await loader()
+        try:
+            await self._run(self.backend.set, key, value, self.ttls[resource])
+        except Exception as e:
+            self._error(e)
+        return value
+
+    def _key(self, user_id: str, resource: str, params: Any) -> str:
+        token = self.backend.add(self._version_key(user_id, resource), uuid.uuid4().hex, VERSION_TTL)
+        return f"rc:{user_id}:{resource}:{token}:{json.dumps(params, separators=(',', ':'))}"
+
+    @staticmethod
+    def _version_key(user_id: str, resource: str) -> str:
+        return f"rc:v:{user_id}:{resource}"
+
+    async def _run(self, func, *args):
+        if not self.backend.blocking:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # ==================== INVALIDATION ====================
+
+    def invalidate(self, user_id: str, event: str):
+        """Drop the user's cached reads that a write (a key of INVALIDATES) makes stale"""
+        try:
+            for resource in INVALIDATES[event]:
+                self.backend.set(self._version_key(user_id, resource), uuid.uuid4().hex, VERSION_TTL)
+            self.invalidations += 1
+        except Exception as e:
+            self._error(e)
+
+    async def ainvalidate(self, user_id: str, event: str):
+        """invalidate() from a coroutine, off the event loop for network backends"""
+        await self._run(self.invalidate, user_id, event)
+
+    # ==================== STATS ====================
+
+    def _error(self, error: Exception):
+        self.errors += 1
+        print(f"Read cache unavailable: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, invalidations and backend statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.stats(),
+            'ttls': self.ttls,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'errors': self.errors,
+        }
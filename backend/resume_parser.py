@@ -4,22 +4,233 @@ Supports: PDF, TXT, DOCX, and Images (JPG, PNG) with OCR
 Uses NLP processing and pattern matching
 """
 
+import io
 import re
 import os
-from typing import Dict, List
-import PyPDF2
-from docx import Document
-import docx2txt
-
-try:
-    import pytesseract
-    from PIL import Image
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+import tempfile
+import zipfile
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+# Format libraries are imported on first use to keep API start-up fast
+from ocr import OCR_AVAILABLE, OcrEngine, page_has_images
+if not OCR_AVAILABLE:
     print("Warning: pytesseract or PIL not available. Image support disabled.")
 
-from nlp_processor import NLPProcessor
+from nlp_processor import AnalyzedDocument, NLPProcessor
+from pdf_extractor import PdfExtractionResult, PdfExtractor, open_pdf
+
+# Bump when parse() output changes, so cached parse results are invalidated
+PARSER_VERSION = "3"
+
+# Common technical skills database (expandable)
+KNOWN_SKILLS = frozenset({
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php', 
+    'swift', 'kotlin', 'go', 'rust', 'scala', 'r', 'matlab', 'perl', 'shell',
+    'bash', 'powershell', 'sql', 'html', 'css', 'sass', 'less',
+
+    # Frameworks & Libraries
+    'react', 'angular', 'vue', 'vue.js', 'node', 'node.js', 'next.js', 'nuxt',
+    'express', 'django', 'flask', 'fastapi', 'spring', 'springboot', 'laravel',
+    'rails', 'asp.net', '.net', 'jquery', 'bootstrap', 'tailwind', 'redux',
+
+    # Databases
+    'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra', 'dynamodb',
+    'elasticsearch', 'oracle', 'sqlite', 'mariadb', 'mssql',
+
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab',
+    'github', 'terraform', 'ansible', 'chef', 'puppet', 'ci/cd', 'devops',
+
+    # Tools & Technologies
+    'git', 'jira', 'confluence', 'slack', 'postman', 'swagger', 'graphql',
+    'rest', 'api', 'microservices', 'webpack', 'vite', 'nginx', 'apache',
+
+    # Concepts & Skills
+    'agile', 'scrum', 'tdd', 'bdd', 'oop', 'data structures', 'algorithms',
+    'machine learning', 'deep learning', 'ai', 'nlp', 'computer vision',
+    'data science', 'big data', 'hadoop', 'spark', 'kafka', 'linux', 'unix'
+})
+
+# Comprehensive stopwords and non-skill words
+SKILL_STOPWORDS = frozenset({
+    # Personal info
+    'name', 'email', 'phone', 'address', 'com', 'gmail', 'yahoo', 'hotmail',
+
+    # Common resume words
+    'summary', 'experience', 'education', 'skills', 'professional', 'technical',
+    'work', 'working', 'worked', 'position', 'role', 'job', 'company', 'team',
+    'project', 'projects', 'responsibility', 'responsibilities', 'objective',
+    'profile', 'career', 'employment', 'history', 'background', 'qualification',
+    'qualifications', 'achievement', 'achievements', 'award', 'awards',
+
+    # Time & location
+    'year', 'years', 'month', 'months', 'day', 'week', 'time', 'date', 'present',
+    'current', 'san', 'francisco', 'york', 'angeles', 'chicago', 'boston',
+    'seattle', 'austin', 'denver', 'usa', 'uk', 'canada', 'california', 'texas',
+
+    # Job levels & titles (too generic)
+    'senior', 'junior', 'lead', 'manager', 'director', 'engineer', 'developer',
+    'analyst', 'specialist', 'consultant', 'coordinator', 'associate', 'intern',
+
+    # Action verbs (too generic)
+    'developed', 'designed', 'implemented', 'created', 'built', 'managed',
+    'led', 'worked', 'collaborated', 'improved', 'increased', 'reduced',
+    'building', 'designing', 'creating', 'developing', 'managing', 'leading',
+
+    # Generic descriptors
+    'strong', 'excellent', 'good', 'great', 'highly', 'skilled', 'experienced',
+    'proven', 'successful', 'effective', 'efficient', 'proficient', 'expert',
+    'advanced', 'intermediate', 'basic', 'knowledge', 'ability', 'capable',
+
+    # Common words
+    'application', 'applications', 'system', 'systems', 'solution', 'solutions',
+    'platform', 'platforms', 'service', 'services', 'product', 'products',
+    'business', 'client', 'customer', 'user', 'users', 'data', 'code', 'test',
+
+    # Numbers (from phone/dates)
+    'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten'
+})
+
+# Technical terms with special characters, matched on the original text
+TECHNICAL_PATTERNS = [
+    re.compile(r'\b[A-Z][a-zA-Z]*\.js\b'),  # Node.js, Next.js, Vue.js
+    re.compile(r'\b[A-Z][a-zA-Z]+\+\+\b'),  # C++
+    re.compile(r'\b[A-Z]#\b'),              # C#, F#
+    re.compile(r'\bTypeScript\b'),          # TypeScript
+    re.compile(r'\bJavaScript\b'),          # JavaScript
+]
+
+
+def _trie_regex(words: List[str]) -> str:
+    """
+    Build a regex alternation shaped like a character trie
+    Shared prefixes are matched once, so the regex engine does not
+    retry every skill at every position
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-word marker
+
+    def to_regex(node: Dict) -> str:
+        branches = [re.escape(char) + to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # Word may end here: try the longer words first, then stop
+            return '(?:' + body + ')?'
+        return body
+
+    return to_regex(trie)
+
+
+class SkillMatcher:
+    """
+    Find known skills in text with a single regex pass
+    Equivalent to one search of r'\b<skill>(?:\.js)?\b' per skill
+    """
+
+    def __init__(self, skills):
+        """Compile the skill vocabulary once"""
+        self.skills = sorted(skills)
+
+        # Zero-width lookahead so overlapping skills ('asp.net' and '.net') are all seen
+        self.pattern = re.compile(r'(?=\b(' + _trie_regex(self.skills) + r')(?:\.js)?\b)')
+
+        # The trie returns the longest skill at a position; shorter skills that
+        # are prefixes of it ('node' in 'node.js') are re-checked individually
+        self.single = {
+            skill: re.compile(r'\b' + re.escape(skill) + r'(?:\.js)?\b')
+            for skill in self.skills
+        }
+        self.prefixes = {
+            skill: [other for other in self.skills if other != skill and skill.startswith(other)]
+            for skill in self.skills
+        }
+
+    def find_all(self, text_lower: str) -> List[str]:
+        """Return every skill found in lowercased text, in order of first appearance"""
+        found = {}
+        for match in self.pattern.finditer(text_lower):
+            skill = match.group(1)
+            found[skill] = True
+            for prefix in self.prefixes[skill]:
+                if prefix not in found and self.single[prefix].match(text_lower, match.start()):
+                    found[prefix] = True
+        return list(found)
+
+
+# A resume can be given as a file path, raw bytes or a binary file-like object
+Source = Union[str, bytes, BinaryIO]
+
+IMAGE_SIGNATURES = (
+    b'\x89PNG\r\n\x1a\n',  # PNG
+    b'\xff\xd8\xff',         # JPEG
+    b'II*\x00', b'MM\x00*',   # TIFF
+)
+
+EXTENSION_FORMATS = {
+    '.pdf': 'pdf', '.txt': 'txt', '.docx': 'docx', '.doc': 'doc',
+    '.jpg': 'image', '.jpeg': 'image', '.png': 'image', '.bmp': 'image', '.tiff': 'image',
+}
+
+
+def _read_bytes(source: Source) -> bytes:
+    """Return the full content of a path, bytes or file-like object"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            return file.read()
+    return source.read()
+
+
+def _as_stream(source: Source):
+    """Wrap bytes in a stream; paths and file-like objects are passed through"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+
+def detect_format(data: bytes, filename: Optional[str] = None) -> str:
+    """
+    Detect the document format from its leading bytes
+    Falls back to the filename extension only when the content is not conclusive
+    
+    Returns:
+        'pdf', 'docx', 'doc', 'image', 'txt' or 'unknown'
+    """
+    head = data[:1024]
+    extension = os.path.splitext(filename or '')[1].lower()
+    
+    # PDF readers accept the header anywhere in the first 1 KB
+    if head.startswith(b'%PDF-') or (extension == '.pdf' and b'%PDF-' in head):
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if 'word/document.xml' in archive.namelist():
+                    return 'docx'
+        except zipfile.BadZipFile:
+            pass
+    if head.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):  # OLE2 (Word 97-2003)
+        return 'doc'
+    if head.startswith(IMAGE_SIGNATURES):
+        return 'image'
+    if head.startswith(b'BM') and data[6:10] == b'\x00\x00\x00\x00':  # BMP
+        return 'image'
+    
+    if extension in EXTENSION_FORMATS:
+        return EXTENSION_FORMATS[extension]
+    
+    # No binary signature and no usable extension: treat NUL-free content as text
+    if b'\x00' not in head or head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'txt'
+    return 'unknown'
 
 
 class ResumeParser:
@@ -29,54 +240,85 @@ class ResumeParser:
     """
     
     def __init__(self, nlp_processor: NLPProcessor):
-        """Initialize with NLP processor - NO HARDCODED SKILLS!"""
+        """Initialize with NLP processor and the compiled skill vocabulary"""
         self.nlp = nlp_processor
+        self.skill_matcher = SkillMatcher(KNOWN_SKILLS)
+        self.pdf_extractor = PdfExtractor()
+        self.ocr = OcrEngine()
     
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        text = ""
+    def load(self) -> "ResumeParser":
+        """Import the format libraries and NLP data now instead of on first parse"""
+        import docx  # noqa: F401
+        import PyPDF2  # noqa: F401
+        if OCR_AVAILABLE:
+            import pytesseract  # noqa: F401
+            from PIL import Image  # noqa: F401
+        self.nlp.load()
+        return self
+    
+    def extract_pdf(self, source: Source) -> PdfExtractionResult:
+        """Extract PDF text within the page/time budget, with truncation info"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
+            return self.pdf_extractor.extract(source)
         except Exception as e:
             print(f"PDF extraction error: {e}")
-        return text
+            return PdfExtractionResult([], 0, False, 0.0)
+    
+    def scanned_pages(self, data: bytes, result: PdfExtractionResult) -> List[int]:
+        """Pages with no text layer but embedded images - scans that need OCR"""
+        empty_pages = result.empty_pages
+        if not empty_pages:
+            return []
+        reader = open_pdf(data)
+        return [i for i in empty_pages if page_has_images(reader.pages[i])]
+    
+    def ocr_pdf_pages(self, data: bytes, result: PdfExtractionResult, page_numbers: List[int]):
+        """Fill in scanned pages with OCR text, recording per-page timing"""
+        reader = open_pdf(data)
+        page_results = []
+        for i in page_numbers:
+            page_result = self.ocr.ocr_pdf_page(reader.pages[i])
+            result.pages[i] = page_result.text
+            page_results.append(page_result)
+        result.ocr = OcrEngine.summarize(page_results, [i + 1 for i in page_numbers])
     
-    def extract_text_from_txt(self, file_path: str) -> str:
-        """Extract text from TXT file with multiple encoding fallbacks"""
+    def extract_text_from_pdf(self, source: Source) -> str:
+        """Extract text from PDF (path, bytes or file-like object)"""
+        return self.extract_pdf(source).text
+    
+    def extract_text_from_txt(self, source: Source) -> str:
+        """Extract text from TXT (path, bytes or file-like object) with multiple encoding fallbacks"""
+        try:
+            data = _read_bytes(source)
+        except Exception as e:
+            print(f"TXT extraction error: {e}")
+            return ""
+        
         encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252', 'iso-8859-1']
         
         for encoding in encodings:
             try:
-                with open(file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
-                    if content.strip():  # Check if content is not empty
-                        print(f"Successfully read TXT file with {encoding} encoding")
-                        return content
+                content = data.decode(encoding)
+                if content.strip():  # Check if content is not empty
+                    print(f"Successfully read TXT file with {encoding} encoding")
+                    return content
             except (UnicodeDecodeError, UnicodeError):
                 continue  # Try next encoding
-            except Exception as e:
-                print(f"TXT extraction error with {encoding}: {e}")
-                continue
         
-        # If all encodings fail, try reading as binary and decode with errors='ignore'
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                content = file.read()
-                if content.strip():
-                    print("Read TXT file with UTF-8 (ignoring errors)")
-                    return content
-        except Exception as e:
-            print(f"Final TXT extraction attempt failed: {e}")
+        # If all encodings fail, decode with errors='ignore'
+        content = data.decode('utf-8', errors='ignore')
+        if content.strip():
+            print("Read TXT file with UTF-8 (ignoring errors)")
+            return content
         
         return ""  # Return empty string if all attempts fail
     
-    def extract_text_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file including tables"""
+    def extract_text_from_docx(self, source: Source) -> str:
+        """Extract text from DOCX (path, bytes or file-like object) including tables"""
         try:
-            doc = Document(file_path)
+            from docx import Document
+            
+            doc = Document(_as_stream(source))
             text = []
             
             # Extract from paragraphs
@@ -105,21 +347,33 @@ class ResumeParser:
             print(error_msg)
             raise ValueError(error_msg)
     
-    def extract_text_from_doc(self, file_path: str) -> str:
+    def extract_text_from_doc(self, source: Source) -> str:
         """Extract text from old .doc format (Word 97-2003)"""
         
         # Method 1: Try docx2txt first (works for some .doc files)
         try:
-            text = docx2txt.process(file_path)
+            import docx2txt
+            
+            text = docx2txt.process(_as_stream(source))
             if text and text.strip():
                 return text
         except Exception:
             pass
         
         # Method 2: Try using Word COM automation (Windows only)
+        # Word can only open files, so in-memory uploads are written out here
+        temp_path = None
         try:
             import win32com.client
             
+            if isinstance(source, str):
+                file_path = source
+            else:
+                fd, temp_path = tempfile.mkstemp(suffix='.doc')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_read_bytes(source))
+                file_path = temp_path
+            
             word = win32com.client.Dispatch("Word.Application")
             word.Visible = False
             
@@ -140,6 +394,9 @@ class ResumeParser:
                 word.Quit()
             except:
                 pass
+        finally:
+            if temp_path:
+                os.remove(temp_path)
         
         # If both methods fail, give clear instructions
         raise ValueError(
@@ -148,35 +405,68 @@ class ResumeParser:
             "Open in Word → File → Save As → Word Document (*.docx)"
         )
     
-    def extract_text_from_image(self, file_path: str) -> str:
-        """Extract text from image using OCR"""
+    def extract_text_from_image(self, source: Source) -> str:
+        """Extract text from image (path, bytes or file-like object) using OCR"""
         if not OCR_AVAILABLE:
             return "OCR not available. Install pytesseract and PIL."
         
-        try:
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
-            return text
-        except Exception as e:
-            print(f"OCR extraction error: {e}")
-            return ""
+        return self.ocr.ocr_image(_as_stream(source)).text
+    
+    def extract_text(self, source: Source, filename: Optional[str] = None) -> str:
+        """
+        Extract text based on file content
+        
+        Args:
+            source: File path, raw bytes or binary file-like object
+            filename: Original filename, only used when the content is ambiguous
+        """
+        return self.extract_document(source, filename)[0]
     
-    def extract_text(self, file_path: str) -> str:
-        """Extract text based on file type"""
-        file_lower = file_path.lower()
+    def extract_document(self, source: Source, filename: Optional[str] = None,
+                         ocr: bool = True) -> Tuple[str, Dict]:
+        """
+        Extract text based on file content, plus extraction details
+        
+        Args:
+            source: File path, raw bytes or binary file-like object
+            filename: Original filename, only used when the content is ambiguous
+            ocr: Run OCR for images and scanned PDF pages. When False, such
+                 documents return info['needs_ocr'] = True instead
+        
+        Returns:
+            (text, info) - info holds page counts, the truncation flag and
+            OCR timings for PDFs
+        """
+        if isinstance(source, str):
+            filename = filename or source
+            with open(source, 'rb') as file:
+                data = file.read()
+        else:
+            data = _read_bytes(source)
         
-        if file_lower.endswith('.pdf'):
-            return self.extract_text_from_pdf(file_path)
-        elif file_lower.endswith('.txt'):
-            return self.extract_text_from_txt(file_path)
-        elif file_lower.endswith('.docx'):
-            return self.extract_text_from_docx(file_path)
-        elif file_lower.endswith('.doc'):
-            return self.extract_text_from_doc(file_path)
-        elif file_lower.endswith(('.jpg', '.jpeg', '.png', '.bmp', '.tiff')):
+        file_format = detect_format(data, filename)
+        
+        if file_format == 'pdf':
+            result = self.extract_pdf(data)
+            scanned = self.scanned_pages(data, result) if OCR_AVAILABLE else []
+            if scanned:
+                if not ocr:
+                    return "", {'needs_ocr': True}
+                self.ocr_pdf_pages(data, result, scanned)
+            return result.text, result.to_dict()
+        elif file_format == 'txt':
+            return self.extract_text_from_txt(data), {}
+        elif file_format == 'docx':
+            return self.extract_text_from_docx(data), {}
+        elif file_format == 'doc':
+            return self.extract_text_from_doc(data), {}
+        elif file_format == 'image':
             if not OCR_AVAILABLE:
                 raise ValueError("Image support requires pytesseract installation")
-            return self.extract_text_from_image(file_path)
+            if not ocr:
+                return "", {'needs_ocr': True}
+            ocr_result = self.ocr.ocr_image(data)
+            return ocr_result.text, {'ocr': OcrEngine.summarize([ocr_result])}
         else:
             raise ValueError(
                 f"Unsupported file format. "
@@ -203,103 +493,21 @@ class ResumeParser:
                 return match.group(0)
         return ""
     
-    def extract_skills(self, text: str) -> List[str]:
+    def extract_skills(self, text: str, doc: Optional[AnalyzedDocument] = None) -> List[str]:
         """
         Extract skills using improved NLP + technical term preservation
         Filters out names, locations, generic words, and contact info
         """
         skills = []
-        text_lower = text.lower()
-        
-        # Common technical skills database (expandable)
-        known_skills = {
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php', 
-            'swift', 'kotlin', 'go', 'rust', 'scala', 'r', 'matlab', 'perl', 'shell',
-            'bash', 'powershell', 'sql', 'html', 'css', 'sass', 'less',
-            
-            # Frameworks & Libraries
-            'react', 'angular', 'vue', 'vue.js', 'node', 'node.js', 'next.js', 'nuxt',
-            'express', 'django', 'flask', 'fastapi', 'spring', 'springboot', 'laravel',
-            'rails', 'asp.net', '.net', 'jquery', 'bootstrap', 'tailwind', 'redux',
-            
-            # Databases
-            'mysql', 'postgresql', 'mongodb', 'redis', 'cassandra', 'dynamodb',
-            'elasticsearch', 'oracle', 'sqlite', 'mariadb', 'mssql',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab',
-            'github', 'terraform', 'ansible', 'chef', 'puppet', 'ci/cd', 'devops',
-            
-            # Tools & Technologies
-            'git', 'jira', 'confluence', 'slack', 'postman', 'swagger', 'graphql',
-            'rest', 'api', 'microservices', 'webpack', 'vite', 'nginx', 'apache',
-            
-            # Concepts & Skills
-            'agile', 'scrum', 'tdd', 'bdd', 'oop', 'data structures', 'algorithms',
-            'machine learning', 'deep learning', 'ai', 'nlp', 'computer vision',
-            'data science', 'big data', 'hadoop', 'spark', 'kafka', 'linux', 'unix'
-        }
-        
-        # Comprehensive stopwords and non-skill words
-        stopwords = {
-            # Personal info
-            'name', 'email', 'phone', 'address', 'com', 'gmail', 'yahoo', 'hotmail',
-            
-            # Common resume words
-            'summary', 'experience', 'education', 'skills', 'professional', 'technical',
-            'work', 'working', 'worked', 'position', 'role', 'job', 'company', 'team',
-            'project', 'projects', 'responsibility', 'responsibilities', 'objective',
-            'profile', 'career', 'employment', 'history', 'background', 'qualification',
-            'qualifications', 'achievement', 'achievements', 'award', 'awards',
-            
-            # Time & location
-            'year', 'years', 'month', 'months', 'day', 'week', 'time', 'date', 'present',
-            'current', 'san', 'francisco', 'york', 'angeles', 'chicago', 'boston',
-            'seattle', 'austin', 'denver', 'usa', 'uk', 'canada', 'california', 'texas',
-            
-            # Job levels & titles (too generic)
-            'senior', 'junior', 'lead', 'manager', 'director', 'engineer', 'developer',
-            'analyst', 'specialist', 'consultant', 'coordinator', 'associate', 'intern',
-            
-            # Action verbs (too generic)
-            'developed', 'designed', 'implemented', 'created', 'built', 'managed',
-            'led', 'worked', 'collaborated', 'improved', 'increased', 'reduced',
-            'building', 'designing', 'creating', 'developing', 'managing', 'leading',
-            
-            # Generic descriptors
-            'strong', 'excellent', 'good', 'great', 'highly', 'skilled', 'experienced',
-            'proven', 'successful', 'effective', 'efficient', 'proficient', 'expert',
-            'advanced', 'intermediate', 'basic', 'knowledge', 'ability', 'capable',
-            
-            # Common words
-            'application', 'applications', 'system', 'systems', 'solution', 'solutions',
-            'platform', 'platforms', 'service', 'services', 'product', 'products',
-            'business', 'client', 'customer', 'user', 'users', 'data', 'code', 'test',
-            
-            # Numbers (from phone/dates)
-            'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten'
-        }
+        text_lower = doc.lower if doc else text.lower()
         
         # Step 1: Extract technical patterns with special characters
-        technical_patterns = [
-            r'\b[A-Z][a-zA-Z]*\.js\b',  # Node.js, Next.js, Vue.js
-            r'\b[A-Z][a-zA-Z]+\+\+\b',  # C++
-            r'\b[A-Z]#\b',              # C#, F#
-            r'\bTypeScript\b',          # TypeScript
-            r'\bJavaScript\b',          # JavaScript
-        ]
-        
-        for pattern in technical_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in TECHNICAL_PATTERNS:
+            matches = pattern.findall(text)
             skills.extend([m.lower() for m in matches])
         
-        # Step 2: Extract known skills from text
-        for skill in known_skills:
-            # Look for skill as whole word (case insensitive)
-            pattern = r'\b' + re.escape(skill) + r'(?:\.js)?\b'
-            if re.search(pattern, text_lower):
-                skills.append(skill)
+        # Step 2: Extract known skills from text (whole words, single pass)
+        skills.extend(self.skill_matcher.find_all(text_lower))
         
         # Step 3: Clean and deduplicate
         unique_skills = []
@@ -314,7 +522,7 @@ class ResumeParser:
                 continue
             
             # Skip if in stopwords
-            if skill_clean in stopwords:
+            if skill_clean in SKILL_STOPWORDS:
                 continue
             
             unique_skills.append(skill_clean)
@@ -322,48 +530,64 @@ class ResumeParser:
         
         return unique_skills[:40]  # Return top 40 skills
     
-    def extract_experience(self, text: str) -> str:
+    def extract_experience(self, text: str, doc: Optional[AnalyzedDocument] = None) -> str:
         """
         Extract years of experience
         Looks for patterns like "5 years experience", "3+ years"
         """
+        text_lower = doc.lower if doc else text.lower()
         patterns = [
             r'(\d+)\+?\s*(?:years?|yrs?)(?:\s+of)?\s+experience',
             r'experience\s*:?\s*(\d+)\+?\s*(?:years?|yrs?)',
         ]
         
         for pattern in patterns:
-            match = re.search(pattern, text.lower())
+            match = re.search(pattern, text_lower)
             if match:
                 return f"{match.group(1)} years"
         
         return "Not specified"
     
-    def parse(self, file_path: str) -> Dict:
+    def parse(self, source: Source, filename: Optional[str] = None, ocr: bool = True,
+              include_terms: bool = False) -> Dict:
         """
         Parse resume and extract all information
         
+        Args:
+            source: File path, raw bytes or binary file-like object
+            filename: Original filename, used as a format hint
+            ocr: Allow OCR; when False, documents that need it return
+                 {"error": ..., "needs_ocr": True}
+            include_terms: Add the document's term counts as "terms", for
+                           corpus statistics and vector ranking
+        
         Returns:
             Dictionary with extracted data:
             - email, phone, skills, experience, keywords
         """
         try:
             # Extract text
-            text = self.extract_text(file_path)
+            text, extraction = self.extract_document(source, filename, ocr=ocr)
+            
+            if extraction.get('needs_ocr'):
+                return {"error": "Document needs OCR", "needs_ocr": True}
             
             if not text:
                 return {"error": "Could not extract text from file"}
             
+            # Run the NLP pipeline once; extractors share the result
+            doc = self.nlp.analyze(text)
+            
             # Extract information
             email = self.extract_email(text)
             phone = self.extract_phone(text)
-            skills = self.extract_skills(text)
-            experience = self.extract_experience(text)
+            skills = self.extract_skills(text, doc)
+            experience = self.extract_experience(text, doc)
             
             # Extract keywords using NLP
-            keywords = self.nlp.extract_keywords(text, top_n=15)
+            keywords = self.nlp.extract_keywords(doc, top_n=15)
             
-            return {
+            result = {
                 "email": email,
                 "phone": phone,
                 "skills": skills,
@@ -371,6 +595,21 @@ class ResumeParser:
                 "keywords": keywords,
                 "raw_text": text[:500]  # First 500 chars for reference
             }
+            
+            # Long PDFs are cut at the page/time budget - say so
+            if extraction.get('truncated'):
+                result["truncated"] = True
+                result["pages_read"] = extraction['pages_read']
+                result["pages_total"] = extraction['pages_total']
+            
+            # OCR cost per page, for scans and images
+            if extraction.get('ocr'):
+                result["ocr"] = extraction['ocr']
+            
+            if include_terms:
+                result["terms"] = doc.frequencies
+            
+            return result
         
         except Exception as e:
             return {"error": str(e)}
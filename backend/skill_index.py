@@ -0,0 +1,224 @@
+"""
+Skill Index - In-process inverted index over stored resumes
+Maps each normalized skill/keyword to the resumes containing it, so
+skill searches over the library don't scan or re-parse anything
+"""
+
+import heapq
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from lru import LRUCache
+
+# Resume fields kept for search results (everything else stays in the database)
+SUMMARY_FIELDS = ('id', 'filename', 'name', 'email', 'created_at')
+
+
+def normalize_term(term: str) -> str:
+    """Lowercase and collapse whitespace"""
+    return ' '.join(str(term).lower().split())
+
+
+def resume_terms(row: Dict[str, Any]) -> Set[str]:
+    """Normalized skills and keywords of a resume row"""
+    parsed_data = row.get('parsed_data') or {}
+    terms = list(row.get('skills') or parsed_data.get('skills') or [])
+    terms.extend(row.get('keywords') or parsed_data.get('keywords') or [])
+    return {normalized for normalized in map(normalize_term, terms) if normalized}
+
+
+class SkillIndex:
+    """
+    Inverted index for one user's resumes
+    postings: term -> ids of resumes containing it
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = {}
+        self.terms: Dict[str, Set[str]] = {}
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+        self.built_at: Optional[float] = None
+        self._removed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def add(self, row: Dict[str, Any]):
+        """Index (or re-index) one resume row"""
+        resume_id = row.get('id')
+        if not resume_id:
+            return
+        terms = resume_terms(row)
+        with self._lock:
+            if resume_id in self._removed:
+                # Deleted while the index was being built from an older page
+                return
+            self._unlink(resume_id)
+            self.terms[resume_id] = terms
+            self.summaries[resume_id] = {field: row.get(field) for field in SUMMARY_FIELDS}
+            for term in terms:
+                self.postings.setdefault(term, set()).add(resume_id)
+
+    def remove(self, resume_id: str):
+        """Drop a resume from the index"""
+        with self._lock:
+            if not self.ready:
+                self._removed.add(resume_id)
+            self._unlink(resume_id)
+
+    def _created_at(self, resume_id: str) -> str:
+        return self.summaries[resume_id].get('created_at') or ''
+
+    def _unlink(self, resume_id: str):
+        for term in self.terms.pop(resume_id, ()):
+            ids = self.postings.get(term)
+            if ids is not None:
+                ids.discard(resume_id)
+                if not ids:
+                    del self.postings[term]
+        self.summaries.pop(resume_id, None)
+
+    def build(self, rows: Iterable[Dict[str, Any]]):
+        """Index every row, then mark the index ready"""
+        for row in rows:
+            self.add(row)
+        with self._lock:
+            self.built_at = time.time()
+            self._removed.clear()
+
+    def search(self, skills: List[str], top_k: int = 20) -> List[Dict[str, Any]]:
+        """
+        Top-k resumes by number of requested skills they contain
+
+        Only the posting lists of the requested skills are touched.
+        Ties are broken by newest resume first.
+
+        Returns:
+            Resume summaries with score (0-100), matched_skills and missing_skills
+        """
+        wanted = list(dict.fromkeys(s for s in map(normalize_term, skills) if s))
+        if not wanted or top_k <= 0:
+            return []
+
+        with self._lock:
+            hits: Counter = Counter()
+            for term in wanted:
+                hits.update(self.postings.get(term, ()))
+
+            # Group by hit count and only rank the buckets needed to fill top_k
+            by_count: Dict[int, List[str]] = {}
+            for resume_id, count in hits.items():
+                by_count.setdefault(count, []).append(resume_id)
+            top = []
+            for count in sorted(by_count, reverse=True):
+                newest = heapq.nlargest(top_k - len(top), by_count[count], key=self._created_at)
+                top.extend((resume_id, count) for resume_id in newest)
+                if len(top) >= top_k:
+                    break
+
+            results = []
+            for resume_id, count in top:
+                terms = self.terms[resume_id]
+                results.append(dict(
+                    self.summaries[resume_id],
+                    score=round(count / len(wanted) * 100, 2),
+                    matched_skills=[s for s in wanted if s in terms],
+                    missing_skills=[s for s in wanted if s not in terms],
+                ))
+        return results
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+
+class SkillIndexRegistry:
+    """
+    Per-user SkillIndex instances, built lazily from the database
+    Writes made through DatabaseService are applied incrementally; an index
+    older than max_age is rebuilt to pick up writes from other processes
+    """
+
+    def __init__(self, loader: Callable[[str], Iterable[Dict[str, Any]]],
+                 max_users: Optional[int] = None, max_age: Optional[float] = None):
+        """
+        Args:
+            loader: Yields the resume rows of a user (DatabaseService.iter_resume_index_rows)
+            max_users: Users whose index is kept in memory (default: SKILL_INDEX_MAX_USERS or 100)
+            max_age: Seconds before an index is rebuilt (default: SKILL_INDEX_MAX_AGE or 900, 0 = never)
+        """
+        self.loader = loader
+        if max_users is None:
+            max_users = int(os.getenv("SKILL_INDEX_MAX_USERS", 100))
+        self.max_age = float(os.getenv("SKILL_INDEX_MAX_AGE", 900)) if max_age is None else max_age
+        self.indexes = LRUCache(max_users)
+        # user_id -> [build lock, requests holding or waiting on it]
+        self._build_locks: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, index: SkillIndex) -> bool:
+        return self.max_age > 0 and time.time() - index.built_at > self.max_age
+
+    def get(self, user_id: str) -> SkillIndex:
+        """Return the user's index, building it on first use (blocking)"""
+        index = self.indexes.get(user_id)
+        if index is not None and index.ready and not self._expired(index):
+            return index
+
+        build_lock = self._acquire_build_lock(user_id)
+        try:
+            with build_lock:
+                # Another request may have finished the build while we waited
+                current = self.indexes.get(user_id)
+                if current is not None and current.ready and not self._expired(current):
+                    return current
+
+                started = time.perf_counter()
+                index = SkillIndex()
+                # Registered before loading so concurrent writes land in it
+                self.indexes.put(user_id, index)
+                index.build(self.loader(user_id))
+                print(f"Built skill index for user {user_id}: {len(index)} resumes, "
+                      f"{len(index.postings)} terms in {time.perf_counter() - started:.2f}s")
+                return index
+        finally:
+            self._release_build_lock(user_id)
+
+    def _acquire_build_lock(self, user_id: str) -> threading.Lock:
+        """The user's build lock, shared by every request waiting on the same build"""
+        with self._lock:
+            entry = self._build_locks.get(user_id)
+            if entry is None:
+                entry = self._build_locks[user_id] = [threading.Lock(), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def _release_build_lock(self, user_id: str):
+        """Forget the lock once no request waits on it, so only users being built hold one"""
+        with self._lock:
+            entry = self._build_locks[user_id]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._build_locks[user_id]
+
+    def resume_saved(self, user_id: str, row: Dict[str, Any]):
+        """Apply a saved resume to the user's index if it is in memory"""
+        index = self.indexes.get(user_id)
+        if index is not None:
+            index.add(row)
+
+    def resume_deleted(self, user_id: str, resume_id: str):
+        """Apply a deleted resume to the user's index if it is in memory"""
+        index = self.indexes.get(user_id)
+        if index is not None:
+            index.remove(resume_id)
+
+    def search(self, user_id: str, skills: List[str], top_k: int = 20) -> List[Dict[str, Any]]:
+        return self.get(user_id).search(skills, top_k)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'users': self.indexes.stats()}
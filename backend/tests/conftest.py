@@ -0,0 +1,9 @@
+"""
+Backend modules are flat (imported as `database`, `read_cache`, ...) -
+make them importable from tests/ whatever the working directory
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,42 @@
+from database import bulk_insert, run_bulk_insert
+
+
+def insert_rejecting(bad):
+    """insert(payload) that fails any payload containing a row in bad"""
+    def insert(payload):
+        rows = payload if isinstance(payload, list) else [payload]
+        if any(row['n'] in bad for row in rows):
+            raise RuntimeError("rejected")
+        return [dict(row, id=row['n']) for row in rows]
+    return insert
+
+
+def test_chunks_saved_in_order():
+    rows = [{'n': i} for i in range(5)]
+    saved = run_bulk_insert(bulk_insert(rows, 2, 'resumes'), insert_rejecting(set()))
+    assert [row['id'] for row in saved] == [0, 1, 2, 3, 4]
+
+
+def test_failed_chunk_retried_row_by_row():
+    rows = [{'n': i} for i in range(5)]
+    saved = run_bulk_insert(bulk_insert(rows, 2, 'resumes'), insert_rejecting({3}))
+    assert [row and row['id'] for row in saved] == [0, 1, 2, None, 4]
+
+
+def test_short_response_counts_as_failure():
+    calls = []
+
+    def insert(payload):
+        calls.append(payload)
+        return [] if isinstance(payload, list) else [dict(payload, id=payload['n'])]
+
+    saved = run_bulk_insert(bulk_insert([{'n': 0}, {'n': 1}], 10, 'resumes'), insert)
+    assert [row['id'] for row in saved] == [0, 1]
+    assert len(calls) == 3
+
+
+def test_returning_minimal():
+    rows = [{'n': i} for i in range(4)]
+    saved = run_bulk_insert(bulk_insert(rows, 3, 'match results', returning=False),
+                            lambda payload: insert_rejecting({1})(payload) and [])
+    assert saved == [True, None, True, True]
@@ -0,0 +1,24 @@
+import threading
+
+from corpus_stats import CorpusStats
+
+
+def test_periodic_save_runs_off_the_calling_thread(tmp_path, monkeypatch):
+    path = str(tmp_path / 'corpus.bin')
+    stats = CorpusStats(path, save_every=2, min_documents=1)
+    writers = []
+    write = stats._write
+
+    def recording_write(target):
+        writers.append(threading.current_thread())
+        write(target)
+
+    monkeypatch.setattr(stats, '_write', recording_write)
+    stats.add_document(['python', 'sql'])
+    stats.add_document(['python'])
+    stats.save()  # waits for the background save, then writes again
+
+    assert writers[0] is not threading.current_thread()
+    loaded = CorpusStats.open(path)
+    assert loaded.documents == 2
+    assert loaded.document_frequency('python') == 2
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+
+from database import dashboard_stats, score_histogram, top_skills
+
+
+def test_score_histogram_puts_100_in_last_bucket():
+    counts = [bucket['count'] for bucket in score_histogram([0, 9.99, 10, 55.5, 100])]
+    assert counts == [2, 1, 0, 0, 0, 1, 0, 0, 0, 1]
+
+
+def test_top_skills_lowercased_by_count_then_name():
+    ranked = top_skills([['Python', 'SQL'], ['python', 'aws'], None, ['sql']], top_n=2)
+    assert ranked == [{'skill': 'python', 'count': 2}, {'skill': 'sql', 'count': 2}]
+
+
+def test_dashboard_stats_fields():
+    stats = dashboard_stats(2, 1, [50, 75.5], [['Go']], [])
+    assert stats['avg_match_score'] == 62.75
+    assert stats['top_skills'] == [{'skill': 'go', 'count': 1}]
+    assert stats['total_matches'] == 2
+
+
+def test_async_fallback_when_function_missing(monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', 'http://db')
+    monkeypatch.setenv('SUPABASE_SERVICE_KEY', 'key')
+    from async_database import AsyncDatabaseService
+
+    rpc_calls = []
+
+    def handler(request):
+        path = request.url.path
+        if path.endswith('/rpc/get_dashboard_stats'):
+            rpc_calls.append(path)
+            return httpx.Response(404, json={'code': 'PGRST202'})
+        if path.endswith('/resumes') and request.url.params['select'] == 'skills':
+            return httpx.Response(200, json=[{'skills': ['Python']}, {'skills': ['python', 'Go']}])
+        if path.endswith('/match_results') and request.url.params['select'] == 'match_score':
+            return httpx.Response(200, json=[{'match_score': 80}])
+        if request.headers.get('prefer') == 'count=exact':
+            return httpx.Response(200, json=[], headers={'content-range': '0-0/2'})
+        return httpx.Response(200, json=[])
+
+    db = AsyncDatabaseService(transport=httpx.MockTransport(handler))
+    stats = asyncio.run(db.get_dashboard_stats('u'))
+    asyncio.run(db.get_dashboard_stats('u'))
+
+    assert stats['top_skills'][0] == {'skill': 'python', 'count': 2}
+    assert stats['total_resumes'] == 2 and stats['avg_match_score'] == 80
+    assert len(rpc_calls) == 1
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from database import decode_page_cursor, encode_page_cursor, keyset_filter, keyset_page
+
+ID = '00000000-0000-0000-0000-0000000000{:02d}'
+FILTER = re.compile(r'^created_at\.lt\."([^"]+)",and\(created_at\.eq\."([^"]+)",id\.lt\.([0-9a-f-]+)\)$')
+
+
+def after_cursor(rows, condition):
+    """Rows matching a keyset_filter condition, as PostgREST would evaluate it"""
+    lt, eq, row_id = FILTER.match(condition).groups()
+    assert lt == eq
+    return [row for row in rows if row['created_at'] < lt or (row['created_at'] == eq and row['id'] < row_id)]
+
+
+def newest_first(rows):
+    return sorted(rows, key=lambda row: (row['created_at'], row['id']), reverse=True)
+
+
+def test_cursor_round_trip():
+    row = {'created_at': '2024-05-01T10:20:30.123456+00:00', 'id': ID.format(7)}
+    assert decode_page_cursor(encode_page_cursor(row)) == (row['created_at'], row['id'])
+    assert decode_page_cursor(None) is None
+
+
+@pytest.mark.parametrize('cursor', ['not-base64!', encode_page_cursor({'created_at': 'yesterday', 'id': ID.format(1)}),
+                                    encode_page_cursor({'created_at': '2024-01-01T00:00:00+00:00', 'id': '1) or (1'})])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_page_cursor(cursor)
+
+
+def test_pages_with_equal_created_at_neither_skip_nor_repeat():
+    # Every row shares its timestamp with another, so the id tie-break decides the page boundaries
+    rows = [{'created_at': f'2024-01-01T00:00:0{i // 3}+00:00', 'id': ID.format(i)} for i in range(9)]
+    seen, after = [], None
+    while True:
+        candidates = newest_first(rows if after is None else after_cursor(rows, keyset_filter(after)))
+        page, next_cursor = keyset_page(candidates[:3], 2)
+        seen.extend(row['id'] for row in page)
+        if next_cursor is None:
+            break
+        after = decode_page_cursor(next_cursor)
+    assert seen == [row['id'] for row in newest_first(rows)]
+
+
+def test_last_page_has_no_cursor():
+    rows = [{'created_at': '2024-01-01T00:00:00+00:00', 'id': ID.format(i)} for i in range(2)]
+    assert keyset_page(rows, 2) == (rows, None)
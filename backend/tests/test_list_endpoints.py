@@ -0,0 +1,79 @@
+"""
+List and statistics endpoints against a mocked PostgREST
+"""
+
+import asyncio
+import base64
+import json
+import os
+
+import httpx
+import pytest
+
+os.environ.update({'PARSE_WORKERS': '0', 'WARM_UP_ON_STARTUP': 'false', 'CORPUS_STATS_PATH': '',
+                   'SUPABASE_URL': 'http://db', 'SUPABASE_SERVICE_KEY': 'key'})
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from read_cache import MemoryCacheBackend, ReadCache  # noqa: E402
+
+USER = 'a3f1c2d4-0000-0000-0000-000000000001'
+TOKEN = 'x.' + base64.urlsafe_b64encode(json.dumps({'sub': USER}).encode()).decode().rstrip('=') + '.y'
+AUTH = {'Authorization': f'Bearer {TOKEN}'}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[{'id': '00000000-0000-0000-0000-000000000001',
+                                          'created_at': '2024-01-01T00:00:00+00:00'}])
+
+    monkeypatch.setattr(main.async_db, 'transport', httpx.MockTransport(handler))
+    monkeypatch.setattr(main.async_db, '_client', None)
+    with TestClient(main.app) as test_client:
+        test_client.requests = requests
+        yield test_client
+
+
+@pytest.mark.parametrize('path', ['/api/resumes', '/api/job-searches', '/api/matches'])
+def test_offset_rejected(client, path):
+    response = client.get(path, params={'offset': 50}, headers=AUTH)
+    assert response.status_code == 400
+    assert 'cursor' in response.json()['detail']
+    assert client.requests == []
+
+
+def test_invalid_cursor_is_400(client):
+    assert client.get('/api/resumes', params={'cursor': 'junk'}, headers=AUTH).status_code == 400
+
+
+@pytest.fixture
+def cached_client(client, monkeypatch):
+    monkeypatch.setattr(main.async_db, 'read_cache', ReadCache(MemoryCacheBackend(), ttl=300, stats_ttl=60))
+    return client
+
+
+def test_unchanged_list_is_304_from_the_cache(cached_client):
+    first = cached_client.get('/api/resumes', headers=AUTH)
+    assert first.status_code == 200 and first.headers['etag']
+
+    second = cached_client.get('/api/resumes', headers={**AUTH, 'If-None-Match': first.headers['etag']})
+    assert second.status_code == 304
+    assert second.headers['etag'] == first.headers['etag']
+    assert len(cached_client.requests) == 1
+
+
+def test_write_invalidates_cached_list(cached_client):
+    cached_client.get('/api/matches', headers=AUTH)
+    asyncio.run(main.async_db.read_cache.ainvalidate(USER, 'match_saved'))
+    cached_client.get('/api/matches', headers=AUTH)
+    assert len(cached_client.requests) == 2
+
+
+def test_stale_etag_gets_the_full_body(cached_client):
+    response = cached_client.get('/api/job-searches', headers={**AUTH, 'If-None-Match': '"stale"'})
+    assert response.status_code == 200 and response.json()
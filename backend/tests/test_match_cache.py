@@ -0,0 +1,19 @@
+from job_profile import JobProfile
+from match_cache import MatchCache
+from matcher import ResumeMatcher
+from vocabulary import Vocabulary
+
+
+def test_rebuilt_profile_with_other_skills_is_not_served_stale():
+    matcher = ResumeMatcher(vocabulary=Vocabulary(), similarity_cache_size=0)
+    cache = MatchCache(matcher)
+    resume = {'skills': ['Python', 'Docker'], 'keywords': []}
+
+    # Same job input, compiled against different corpus statistics
+    before = JobProfile('job', matcher.prepare(['python', 'kubernetes']))
+    after = JobProfile('job', matcher.prepare(['python', 'docker']))
+
+    assert cache.match('resume', resume, before)['missing_skills'] == ['kubernetes']
+    assert cache.match('resume', resume, after)['missing_skills'] == []
+    assert cache.match('resume', resume, before)['score'] == 50.0
+    assert cache.pairs.stats()['hits'] == 1
@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+
+from read_cache import MemoryCacheBackend, ReadCache, RedisCacheBackend, etag
+
+
+class FakeRedis:
+    """Stand-in with the get/set(ex=, nx=) subset RedisCacheBackend uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, 0))
+        return value.encode() if value is not None and expires_at > time.time() else None
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and self.get(key) is not None:
+            return None
+        self.data[key] = (value, time.time() + ex)
+        return True
+
+
+class BrokenRedis:
+    def get(self, key):
+        raise ConnectionError("down")
+
+    def set(self, *args, **kwargs):
+        raise ConnectionError("down")
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def cache(request):
+    backend = MemoryCacheBackend() if request.param == 'memory' else RedisCacheBackend(FakeRedis())
+    return ReadCache(backend, ttl=300, stats_ttl=60)
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return [[{'version': self.calls}], None]
+
+
+def read(cache, loader, resource='resumes', user_id='u', params=(50, None)):
+    return asyncio.run(cache.read_through(user_id, resource, list(params), loader))
+
+
+def test_second_read_is_a_hit(cache):
+    loader = Loader()
+    assert read(cache, loader) == read(cache, loader)
+    assert loader.calls == 1 and cache.hits == 1
+
+
+def test_parameters_and_users_are_separate_entries(cache):
+    loader = Loader()
+    read(cache, loader, params=(50, None))
+    read(cache, loader, params=(10, None))
+    read(cache, loader, user_id='other')
+    assert loader.calls == 3
+
+
+def test_write_invalidates_only_affected_resources(cache):
+    resumes, searches, stats = Loader(), Loader(), Loader()
+    read(cache, resumes)
+    read(cache, searches, resource='job_searches')
+    read(cache, stats, resource='dashboard')
+
+    cache.invalidate('u', 'resume_saved')
+    read(cache, resumes)
+    read(cache, searches, resource='job_searches')
+    read(cache, stats, resource='dashboard')
+    assert (resumes.calls, searches.calls, stats.calls) == (2, 1, 2)
+
+
+def test_resume_delete_invalidates_matches(cache):
+    matches = Loader()
+    read(cache, matches, resource='matches')
+    cache.invalidate('u', 'resume_deleted')
+    read(cache, matches, resource='matches')
+    assert matches.calls == 2
+
+
+def test_read_overlapping_a_write_is_never_served(cache):
+    calls = []
+
+    async def slow_loader():
+        calls.append(1)
+        if len(calls) == 1:
+            # The write lands after the read captured its version token
+            cache.invalidate('u', 'resume_saved')
+            return ['stale']
+        return ['fresh']
+
+    assert read(cache, slow_loader) == ['stale']
+    assert read(cache, slow_loader) == ['fresh']
+
+
+def test_failed_loads_are_not_cached(cache):
+    async def failing():
+        raise RuntimeError("database down")
+
+    with pytest.raises(RuntimeError):
+        read(cache, failing)
+    loader = Loader()
+    read(cache, loader)
+    assert loader.calls == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    cache = ReadCache(MemoryCacheBackend(), ttl=10, stats_ttl=10)
+    loader = Loader()
+    read(cache, loader)
+    now[0] += 11
+    read(cache, loader)
+    assert loader.calls == 2
+
+
+def test_backend_errors_fall_back_to_the_loader():
+    cache = ReadCache(RedisCacheBackend(BrokenRedis()), ttl=300, stats_ttl=60)
+    loader = Loader()
+    assert read(cache, loader) == [[{'version': 1}], None]
+    cache.invalidate('u', 'resume_saved')
+    assert cache.errors == 2
+
+
+def test_etag_depends_on_every_part():
+    assert etag(b'[]', b'') == etag(b'[]', b'')
+    assert etag(b'[]', b'') != etag(b'[]', b'cursor')
+    assert etag(b'ab', b'') != etag(b'a', b'b')
@@ -0,0 +1,70 @@
+import threading
+import time
+
+from skill_index import SkillIndex, SkillIndexRegistry
+
+
+def row(resume_id, created_at, skills, keywords=()):
+    return {'id': resume_id, 'created_at': created_at, 'skills': list(skills), 'keywords': list(keywords),
+            'filename': f'{resume_id}.pdf', 'name': None, 'email': None}
+
+
+def test_search_ranks_by_hits_then_newest():
+    index = SkillIndex()
+    index.build([
+        row('old', '2024-01-01', ['Python', 'SQL']),
+        row('new', '2024-03-01', ['python', 'sql']),
+        row('one', '2024-05-01', ['Python']),
+        row('none', '2024-06-01', ['Java']),
+    ])
+    results = index.search(['python', ' SQL '], top_k=3)
+    assert [r['id'] for r in results] == ['new', 'old', 'one']
+    assert results[0]['score'] == 100.0
+    assert results[2]['missing_skills'] == ['sql']
+
+
+def test_keywords_are_searchable_and_remove_unlinks():
+    index = SkillIndex()
+    index.build([row('a', '2024-01-01', [], keywords=['machine learning'])])
+    assert [r['id'] for r in index.search(['Machine  Learning'])] == ['a']
+    index.remove('a')
+    assert index.search(['machine learning']) == []
+    assert index.postings == {}
+
+
+def test_delete_during_build_is_not_resurrected():
+    index = SkillIndex()
+    index.remove('a')  # deleted while an older page was loading
+    index.build([row('a', '2024-01-01', ['go'])])
+    assert index.search(['go']) == []
+
+
+def test_registry_builds_once_and_forgets_build_locks():
+    loads = []
+    started = threading.Event()
+
+    def loader(user_id):
+        loads.append(user_id)
+        started.set()
+        time.sleep(0.05)
+        return [row('a', '2024-01-01', ['rust'])]
+
+    registry = SkillIndexRegistry(loader, max_users=10, max_age=0)
+    threads = [threading.Thread(target=registry.search, args=('u', ['rust'])) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ['u']
+    assert registry._build_locks == {}
+
+
+def test_registry_applies_writes_and_evicts_users():
+    registry = SkillIndexRegistry(lambda user_id: [], max_users=1, max_age=0)
+    registry.get('u1')
+    registry.resume_saved('u1', row('a', '2024-01-01', ['go']))
+    assert [r['id'] for r in registry.search('u1', ['go'])] == ['a']
+
+    registry.get('u2')
+    assert len(registry.indexes) == 1 and registry._build_locks == {}
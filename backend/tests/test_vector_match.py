@@ -0,0 +1,46 @@
+"""
+engine=vector on /api/match with parses finishing out of upload order
+"""
+
+import json
+import os
+
+os.environ.update({'PARSE_WORKERS': '0', 'WARM_UP_ON_STARTUP': 'false', 'CORPUS_STATS_PATH': '',
+                   'SUPABASE_URL': 'http://db', 'SUPABASE_SERVICE_KEY': 'key'})
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from job_profile import JobProfile  # noqa: E402
+
+
+def test_shortlist_sees_uploads_in_upload_order(monkeypatch):
+    uploads = [(f'r{i}.txt', f'resume {i}'.encode()) for i in range(4)]
+
+    async def parse_in_reverse(batch):
+        # Last upload finishes first
+        for index in reversed(range(len(batch))):
+            yield index, {'skills': ['Python'], 'keywords': [], 'name': f'r{index}'}
+
+    shortlisted = []
+
+    def shortlist(required_skills, keys, resumes, size):
+        shortlisted.append((keys, [resume['name'] for resume in resumes]))
+        return list(range(len(keys)))
+
+    profile = JobProfile('job', main.matcher.prepare(['python']), keywords=['python'])
+    monkeypatch.setattr(main.job_profiles, 'get', lambda job_data: profile)
+    monkeypatch.setattr(main.parse_executor, 'parse_iter', parse_in_reverse)
+    monkeypatch.setattr(main.vector_ranker, 'shortlist', shortlist)
+
+    with TestClient(main.app) as client:
+        response = client.post('/api/match', params={'engine': 'vector'},
+                               data={'job_input': json.dumps({'keywords': ['python']})},
+                               files=[('files', (name, content, 'text/plain')) for name, content in uploads])
+
+    assert response.status_code == 200
+    keys, names = shortlisted[0]
+    assert names == ['r0', 'r1', 'r2', 'r3']
+    assert keys == [main.parse_cache.key(content) for _, content in uploads]
+    # Equal scores rank in upload order
+    assert [candidate['filename'] for candidate in response.json()] == [name for name, _ in uploads]
@@ -0,0 +1,53 @@
+import pytest
+
+from vector_ranker import TermVectors, VectorRanker
+from vocabulary import default_vocabulary
+
+pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+
+
+def test_term_vectors_keep_their_own_vocabulary():
+    before = len(default_vocabulary)
+    term_vectors = TermVectors(max_entries=10)
+    term_vectors.put('r1', {'lemma': 3, 'unrelated': 1}, ['Python'])
+    assert len(default_vocabulary) == before
+    assert term_vectors.vocabulary.lookup('python') is not None
+
+
+def test_encode_adds_skills_to_term_counts():
+    term_vectors = TermVectors(max_entries=10)
+    ids, counts = term_vectors.encode({'python': 2}, ['Python', 'sql'])
+    by_term = dict(zip(ids, counts))
+    assert by_term[term_vectors.vocabulary.lookup('python')] == 3
+    assert by_term[term_vectors.vocabulary.lookup('sql')] == 1
+
+
+def test_shortlist_orders_by_similarity():
+    term_vectors = TermVectors(max_entries=10)
+    term_vectors.put('java', {'java': 5, 'spring': 2})
+    term_vectors.put('python', {'python': 4, 'django': 2}, ['python'])
+    term_vectors.put('mixed', {'python': 1, 'java': 3})
+    ranker = VectorRanker(term_vectors, shortlist_size=2)
+    keys = ['java', 'python', 'mixed']
+    assert ranker.shortlist(['Python', 'Django'], keys, [{}, {}, {}]) == [1, 2]
+
+
+def test_ties_keep_batch_order():
+    term_vectors = TermVectors(max_entries=10)
+    for key in ('a', 'b', 'c'):
+        term_vectors.put(key, {'go': 1})
+    ranker = VectorRanker(term_vectors)
+    assert ranker.shortlist(['go'], ['c', 'a', 'b'], [{}, {}, {}]) == [0, 1, 2]
+
+
+def test_unrecorded_resume_falls_back_to_keywords_and_skills():
+    ranker = VectorRanker(TermVectors(max_entries=10))
+    resumes = [{'keywords': ['cooking'], 'skills': []}, {'keywords': ['kubernetes'], 'skills': ['Docker']}]
+    assert ranker.shortlist(['docker'], ['x', 'y'], resumes, size=1) == [1]
+
+
+def test_no_overlap_scores_zero():
+    ranker = VectorRanker(TermVectors(max_entries=10))
+    vectors = [ranker.term_vectors.encode({'java': 1})]
+    assert ranker.scores(vectors, ranker.query_vector(['haskell'])).tolist() == [0.0]
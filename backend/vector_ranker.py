@@ -0,0 +1,170 @@
+"""
+Vector Ranker - Shortlist a whole batch of resumes with one sparse product
+Each resume becomes a TF-IDF vector over its lemmas and extracted skills,
+the job's requirements become a query vector, and cosine scores for the
+batch come from a single matrix-vector product. Only the shortlist is
+then scored by the (fuzzy) ResumeMatcher
+
+Needs numpy and scipy; VECTOR_AVAILABLE is False without them
+"""
+
+import os
+from array import array
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from lru import LRUCache
+from vocabulary import Vocabulary
+
+VECTOR_AVAILABLE = find_spec('numpy') is not None and find_spec('scipy') is not None
+
+# (term ids, counts) of one document
+TermVector = Tuple[array, array]
+
+
+class TermVectors:
+    """
+    Lemma counts and extracted skills of parsed resumes, by parse cache key
+    Stored as vocabulary ids and counts (a few bytes per term) so large
+    batches can be ranked without re-running the NLP pipeline
+    """
+
+    def __init__(self, vocabulary: Optional[Vocabulary] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            vocabulary: Term ids (default: a vocabulary of its own). Every lemma of
+                        every resume is interned, so don't pass the matcher's: it would
+                        fill up with non-skill words and stop interning job skills
+            max_entries: Resumes to keep (default: TERM_VECTOR_CACHE_SIZE or 10000)
+        """
+        self.vocabulary = Vocabulary() if vocabulary is None else vocabulary
+        if max_entries is None:
+            max_entries = int(os.getenv("TERM_VECTOR_CACHE_SIZE", 10000))
+        self.vectors = LRUCache(max_entries)
+
+    def encode(self, frequencies: Dict[str, int], skills: Sequence[str] = ()) -> TermVector:
+        """
+        Term counts as parallel id/count arrays, each skill counted once as a whole term
+        Terms beyond the vocabulary cap are dropped
+        """
+        counts: Dict[int, int] = {}
+        for term, count in frequencies.items():
+            term_id = self.vocabulary.intern(term)
+            if term_id is not None:
+                counts[term_id] = counts.get(term_id, 0) + count
+        for skill in skills:
+            term_id = self.vocabulary.intern(skill)
+            if term_id is not None:
+                counts[term_id] = counts.get(term_id, 0) + 1
+        return array('I', counts), array('I', counts.values())
+
+    def put(self, key: str, frequencies: Dict[str, int], skills: Sequence[str] = ()):
+        self.vectors.put(key, self.encode(frequencies, skills))
+
+    def get(self, key: str) -> Optional[TermVector]:
+        return self.vectors.get(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.vectors.stats()
+
+
+class VectorRanker:
+    """
+    Cosine shortlist of a batch against a job profile
+    IDF is computed over the batch itself, so the same files always give
+    the same shortlist (cursor pages stay consistent)
+    """
+
+    def __init__(self, term_vectors: TermVectors, shortlist_size: Optional[int] = None):
+        """
+        Args:
+            term_vectors: Lemma counts recorded while parsing
+            shortlist_size: Candidates passed on to fuzzy re-ranking
+                            (default: VECTOR_SHORTLIST_SIZE or 100)
+        """
+        self.term_vectors = term_vectors
+        self.vocabulary = term_vectors.vocabulary
+        self.shortlist_size = (int(os.getenv("VECTOR_SHORTLIST_SIZE", 100))
+                               if shortlist_size is None else shortlist_size)
+
+    def resume_vector(self, key: str, resume_data: Dict[str, Any]) -> TermVector:
+        """Term vector recorded at parse time"""
+        vector = self.term_vectors.get(key)
+        if vector is None:
+            # Not recorded (e.g. parsed before a restart): the keywords are its top lemmas
+            vector = self.term_vectors.encode(dict.fromkeys(resume_data.get('keywords') or [], 1),
+                                              resume_data.get('skills') or [])
+        return vector
+
+    def query_vector(self, required_skills: Sequence[str]) -> TermVector:
+        """Required terms, plus the words of multi-word ones to meet resume lemmas"""
+        terms: Dict[str, int] = {}
+        for skill in required_skills:
+            skill = skill.lower()
+            terms[skill] = 1
+            for word in skill.split():
+                if len(word) > 2:
+                    terms[word] = 1
+        return self.term_vectors.encode(terms)
+
+    def scores(self, vectors: List[TermVector], query: TermVector):
+        """Cosine similarity of every vector to the query (numpy array)"""
+        import numpy as np
+        from scipy import sparse
+
+        indptr = array('q', [0])
+        indices, data = array('I'), array('I')
+        for ids, counts in vectors:
+            indices.extend(ids)
+            data.extend(counts)
+            indptr.append(len(indices))
+        query_ids, query_counts = query
+        columns = max(len(self.vocabulary), max(query_ids, default=-1) + 1, 1)
+
+        matrix = sparse.csr_matrix(
+            (np.frombuffer(data, dtype=np.uint32).astype(np.float64),
+             np.frombuffer(indices, dtype=np.uint32),
+             np.frombuffer(indptr, dtype=np.int64)),
+            shape=(len(vectors), columns),
+        )
+
+        # Ids are unique within a row (encode), so bincount gives document frequency.
+        # Sublinear term frequency, smoothed IDF over the batch
+        document_frequency = np.bincount(matrix.indices, minlength=columns)
+        idf = np.log((1 + len(vectors)) / (1 + document_frequency)) + 1
+        matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+
+        weights = np.zeros(columns)
+        weights[np.frombuffer(query_ids, dtype=np.uint32)] = np.frombuffer(query_counts, dtype=np.uint32)
+        weights *= idf
+        query_norm = np.linalg.norm(weights)
+        if not query_norm:
+            return np.zeros(len(vectors))
+
+        rows = np.repeat(np.arange(len(vectors)), np.diff(matrix.indptr))
+        norms = np.sqrt(np.bincount(rows, weights=matrix.data ** 2, minlength=len(vectors)))
+        norms[norms == 0] = 1
+        return (matrix @ weights) / (norms * query_norm)
+
+    def shortlist(self, required_skills: Sequence[str], keys: List[str],
+                  resumes: List[Dict[str, Any]], size: Optional[int] = None) -> List[int]:
+        """
+        Positions of the best resumes by cosine score, best first (batch order on ties)
+
+        Args:
+            required_skills: The job's requirement terms
+            keys: Parse cache key of each resume
+            resumes: Parsed resume data, same order as keys
+            size: Shortlist length (default: shortlist_size)
+        """
+        import numpy as np
+
+        if not resumes:
+            return []
+        size = self.shortlist_size if size is None else size
+        vectors = [self.resume_vector(key, resume_data) for key, resume_data in zip(keys, resumes)]
+        scores = self.scores(vectors, self.query_vector(required_skills))
+
+        # Stable sort on -score keeps batch order on ties
+        order = np.argsort(-scores, kind='stable')
+        return order[:size].tolist()
@@ -0,0 +1,57 @@
+"""
+Vocabulary - Integer-interned terms for exact skill matching
+Each distinct lowercased term gets a small int id, shared by resume terms
+and job requirements, so exact hits are int set lookups instead of string
+comparisons
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+
+class Vocabulary:
+    """
+    Case-insensitive term -> id map
+    Ids are assigned in first-seen order and never reused. Ids are local to
+    the process: terms are interned in the API process, not in parse workers
+    """
+
+    def __init__(self, max_terms: Optional[int] = None):
+        """
+        Args:
+            max_terms: Terms to intern at most (default: VOCABULARY_MAX_TERMS or 200000)
+                       Terms seen after that get no id and are matched as strings
+        """
+        self.max_terms = int(os.getenv("VOCABULARY_MAX_TERMS", 200000)) if max_terms is None else max_terms
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, term: str) -> Optional[int]:
+        """Id of a term, assigning one if it is new (None once the vocabulary is full)"""
+        return self.intern_lowered(term.lower())
+
+    def intern_lowered(self, key: str) -> Optional[int]:
+        """intern() for a term that is already lowercased"""
+        term_id = self._ids.get(key)
+        if term_id is None:
+            with self._lock:
+                term_id = self._ids.get(key)
+                if term_id is None and len(self._ids) < self.max_terms:
+                    term_id = len(self._ids)
+                    self._ids[key] = term_id
+        return term_id
+
+    def lookup(self, term: str) -> Optional[int]:
+        """Id of a term, without interning it"""
+        return self._ids.get(term.lower())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def stats(self) -> Dict[str, int]:
+        return {'terms': len(self._ids), 'max_terms': self.max_terms}
+
+
+# Shared by every ResumeMatcher that isn't given its own vocabulary
+default_vocabulary = Vocabulary()
@@ -131,6 +131,81 @@ CREATE TRIGGER update_resumes_updated_at BEFORE UPDATE ON resumes
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_resumes_user_created ON resumes(user_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_resumes_name ON resumes(name);
 CREATE INDEX IF NOT EXISTS idx_resumes_skills ON resumes USING GIN(skills);
+
+-- Keyset pagination: list pages are ordered by (created_at DESC, id DESC) and
+-- start after the previous page's last row, so every page is an index range scan.
+-- These replace the (user_id, created_at DESC) indexes
+DROP INDEX IF EXISTS idx_resumes_user_created;
+DROP INDEX IF EXISTS idx_match_results_user_created;
+CREATE INDEX IF NOT EXISTS idx_resumes_user_keyset ON resumes(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_job_searches_user_keyset ON job_searches(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_match_results_user_keyset ON match_results(user_id, created_at DESC, id DESC);
+-- Matches of one job search, best first
+CREATE INDEX IF NOT EXISTS idx_match_results_job_search ON match_results(job_search_id, match_score DESC);
+
+-- Dashboard statistics in one call (POST /rest/v1/rpc/get_dashboard_stats)
+-- Counts, average and histogram are aggregated here, so the payload has the
+-- same size whatever the history. SECURITY INVOKER: row level security
+-- still limits non-service callers to their own rows
+CREATE OR REPLACE FUNCTION get_dashboard_stats(
+    p_user_id UUID,
+    p_top_skills INTEGER DEFAULT 10,
+    p_recent INTEGER DEFAULT 10
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'total_resumes', (SELECT COUNT(*) FROM resumes WHERE user_id = p_user_id),
+        'total_job_searches', (SELECT COUNT(*) FROM job_searches WHERE user_id = p_user_id),
+        'total_matches', scores.total,
+        'avg_match_score', COALESCE(ROUND(scores.average, 2), 0),
+        -- 10 buckets of 10 points; 100 falls in the last one
+        'score_histogram', (
+            SELECT jsonb_agg(jsonb_build_object('min', b * 10, 'max', b * 10 + 10, 'count', COALESCE(h.n, 0)) ORDER BY b)
+            FROM generate_series(0, 9) AS b
+            LEFT JOIN (
+                SELECT LEAST(FLOOR(match_score / 10), 9)::INTEGER AS bucket, COUNT(*) AS n
+                FROM match_results
+                WHERE user_id = p_user_id
+                GROUP BY 1
+            ) h ON h.bucket = b
+        ),
+        'top_skills', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('skill', skill, 'count', n) ORDER BY n DESC, skill)
+            FROM (
+                SELECT LOWER(s) AS skill, COUNT(*) AS n
+                FROM resumes, UNNEST(skills) AS s
+                WHERE user_id = p_user_id
+                GROUP BY 1
+                ORDER BY n DESC, skill
+                LIMIT p_top_skills
+            ) top
+        ), '[]'::JSONB),
+        -- Same shape as select('*, resumes(filename, name), job_searches(job_title)')
+        'recent_activity', COALESCE((
+            SELECT jsonb_agg(
+                to_jsonb(m) || jsonb_build_object(
+                    'resumes', jsonb_build_object('filename', r.filename, 'name', r.name),
+                    'job_searches', jsonb_build_object('job_title', j.job_title)
+                ) ORDER BY m.created_at DESC
+            )
+            FROM (
+                SELECT * FROM match_results
+                WHERE user_id = p_user_id
+                ORDER BY created_at DESC
+                LIMIT p_recent
+            ) m
+            LEFT JOIN resumes r ON r.id = m.resume_id
+            LEFT JOIN job_searches j ON j.id = m.job_search_id
+        ), '[]'::JSONB)
+    )
+    FROM (
+        SELECT COUNT(*) AS total, AVG(match_score) AS average
+        FROM match_results
+        WHERE user_id = p_user_id
+    ) scores;
+$$;